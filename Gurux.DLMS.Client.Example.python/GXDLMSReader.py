@@ -36,7 +36,7 @@ import socket
 import sys
 import datetime
 from TraceLevel import TraceLevel
-from gurux_dlms import GXByteBuffer, GXReplyData, GXDLMSTranslator, InterfaceType, GXDLMSException
+from gurux_dlms import GXByteBuffer, GXReplyData, GXDLMSTranslator, InterfaceType, GXDLMSException, GXDLMSScalerUnitCache
 from gurux_dlms.enums import ObjectType, Authentication, Conformance, DataType
 from gurux_dlms.GXDLMSConverter import GXDLMSConverter
 from gurux_dlms.objects import *
@@ -50,6 +50,9 @@ class GXDLMSReader:
         self.Trace = trace
         self.media = media
         self.client = client
+        #  Association view cache.
+        self.cache = None
+        self.fingerprint = None
         if trace.value > TraceLevel.WARNING.value:
             print("Authentication: " + str(self.client.authentication))
             print("ClientAddress: " + hex(self.client.clientAddress))
@@ -122,7 +125,6 @@ class GXDLMSReader:
             self.writeTrace("TX: " + self.now() + "\t" + GXByteBuffer.hex(data), TraceLevel.VERBOSE)
             self.media.sendall(data)
         msgPos = 0
-        count = 100
         pos = 0
         try:
             while not self.client.getData(rd, reply, notify):
@@ -135,7 +137,7 @@ class GXDLMSReader:
                         msgPos = rd.position
                     continue
                 rd.position = msgPos
-                rd.set(self.media.recv(100))
+                self.readFrame(rd)
             if pos == 3:
                 raise ValueError("Failed to receive reply from the device in given time.")
             if pos != 0:
@@ -148,6 +150,28 @@ class GXDLMSReader:
         if reply.error != 0:
             raise GXDLMSException(reply.error)
 
+    #
+    #      * Read rest of the frame from the media.
+    #      *
+    #      * Header is read first and then exactly the bytes that are missing,
+    #      * so getData is called once for each received frame.
+    #      *
+    #      * @param rd
+    #      * Received data.
+    #
+    def readFrame(self, rd):
+        size = self.client.getFrameSize(rd)
+        while True:
+            if size < 1 or size > len(self.replyBuff):
+                size = len(self.replyBuff)
+            count = self.media.recv_into(self.replyBuff, size)
+            if count == 0:
+                raise ConnectionError("Connection closed by the meter.")
+            rd.set(self.replyBuff, 0, count)
+            size = self.client.getFrameSize(rd)
+            if size < 1:
+                break
+
     def readDataBlock(self, data, reply):
         if data != None:
             for it in data:
@@ -191,13 +215,22 @@ class GXDLMSReader:
 
     def readList(self, list_):
         if list_:
-            data = self.client.readList(list_)
             reply = GXReplyData()
             values = list()
-            for it in data:
-                self.readDataBlock(it, reply)
-                values.extend(reply.value)
-                reply.clear()
+            while True:
+                try:
+                    for it in self.client.readList(list_):
+                        self.readDataBlock(it, reply)
+                        values.extend(reply.value)
+                        reply.clear()
+                    break
+                except GXDLMSException:
+                    #  Meter rejected the request.  Read again with smaller
+                    #  requests.  Errors of the single items are not retried.
+                    if isinstance(reply.value, list) or not self.client.readListPlanner.reject():
+                        raise
+                    values = list()
+                    reply.clear()
             if len(values) != len(list_):
                 raise ValueError("Invalid reply. Read items count do not match.")
             self.client.updateValues(list_, values)
@@ -229,6 +262,10 @@ class GXDLMSReader:
 
     def readScalerAndUnits(self):
         objs = self.client.objects.getObjects([ObjectType.REGISTER, ObjectType.EXTENDED_REGISTER, ObjectType.DEMAND_REGISTER])
+        #  Scaler and unit are already known if they are read from the association view cache.
+        objs = [it for it in objs if not GXDLMSScalerUnitCache.isScalerUnitRead(it)]
+        #  Scaler and unit are read only once for each meter model.
+        objs = self.client.updateScalerUnits(objs)
         try:
             if self.client.negotiatedConformance & Conformance.MULTIPLE_REFERENCES != 0:
                 list_ = list()
@@ -249,6 +286,8 @@ class GXDLMSReader:
                         self.read(it, 4)
                 except Exception as e:
                     pass
+        if self.cache:
+            self.cache.set(self.fingerprint, self.client.objects)
 
     def getProfileGenericColumns(self):
         profileGenerics = self.client.objects.getObjects(ObjectType.PROFILE_GENERIC)
@@ -345,12 +384,31 @@ class GXDLMSReader:
                 self.writeTrace("Error! Failed to read last day: " + ex.getMessage(), TraceLevel.ERROR)
 
     def getAssociationView(self):
-        reply = GXReplyData()
-        self.readDataBlock(self.client.getObjectsRequest(), reply)
-        objects = self.client.parseObjects(reply.data, True)
+        objects = None
+        if self.cache:
+            #  Short names of the fingerprint objects are in the association view.
+            if not self.client.useLogicalNameReferencing:
+                objects = self.readObjects()
+            values = list()
+            for it, index in self.cache.getFingerprintObjects(self.client):
+                try:
+                    values.append(self.read(it, index))
+                except GXDLMSException:
+                    values.append(None)
+            self.fingerprint = tuple(values)
+            cached = self.cache.get(self.client, self.fingerprint)
+            if cached is not None:
+                objects = cached
+        if objects is None:
+            objects = self.readObjects()
         converter = GXDLMSConverter()
         converter.updateOBISCodeInformation(objects)
 
+    def readObjects(self):
+        reply = GXReplyData()
+        self.readDataBlock(self.client.getObjectsRequest(), reply)
+        return self.client.parseObjects(reply.data, True)
+
     def readAll(self):
         try:
             self.initializeConnection()
@@ -0,0 +1,87 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+#
+# Benchmark of the fixed-width GXByteBuffer accessors and the buffer
+# growth when values are added.
+#
+# Usage: python benchmarks/bench_byte_buffer.py [call count]
+#
+import os
+import sys
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+#pylint: disable=wrong-import-position
+from gurux_dlms import GXByteBuffer
+
+def measure(func, count):
+    """
+    Returns the best time of one call in nanoseconds.
+    """
+    return min(timeit.repeat(func, number=count, repeat=5)) / count * 1e9
+
+def main(count):
+    bb = GXByteBuffer(bytes(range(64)))
+    out = GXByteBuffer()
+    #  Value is read from the same position and written to the empty
+    #  buffer.  Time that this takes is shown separately.
+    def seek():
+        bb.position = 8
+    print("Position reset: %.0f ns" % measure(seek, count))
+    print("Clear:          %.0f ns" % measure(out.clear, count))
+    for name in ("getUInt16", "getInt16", "getInt32", "getUInt32", "getInt64", "getUInt64", "getFloat", "getDouble"):
+        func = getattr(bb, name)
+        def get():
+            bb.position = 8
+            func()
+        print("%-10s %5.0f ns" % (name, measure(get, count)))
+    for name, value in (("setUInt16", 0x1234), ("setUInt32", 0x12345678), ("setUInt64", 0x123456789ABCDEF), \
+                        ("setFloat", 1.5), ("setDouble", 1.5)):
+        func = getattr(out, name)
+        def set_():
+            out.clear()
+            func(value)
+        try:
+            print("%-10s %5.0f ns" % (name, measure(set_, count)))
+        except ValueError as ex:
+            print("%-10s failed: %s" % (name, ex))
+    #  Buffer grows when values are added to the end.
+    def grow():
+        data = GXByteBuffer()
+        for pos in range(10000):
+            data.setUInt32(pos)
+            data.setUInt64(pos)
+    print("Add 10000 UInt32 and UInt64 values: %.2f ms" % (measure(grow, 1) / 1e6))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,56 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+#
+# Benchmark of the HDLC FCS16 throughput.
+#
+# Usage: python benchmarks/bench_fcs16.py
+#
+import os
+import random
+import sys
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+#pylint: disable=wrong-import-position
+from gurux_dlms._GXFCS16 import _GXFCS16
+
+def main():
+    random.seed(1)
+    for size in (20, 128, 1024, 1 << 20):
+        data = bytearray(random.getrandbits(8) for _ in range(size))
+        count = max(1, 200000 // size)
+        used = min(timeit.repeat(lambda: _GXFCS16.countFCS16(data, 0, size), number=count, repeat=5)) / count
+        print("%8d B: %8.2f us %7.1f MB/s" % (size, used * 1e6, size / used / 1e6))
+
+if __name__ == '__main__':
+    main()
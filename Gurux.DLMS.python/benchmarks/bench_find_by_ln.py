@@ -0,0 +1,81 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+#
+# Benchmark of GXDLMSObjectCollection.findByLN with a 2,000 object model.
+#
+# Usage: python benchmarks/bench_find_by_ln.py [object count]
+#
+import os
+import random
+import sys
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+#pylint: disable=wrong-import-position
+from gurux_dlms.enums import ObjectType
+from gurux_dlms.objects import GXDLMSData, GXDLMSObjectCollection
+
+def findByScan(objects, type_, ln):
+    """
+    Linear search that findByLN used before the index.
+    """
+    for it in objects:
+        if type_ in (ObjectType.NONE, it.objectType) and it.logicalName.strip() == ln:
+            return it
+    return None
+
+def main(count):
+    objects = GXDLMSObjectCollection()
+    names = ["0.0.96.%d.%d.255" % (pos // 250, pos % 250) for pos in range(count)]
+    for it in names:
+        objects.append(GXDLMSData(it))
+    random.seed(1)
+    keys = [random.choice(names) for _ in range(2000)]
+    for it in keys:
+        if objects.findByLN(ObjectType.DATA, it) is not findByScan(objects, ObjectType.DATA, it):
+            raise ValueError("Invalid result.")
+    scan = min(timeit.repeat(lambda: [findByScan(objects, ObjectType.DATA, it) for it in keys], number=1, repeat=3))
+    index = min(timeit.repeat(lambda: [objects.findByLN(ObjectType.DATA, it) for it in keys], number=1, repeat=3))
+    #  Rename updates only the index of the collection that owns the object.
+    item = objects[count // 2]
+    renames = ["1.0.%d.%d.0.255" % (pos // 250, pos % 250) for pos in range(300)]
+    rename = min(timeit.repeat(lambda: [setattr(item, "logicalName", it) for it in renames], number=1, repeat=3)) / len(renames)
+    if objects.findByLN(ObjectType.DATA, renames[-1]) is not item:
+        raise ValueError("Invalid result.")
+    print("Objects: %d" % count)
+    print("Linear search: %.1f us/lookup" % (scan / len(keys) * 1e6))
+    print("findByLN:      %.1f us/lookup" % (index / len(keys) * 1e6))
+    print("Rename:        %.1f us" % (rename * 1e6))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
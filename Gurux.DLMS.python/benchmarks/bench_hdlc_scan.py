@@ -0,0 +1,99 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+#
+# Benchmark of the HDLC frame scan.  Client reads UA frames that are
+# buried in line noise.
+#
+# Usage: python benchmarks/bench_hdlc_scan.py [frame count]
+#
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+#pylint: disable=wrong-import-position
+from gurux_dlms import GXByteBuffer, GXDLMSClient, GXReplyData
+from gurux_dlms.enums import Authentication, InterfaceType
+from gurux_dlms.GXDLMS import GXDLMS
+from gurux_dlms.GXDLMSSettings import GXDLMSSettings
+
+def getFrame():
+    """
+    Returns UA frame that the meter sends to the client.
+    """
+    settings = GXDLMSSettings(True)
+    settings.interfaceType = InterfaceType.HDLC
+    settings.clientAddress = 16
+    settings.serverAddress = 1
+    return GXDLMS.getHdlcFrame(settings, 0x73, None)
+
+def scan(data):
+    """
+    Read all frames from the data.  Returns found frame count and used
+    time in seconds.
+    """
+    client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.HDLC)
+    bb = GXByteBuffer(data)
+    count = 0
+    start = time.perf_counter()
+    while bb.position != bb.size:
+        reply = GXReplyData()
+        position = bb.position
+        if client.getData(bb, reply, None):
+            count += 1
+        elif bb.position == position:
+            break
+    return count, time.perf_counter() - start
+
+def main(count):
+    random.seed(1)
+    frame = getFrame()
+    cases = [("Random noise", lambda: bytes(random.getrandbits(8) for _ in range(400))),
+             ("Noise of flags and format bytes", lambda: bytes(random.choice((0x7E, 0xA0, 0x00)) for _ in range(400)))]
+    for name, noise in cases:
+        data = bytearray()
+        for _ in range(count):
+            data.extend(noise())
+            data.extend(frame)
+        found, used = scan(data)
+        print("%s: %d/%d frames, %.1f kB, %.2f s" % (name, found, count, len(data) / 1024, used))
+    #  Long run of empty flags before the frame.
+    try:
+        found, used = scan(bytearray(b"\x7E\x00" * 3000) + frame)
+        print("3000 empty flags: %d/1 frames, %.3f s" % (found, used))
+    except RecursionError:
+        print("3000 empty flags: RecursionError")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2500)
@@ -0,0 +1,258 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import asyncio
+import logging
+from .GXByteBuffer import GXByteBuffer
+from .GXDLMS import GXDLMS
+from .GXServerReply import GXServerReply
+from .GXDLMSConnectionMetrics import GXDLMSConnectionMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+class _GXDLMSUdpProtocol(asyncio.DatagramProtocol):
+    """
+    UDP endpoint of the listener.  Each datagram is one Wrapper frame.
+    """
+    def __init__(self, listener):
+        self.listener = listener
+        self.transport = None
+        # Connection metrics by remote address.
+        self.connections = dict()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        # pylint: disable=protected-access
+        self.listener._handleDatagram(self, data, addr)
+
+# pylint: disable=too-many-instance-attributes
+class AsyncGXDLMSListener:
+    """
+    Serves GXDLMSServer over TCP and UDP with asyncio.
+
+    Each connection has its own server session, so one server can serve
+    many simultaneous associations.  Connections that are idle longer than
+    the inactivity timeout are closed.  Listener can be used as a
+    stand-in meter in localhost load tests of the clients.
+    """
+
+    #
+    # Constructor.
+    #
+    # server: DLMS server.  Server must be initialized.  Inactivity check
+    #     of the server is turned off, because listener closes idle
+    #     connections.
+    # inactivityTimeout: Idle connection is closed after this many seconds.
+    #     Zero if idle connections are not closed.  If None, inactivity
+    #     timeout of the Wrapper or HDLC setup of the server is used.
+    #
+    def __init__(self, server, inactivityTimeout=None):
+        self.server = server
+        server.checkInactivity = False
+        if inactivityTimeout is None:
+            inactivityTimeout = 0
+            if server.wrapper:
+                inactivityTimeout = server.wrapper.inactivityTimeout
+            elif server.hdlc:
+                inactivityTimeout = server.hdlc.inactivityTimeout
+        self.inactivityTimeout = inactivityTimeout
+        # How many bytes are read at the time when frame size is unknown.
+        self.bufferSize = 1024
+        # Called with connection metrics when connection is closed.
+        self.onConnectionClosed = None
+        # Metrics of the open connections.
+        self.connections = list()
+        # Count of accepted connections.
+        self.connectionCount = 0
+        # Count of connections that were closed for inactivity.
+        self.timeouts = 0
+        self.__servers = list()
+        self.__endpoints = list()
+        self.__tasks = set()
+        self.__sweep = None
+
+    async def startTcp(self, host="127.0.0.1", port=4061):
+        """
+        Start listening TCP connections.  Returns listened port.  Use port
+        zero to select a free port.
+
+        host: Listened host name or IP address.
+        port: Listened TCP port.
+        """
+        server = await asyncio.start_server(self.__handleConnection, host, port)
+        self.__servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    async def startUdp(self, host="127.0.0.1", port=4061):
+        """
+        Start listening UDP datagrams.  Returns listened port.  Use port
+        zero to select a free port.  UDP is supported only with the
+        Wrapper interface.
+
+        host: Listened host name or IP address.
+        port: Listened UDP port.
+        """
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_datagram_endpoint(lambda: _GXDLMSUdpProtocol(self), local_addr=(host, port))
+        self.__endpoints.append(protocol)
+        if self.inactivityTimeout and self.__sweep is None:
+            self.__sweep = asyncio.ensure_future(self.__sweepUdp())
+        return transport.get_extra_info("sockname")[1]
+
+    async def close(self):
+        """
+        Stop listening and close all connections.
+        """
+        for it in self.__servers:
+            it.close()
+            await it.wait_closed()
+        self.__servers.clear()
+        if self.__sweep:
+            self.__sweep.cancel()
+            self.__sweep = None
+        for it in self.__endpoints:
+            for metrics in list(it.connections.values()):
+                self.__close(metrics, "Closed")
+            it.connections.clear()
+            it.transport.close()
+        self.__endpoints.clear()
+        for it in list(self.__tasks):
+            it.cancel()
+        if self.__tasks:
+            await asyncio.wait(self.__tasks)
+
+    def __open(self, address, transport):
+        metrics = GXDLMSConnectionMetrics(address, transport, asyncio.get_running_loop().time())
+        metrics.session = self.server.createSession()
+        self.connections.append(metrics)
+        self.connectionCount += 1
+        return metrics
+
+    def __close(self, metrics, reason):
+        metrics.closed = asyncio.get_running_loop().time()
+        metrics.closeReason = reason
+        self.connections.remove(metrics)
+        self.server.closeSession(metrics.session, metrics)
+        if self.onConnectionClosed:
+            self.onConnectionClosed(metrics)
+
+    def __handleFrame(self, metrics, data):
+        """
+        Handle received frame and returns reply frames.
+        """
+        metrics.lastActivity = asyncio.get_running_loop().time()
+        metrics.requests += 1
+        metrics.bytesReceived += len(data)
+        sr = GXServerReply(data)
+        sr.session = metrics.session
+        sr.connectionInfo = metrics
+        replies = list()
+        while True:
+            self.server.handleRequest(sr)
+            if sr.reply:
+                replies.append(bytes(sr.reply))
+                metrics.replies += 1
+                metrics.bytesSent += len(sr.reply)
+            if not sr.isStreaming():
+                break
+        return replies
+
+    async def __readFrame(self, reader, settings, data):
+        while True:
+            size = GXDLMS.getFrameSize(settings, data)
+            if size <= 0 and data.size != 0:
+                return True
+            if size <= 0:
+                buff = await reader.read(self.bufferSize)
+            else:
+                try:
+                    buff = await reader.readexactly(size)
+                except asyncio.IncompleteReadError:
+                    return False
+            if not buff:
+                return False
+            data.set(buff)
+
+    #pylint: disable=broad-except
+    async def __handleConnection(self, reader, writer):
+        self.__tasks.add(asyncio.current_task())
+        metrics = self.__open(writer.get_extra_info("peername"), "TCP")
+        data = GXByteBuffer()
+        reason = "Closed by peer"
+        try:
+            while True:
+                if self.inactivityTimeout:
+                    ret = await asyncio.wait_for(self.__readFrame(reader, metrics.session.settings, data), self.inactivityTimeout)
+                else:
+                    ret = await self.__readFrame(reader, metrics.session.settings, data)
+                if not ret:
+                    break
+                replies = self.__handleFrame(metrics, data.array())
+                data.clear()
+                for it in replies:
+                    writer.write(it)
+                await writer.drain()
+        except asyncio.TimeoutError:
+            reason = "Inactivity timeout"
+            self.timeouts += 1
+        except asyncio.CancelledError:
+            reason = "Closed"
+        except Exception as ex:
+            _LOGGER.exception("Connection %s failed.", metrics)
+            reason = str(ex)
+        finally:
+            self.__close(metrics, reason)
+            writer.close()
+            self.__tasks.discard(asyncio.current_task())
+
+    def _handleDatagram(self, protocol, data, address):
+        metrics = protocol.connections.get(address)
+        if metrics is None:
+            metrics = self.__open(address, "UDP")
+            protocol.connections[address] = metrics
+        for it in self.__handleFrame(metrics, bytearray(data)):
+            protocol.transport.sendto(it, address)
+
+    async def __sweepUdp(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(min(1, self.inactivityTimeout / 2))
+            expired = loop.time() - self.inactivityTimeout
+            for protocol in self.__endpoints:
+                for address, metrics in list(protocol.connections.items()):
+                    if metrics.lastActivity <= expired:
+                        del protocol.connections[address]
+                        self.timeouts += 1
+                        self.__close(metrics, "Inactivity timeout")
@@ -0,0 +1,259 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import asyncio
+from .AsyncGXDLMSReader import AsyncGXDLMSReader
+from .GXDLMSException import GXDLMSException
+
+class _GXDLMSPoolMeter:
+    """
+    Connection settings and idle associations of one meter.
+    """
+    def __init__(self, createClient, host, port, maxSessions):
+        self.createClient = createClient
+        self.host = host
+        self.port = port
+        # Limits the count of leased associations.
+        self.semaphore = asyncio.Semaphore(maxSessions)
+        # Idle associations as [reader, time when last used] lists.
+        self.idle = list()
+        # Has the meter had an association that was lost.
+        self.lost = False
+
+class _GXDLMSPoolLease:
+    """
+    Async context manager that returns the association to the pool.
+    """
+    def __init__(self, pool, meterId):
+        self.pool = pool
+        self.meterId = meterId
+        self.reader = None
+
+    async def __aenter__(self):
+        self.reader = await self.pool.acquire(self.meterId)
+        return self.reader
+
+    async def __aexit__(self, excType, exc, tb):
+        #  Meter errors don't break the association.
+        await self.pool.release(self.reader, exc is not None and not isinstance(exc, GXDLMSException))
+        return False
+
+# pylint: disable=too-many-instance-attributes
+class AsyncGXDLMSPool:
+    """
+    Keeps authenticated associations of the meters open between the reads.
+
+    Opening the connection, HDLC setup and authentication take most of the
+    time of a single on-demand read.  Pool hands out associations that are
+    already open and keeps the idle ones alive, so the meter doesn't
+    close them for inactivity.
+    """
+
+    #
+    # Constructor.
+    #
+    # keepAliveInterval: Idle association is kept alive after this many
+    #     seconds.  Must be below the inactivity timeout of the meters.
+    # maxIdleTime: Idle association is closed after this many seconds.
+    #     Zero if idle associations are not closed.
+    # timeout: How long connection and replies are waited in seconds.
+    #
+    def __init__(self, keepAliveInterval=60, maxIdleTime=0, timeout=5):
+        self.keepAliveInterval = keepAliveInterval
+        self.maxIdleTime = maxIdleTime
+        self.timeout = timeout
+        # Count of leases that used an open association.
+        self.hits = 0
+        # Count of leases that made a new association.
+        self.misses = 0
+        # Count of new associations made after the previous one was lost.
+        self.reconnects = 0
+        # Count of sent keep-alive messages.
+        self.keepAlives = 0
+        # Count of associations that were found dead.
+        self.deadSessions = 0
+        self.__meters = dict()
+        self.__meterIds = dict()
+        self.__task = None
+
+    def add(self, meterId, createClient, host, port, maxSessions=1):
+        """
+        Add meter to the pool.
+
+        meterId: Meter identifier.
+        createClient: Called without arguments to create DLMS client for
+            a new association.  Each association must have its own client.
+        host: Host name or IP address of the meter.
+        port: TCP port.
+        maxSessions: Maximum count of simultaneous associations.
+        """
+        if meterId in self.__meters:
+            raise ValueError("Meter is already added.")
+        self.__meters[meterId] = _GXDLMSPoolMeter(createClient, host, port, maxSessions)
+
+    def getHitRate(self):
+        """
+        Returns share of the leases that used an open association.
+        """
+        if self.hits + self.misses == 0:
+            return 0
+        return self.hits / (self.hits + self.misses)
+
+    def lease(self, meterId):
+        """
+        Returns async context manager that acquires an association and
+        returns it to the pool.  Association is closed if a connection
+        error is raised.
+
+        meterId: Meter identifier.
+        """
+        return _GXDLMSPoolLease(self, meterId)
+
+    @classmethod
+    def __isAlive(cls, reader):
+        return reader.writer is not None and not reader.writer.is_closing() and \
+            not reader.reader.at_eof()
+
+    async def acquire(self, meterId):
+        """
+        Returns association to the meter.  Wait if the meter has already
+        maximum count of associations leased.  Release the association
+        when it's not needed.
+
+        meterId: Meter identifier.
+        """
+        meter = self.__meters.get(meterId)
+        if meter is None:
+            raise ValueError("Unknown meter.")
+        await meter.semaphore.acquire()
+        try:
+            while meter.idle:
+                reader = meter.idle.pop()[0]
+                if self.__isAlive(reader):
+                    self.hits += 1
+                    self.__meterIds[reader] = meterId
+                    return reader
+                self.deadSessions += 1
+                meter.lost = True
+                self.__abort(reader)
+            self.misses += 1
+            if meter.lost:
+                self.reconnects += 1
+                meter.lost = False
+            reader = await AsyncGXDLMSReader.connect(meter.createClient(), meter.host, meter.port, self.timeout)
+            try:
+                await reader.initializeConnection()
+            except BaseException:
+                self.__abort(reader)
+                raise
+            self.__meterIds[reader] = meterId
+            if self.__task is None:
+                self.__task = asyncio.ensure_future(self.__keepAlive())
+            return reader
+        except BaseException:
+            meter.semaphore.release()
+            raise
+
+    async def release(self, reader, discard=False):
+        """
+        Return association to the pool.
+
+        reader: Association that was acquired from the pool.
+        discard: If True, association is closed.  Use this when the
+            connection is broken.
+        """
+        meterId = self.__meterIds.pop(reader)
+        meter = self.__meters[meterId]
+        if discard or not self.__isAlive(reader):
+            meter.lost = True
+            self.__abort(reader)
+        else:
+            meter.idle.append([reader, asyncio.get_running_loop().time()])
+        meter.semaphore.release()
+
+    @classmethod
+    def __abort(cls, reader):
+        if reader.writer:
+            reader.writer.close()
+            reader.writer = None
+
+    #pylint: disable=broad-except
+    async def __keepAlive(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.keepAliveInterval / 4)
+            for meter in self.__meters.values():
+                #  Meter is skipped if all associations are leased.
+                if not meter.idle or meter.semaphore.locked():
+                    continue
+                await meter.semaphore.acquire()
+                try:
+                    now = loop.time()
+                    for it in list(meter.idle):
+                        if it not in meter.idle:
+                            continue
+                        if self.maxIdleTime and it[1] + self.maxIdleTime <= now:
+                            meter.idle.remove(it)
+                            try:
+                                await it[0].close()
+                            except Exception:
+                                self.__abort(it[0])
+                        elif it[1] + self.keepAliveInterval <= now:
+                            #  Association is not leased while keep-alive is sent.
+                            meter.idle.remove(it)
+                            self.keepAlives += 1
+                            try:
+                                await it[0].keepAlive()
+                                it[1] = loop.time()
+                                meter.idle.append(it)
+                            except Exception:
+                                meter.lost = True
+                                self.deadSessions += 1
+                                self.__abort(it[0])
+                finally:
+                    meter.semaphore.release()
+
+    async def close(self):
+        """
+        Release and close all idle associations.
+        """
+        if self.__task:
+            self.__task.cancel()
+            self.__task = None
+        for meter in self.__meters.values():
+            while meter.idle:
+                reader = meter.idle.pop()[0]
+                try:
+                    await reader.close()
+                except Exception:
+                    self.__abort(reader)
@@ -0,0 +1,619 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import asyncio
+import datetime
+from .GXByteBuffer import GXByteBuffer
+from .GXReplyData import GXReplyData
+from .GXDLMSException import GXDLMSException
+from .GXDLMSScalerUnitCache import GXDLMSScalerUnitCache
+from .enums.Authentication import Authentication
+from .enums.DataType import DataType
+from .enums.Conformance import Conformance
+from .enums.InterfaceType import InterfaceType
+from .enums.Command import Command
+from .GXDateTime import GXDateTime
+from .objects.GXDLMSAssociationLogicalName import GXDLMSAssociationLogicalName
+from .objects.GXDLMSAssociationShortName import GXDLMSAssociationShortName
+
+class AsyncGXDLMSReader:
+    """
+    Reads the meter using asyncio streams.
+
+    GXDLMSClient generates the messages and parses the replies.  Reader
+    only awaits the socket, so one event loop can read several meters at
+    the same time.  Each reader must have its own client.
+    """
+
+    #
+    # Constructor.
+    #
+    # client: DLMS client.
+    # reader: asyncio stream reader.
+    # writer: asyncio stream writer.
+    # timeout: How long reply is waited in seconds.
+    #
+    def __init__(self, client, reader, writer, timeout=5):
+        self.client = client
+        self.reader = reader
+        self.writer = writer
+        # How long reply is waited in seconds.
+        self.timeout = timeout
+        # Maximum amount of bytes that are read from the stream at once when
+        # the frame size is not known.
+        self.bufferSize = 1024
+        # Called with GXReplyData when notification message is received.
+        self.onNotification = None
+        # Fingerprint of the meter when association view cache is used.
+        self.fingerprint = None
+
+    @classmethod
+    async def connect(cls, client, host, port, timeout=5):
+        """
+        Open TCP connection to the meter.
+
+        client: DLMS client.
+        host: Host name or IP address of the meter.
+        port: TCP port.
+        timeout: How long connection and replies are waited in seconds.
+        """
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        return cls(client, reader, writer, timeout)
+
+    #pylint: disable=broad-except
+    async def close(self):
+        """
+        Release association, disconnect and close the connection.
+        """
+        if self.writer:
+            try:
+                reply = GXReplyData()
+                try:
+                    await self.readDataBlock(self.client.releaseRequest(), reply)
+                except Exception:
+                    #  All meters don't support release.
+                    pass
+                reply.clear()
+                await self.readDLMSPacket(self.client.disconnectRequest(), reply)
+            finally:
+                self.writer.close()
+                await self.writer.wait_closed()
+                self.writer = None
+
+    async def keepAlive(self):
+        """
+        Keep the association alive, so meter doesn't close it for
+        inactivity.  HDLC uses receiver ready frame.  Otherwise logical
+        name of the current association is read.
+        """
+        data = self.client.keepAlive()
+        if data is None:
+            if self.client.useLogicalNameReferencing:
+                data = self.client.read(GXDLMSAssociationLogicalName(), 1)
+            else:
+                data = self.client.read(GXDLMSAssociationShortName(), 1)
+        await self.readDataBlock(data, GXReplyData())
+
+    async def readDLMSPacket(self, data, reply=None):
+        """
+        Send message, or messages, and wait the reply.
+
+        data: Message as bytes or list of messages.
+        reply: Reply data.
+        """
+        if reply is None:
+            reply = GXReplyData()
+        if isinstance(data, (bytes, bytearray)):
+            await self.__readDLMSPacket(data, reply)
+        elif data:
+            for it in data:
+                reply.clear()
+                await self.__readDLMSPacket(it, reply)
+        return reply
+
+    async def __readDLMSPacket(self, data, reply):
+        if not data and not reply.isStreaming():
+            return
+        notify = GXReplyData()
+        reply.error = 0
+        rd = GXByteBuffer()
+        if not reply.isStreaming():
+            self.writer.write(data)
+            await self.writer.drain()
+        loop = asyncio.get_running_loop()
+        end = loop.time() + self.timeout
+        msgPos = 0
+        while not self.client.getData(rd, reply, notify):
+            if notify.data.size != 0 and not notify.isMoreData():
+                if self.onNotification:
+                    self.onNotification(notify)
+                notify.clear()
+                msgPos = rd.position
+                continue
+            rd.position = msgPos
+            await self.__readFrame(rd, end - loop.time())
+        if reply.error != 0:
+            raise GXDLMSException(reply.error)
+
+    async def __readFrame(self, rd, timeout):
+        """
+        Read rest of the frame.  Header is read first and then exactly the
+        bytes that are missing, so received data is parsed once per frame.
+        """
+        size = self.client.getFrameSize(rd)
+        try:
+            if size < 1:
+                tmp = await asyncio.wait_for(self.reader.read(self.bufferSize), timeout)
+            else:
+                tmp = await asyncio.wait_for(self.reader.readexactly(size), timeout)
+        except asyncio.IncompleteReadError:
+            tmp = None
+        if not tmp:
+            raise ConnectionError("Connection closed by the meter.")
+        rd.set(tmp)
+
+    async def readDataBlock(self, data, reply):
+        """
+        Send message, or messages, and read all data blocks of the reply.
+
+        data: Message as bytes or list of messages.
+        reply: Reply data.
+        """
+        if data:
+            await self.readDLMSPacket(data, reply)
+            while reply.isMoreData():
+                if reply.isStreaming():
+                    await self.__readDLMSPacket(None, reply)
+                else:
+                    await self.readDLMSPacket(self.client.receiverReady(reply.moreData), reply)
+        return reply
+
+    async def initializeConnection(self):
+        """
+        Open HDLC connection if used, make association and
+        authenticate when high level authentication is used.
+        """
+        reply = GXReplyData()
+        data = self.client.snrmRequest()
+        if data:
+            await self.readDLMSPacket(data, reply)
+            self.client.parseUAResponse(reply.data)
+            reply.clear()
+        await self.readDataBlock(self.client.aarqRequest(), reply)
+        self.client.parseAareResponse(reply.data)
+        reply.clear()
+        if self.client.authentication.value > Authentication.LOW.value:
+            await self.readDataBlock(self.client.getApplicationAssociationRequest(), reply)
+            self.client.parseApplicationAssociationResponse(reply.data)
+
+    async def getAssociationView(self, cache=None):
+        """
+        Read objects that meter supports.
+
+        cache: Association view cache.  If the meter is found from the
+            cache, the object list is not read from the meter.  With short
+            name referencing the object list is always read, because short
+            names of the fingerprint objects are not known, and the cache
+            is used only for scalers and units.
+        """
+        objects = None
+        if cache:
+            if not self.client.useLogicalNameReferencing:
+                objects = await self.__readObjects()
+            values = list()
+            for it, index in cache.getFingerprintObjects(self.client):
+                try:
+                    values.append(await self.read(it, index))
+                except GXDLMSException:
+                    values.append(None)
+            self.fingerprint = tuple(values)
+            cached = cache.get(self.client, self.fingerprint)
+            if cached is not None:
+                return cached
+        if objects is None:
+            objects = await self.__readObjects()
+        if cache:
+            cache.set(self.fingerprint, objects)
+        return objects
+
+    async def __readObjects(self):
+        reply = GXReplyData()
+        await self.readDataBlock(self.client.getObjectsRequest(), reply)
+        return self.client.parseObjects(reply.data, True)
+
+    async def readScalerAndUnits(self, cache=None):
+        """
+        Read scalers and units of the association view that are not known
+        yet.  Scalers and units that are in the scaler and unit cache of the
+        client are not read.
+
+        cache: Association view cache.  If it's given, the association view
+            is saved again after the read, so scalers and units are cached.
+        """
+        objects = [it for it in self.client.objects if GXDLMSScalerUnitCache.getScalerUnitIndex(it) != 0 and not GXDLMSScalerUnitCache.isScalerUnitRead(it)]
+        for it in self.client.updateScalerUnits(objects):
+            try:
+                await self.read(it, GXDLMSScalerUnitCache.getScalerUnitIndex(it))
+            except GXDLMSException:
+                #  Scaler and unit are not readable.
+                pass
+        if cache and objects:
+            cache.set(self.fingerprint, self.client.objects)
+
+    async def read(self, item, attributeIndex):
+        """
+        Read attribute value.
+
+        item: COSEM object.
+        attributeIndex: Attribute index.
+        """
+        reply = GXReplyData()
+        await self.readDataBlock(self.client.read(item, attributeIndex)[0], reply)
+        if item.getDataType(attributeIndex) == DataType.NONE:
+            item.setDataType(attributeIndex, reply.valueType)
+        return self.client.updateValue(item, attributeIndex, reply.value)
+
+    async def readList(self, list_):
+        """
+        Read several attributes with one request.
+
+        list_: List of (COSEM object, attribute index) tuples.
+        """
+        if list_:
+            reply = GXReplyData()
+            values = list()
+            while True:
+                try:
+                    for it in self.client.readList(list_):
+                        await self.readDataBlock(it, reply)
+                        values.extend(reply.value)
+                        reply.clear()
+                    break
+                except GXDLMSException:
+                    #  Meter rejected the request.  Read again with smaller
+                    #  requests.  Errors of the single items are not retried.
+                    if isinstance(reply.value, list) or not self.client.readListPlanner.reject():
+                        raise
+                    values.clear()
+                    reply.clear()
+            if len(values) != len(list_):
+                raise ValueError("Invalid reply. Read items count do not match.")
+            self.client.updateValues(list_, values)
+
+    async def readPipelined(self, list_, depth=4):
+        """
+        Read attributes so that several requests are waiting for the reply
+        at the same time.  Replies are matched to the requests by the
+        invoke ID, so the meter can send them in any order.  Exception
+        response and confirmed service error don't have the invoke ID, so
+        they can't be matched to the request.  After them new requests are
+        not sent, replies of the sent requests are read and attributes
+        that are not read are read again one by one.  Reply with several
+        data blocks is read again as well, if other requests are sent
+        after it.  Pipelining is used only with the Wrapper interface when
+        general block transfer is not used.  Otherwise attributes are read
+        one by one.
+
+        list_: List of (COSEM object, attribute index) tuples.
+        depth: Maximum count of the requests that are waiting for the
+            reply.  Maximum value is 16.
+        Returns read values.  If the meter returns an error, the
+        exception is returned instead of the value.
+        """
+        if depth < 1 or depth > 16:
+            raise ValueError("Invalid depth.")
+        values = list()
+        if depth == 1 or self.client.interfaceType != InterfaceType.WRAPPER or \
+            (self.client.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) != Conformance.NONE:
+            for it in list_:
+                values.append(await self.__readItem(it))
+            return values
+        settings = self.client.settings
+        values = [None] * len(list_)
+        # Positions of the sent requests by invoke ID.
+        pending = dict()
+        # Replies that have more data blocks as (position, reply, block index).
+        blocks = list()
+        # Positions of the attributes that are read again one by one.
+        retry = list()
+        # Count of the replies without the invoke ID.
+        errors = 0
+        invokeId = settings.invokeId
+        rd = GXByteBuffer()
+        pos = 0
+        while (pos != len(list_) and errors == 0) or len(pending) != errors or blocks:
+            #  New requests are not sent when reply has more data blocks,
+            #  because data blocks are read one transfer at the time.
+            while pos != len(list_) and errors == 0 and len(pending) != depth and not blocks:
+                invokeId = (invokeId + 1) & 0xF
+                while invokeId in pending:
+                    invokeId = (invokeId + 1) & 0xF
+                self.writer.write(self.__getReadRequest(list_[pos], invokeId))
+                pending[invokeId] = pos
+                pos += 1
+            if len(pending) != errors:
+                await self.writer.drain()
+                reply = GXReplyData()
+                try:
+                    await self.__readReply(rd, reply)
+                except Exception:
+                    if reply.command not in (Command.EXCEPTION_RESPONSE, Command.CONFIRMED_SERVICE_ERROR):
+                        raise
+                    #  Replies can come in any order, so it's not known
+                    #  which request failed.
+                    errors += 1
+                    if rd.position == rd.size:
+                        rd.clear()
+                    continue
+                index = pending.pop(reply.invokeId & 0xF, None)
+                if index is None:
+                    #  Reply to unknown request.
+                    continue
+                if reply.error != 0:
+                    values[index] = GXDLMSException(reply.error)
+                elif reply.isMoreData():
+                    #  Meter can cancel the transfer of the data blocks when
+                    #  it receives the next request, so data blocks are read
+                    #  only if the request is the last that is sent.
+                    if index == pos - 1:
+                        blocks.append((index, reply, settings.blockIndex))
+                    else:
+                        retry.append(index)
+                else:
+                    values[index] = self.__updateValue(list_[index], reply)
+            else:
+                index, reply, settings.blockIndex = blocks.pop(0)
+                settings.setInvokeID(reply.invokeId & 0xF)
+                try:
+                    while reply.isMoreData():
+                        await self.readDLMSPacket(self.client.receiverReady(reply.moreData), reply)
+                    values[index] = self.__updateValue(list_[index], reply)
+                except GXDLMSException as ex:
+                    values[index] = ex
+        settings.setInvokeID(invokeId)
+        #  Requests that failed without the invoke ID, cancelled data
+        #  block transfers and requests that are not sent yet are read
+        #  one by one.
+        for index in sorted(list(pending.values()) + retry + list(range(pos, len(list_)))):
+            values[index] = await self.__readItem(list_[index])
+        return values
+
+    async def __readItem(self, item):
+        """
+        Read one attribute.  If the meter returns an error, the exception
+        is returned instead of the value.
+        """
+        reply = GXReplyData()
+        try:
+            await self.readDataBlock(self.client.read(item[0], item[1])[0], reply)
+        except GXDLMSException as ex:
+            return ex
+        except Exception as ex:
+            if reply.command not in (Command.EXCEPTION_RESPONSE, Command.CONFIRMED_SERVICE_ERROR):
+                raise
+            return ex
+        return self.__updateValue(item, reply)
+
+    def __getReadRequest(self, item, invokeId):
+        #  Client increases the invoke ID before the request is generated.
+        if self.client.autoIncreaseInvokeID:
+            self.client.settings.setInvokeID((invokeId - 1) & 0xF)
+        else:
+            self.client.settings.setInvokeID(invokeId)
+        return self.client.read(item[0], item[1])[0]
+
+    def __updateValue(self, item, reply):
+        if item[0].getDataType(item[1]) == DataType.NONE:
+            item[0].setDataType(item[1], reply.valueType)
+        return self.client.updateValue(item[0], item[1], reply.value)
+
+    async def __readReply(self, rd, reply):
+        """
+        Read next reply from the stream.  Received data that belongs to
+        the next replies is left to rd.
+        """
+        notify = GXReplyData()
+        loop = asyncio.get_running_loop()
+        end = loop.time() + self.timeout
+        msgPos = rd.position
+        while not self.client.getData(rd, reply, notify):
+            if notify.data.size != 0 and not notify.isMoreData():
+                if self.onNotification:
+                    self.onNotification(notify)
+                notify.clear()
+                msgPos = rd.position
+                continue
+            rd.position = msgPos
+            await self.__readFrame(rd, end - loop.time())
+        if rd.position == rd.size:
+            rd.clear()
+
+    async def write(self, item, attributeIndex):
+        """
+        Write attribute value.
+
+        item: COSEM object.
+        attributeIndex: Attribute index.
+        """
+        await self.readDLMSPacket(self.client.write(item, attributeIndex))
+
+    async def readRowsByEntry(self, pg, index, count):
+        """
+        Read profile generic rows by entry.
+
+        pg: Profile generic.
+        index: One based start index.  Zero is handled as one.
+        count: Read row count.
+        """
+        async for _ in self.iterRowsByEntry(pg, index, count, buffer=True):
+            pass
+        return pg.buffer
+
+    async def readRowsByRange(self, pg, start, end):
+        """
+        Read profile generic rows by range.
+
+        pg: Profile generic.
+        start: Start time.
+        end: End time.
+        """
+        async for _ in self.iterRowsByRange(pg, start, end, buffer=True):
+            pass
+        return pg.buffer
+
+    async def iterRowsByEntry(self, pg, index, count, columns=None, buffer=False):
+        """
+        Read profile generic rows by entry.  Rows are returned as soon as
+        the data block they are in is received.
+
+        pg: Profile generic.
+        index: One based start index.  Zero is handled as one.
+        count: Read row count.
+        columns: Read columns.  If None, all capture objects are read.
+        buffer: Are rows also added to the buffer of the profile generic.
+        """
+        #  Entries are one based.  Zero would make the range one row short.
+        if index == 0:
+            index = 1
+        data = self.client.readRowsByEntry(pg, index, count, columns)
+        async for it in self.__iterRows(data, pg, columns, buffer):
+            yield it
+
+    async def iterRowsByRange(self, pg, start, end, columns=None, buffer=False):
+        """
+        Read profile generic rows by range.  Rows are returned as soon as
+        the data block they are in is received.
+
+        pg: Profile generic.
+        start: Start time.
+        end: End time.
+        columns: Read columns.  If None, all capture objects are read.
+        buffer: Are rows also added to the buffer of the profile generic.
+        """
+        data = self.client.readRowsByRange(pg, start, end, columns)
+        async for it in self.__iterRows(data, pg, columns, buffer):
+            yield it
+
+    async def readNewRows(self, pg, store, meter):
+        """
+        Read profile generic rows that are not collected yet and update
+        the checkpoint.
+
+        pg: Profile generic.
+        store: Profile checkpoint store.
+        meter: Meter identifier in the checkpoint store.
+        """
+        async for _ in self.iterNewRows(pg, store, meter, buffer=True):
+            pass
+        return pg.buffer
+
+    async def iterNewRows(self, pg, store, meter, buffer=False):
+        """
+        Read profile generic rows that are not collected yet.  Rows are
+        returned as soon as the data block they are in is received.
+        Checkpoint is updated when all rows are read.
+
+        pg: Profile generic.
+        store: Profile checkpoint store.
+        meter: Meter identifier in the checkpoint store.
+        buffer: Are rows also added to the buffer of the profile generic.
+        """
+        if not pg.captureObjects:
+            await self.read(pg, 3)
+        list_ = [(pg, 5), (pg, 7), (pg, 8)]
+        if (self.client.negotiatedConformance & Conformance.MULTIPLE_REFERENCES) != Conformance.NONE:
+            await self.readList(list_)
+        else:
+            for it, index in list_:
+                await self.read(it, index)
+        entries = pg.entriesInUse
+        index, count, start = store.getNewRows(meter, pg)
+        if start is None:
+            if count == 0:
+                return
+            data = self.client.readRowsByEntry(pg, index, count)
+        else:
+            end = datetime.datetime.now(start.tzinfo) + datetime.timedelta(days=1)
+            data = self.client.readRowsByRange(pg, start, end)
+        column = store.getTimeColumn(pg)
+        checkpoint = store.get(meter, pg.logicalName)
+        time = None
+        if checkpoint:
+            time = checkpoint[1]
+        skip = None
+        if start is not None and column != -1:
+            #  Range can start before the checkpoint.
+            def skip(row):
+                return isinstance(row[column], GXDateTime) and row[column].value <= start
+        async for it in self.__iterRows(data, pg, None, buffer, skip):
+            if column != -1 and isinstance(it[column], GXDateTime):
+                if time is None or time < it[column].value:
+                    time = it[column].value
+            yield it
+        store.set(meter, pg.logicalName, entries, time)
+
+    async def __iterRows(self, data, pg, columns, buffer, skip=None):
+        """
+        Send the request and return the rows as soon as the data block
+        they are in is received.  Rows are added to the buffer only after
+        all rows are read, so a retry after a failed read doesn't add the
+        same rows twice.
+
+        skip: Function that returns True for the rows that are not
+            returned.
+        """
+        reply = GXReplyData()
+        lastRow = None
+        received = []
+        if buffer and pg.buffer:
+            lastRow = pg.buffer[len(pg.buffer) - 1]
+        await self.readDLMSPacket(data, reply)
+        while True:
+            rows = self.client.getRows(pg, reply, columns, lastRow)
+            if rows:
+                lastRow = rows[len(rows) - 1]
+                if skip:
+                    rows = [it for it in rows if not skip(it)]
+                if buffer:
+                    received.extend(rows)
+                for it in rows:
+                    yield it
+            if not reply.isMoreData():
+                break
+            if reply.isStreaming():
+                await self.__readDLMSPacket(None, reply)
+            else:
+                await self.readDLMSPacket(self.client.receiverReady(reply.moreData), reply)
+        if buffer:
+            pg.buffer.extend(received)
+            pg.entriesInUse = len(pg.buffer)
@@ -0,0 +1,180 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import asyncio
+from collections import OrderedDict, deque
+from .AsyncGXDLMSReader import AsyncGXDLMSReader
+from .GXDLMSException import GXDLMSException
+
+# pylint: disable=too-many-instance-attributes
+class AsyncGXDLMSScheduler:
+    """
+    Reads GXDLMSPollJob jobs of the meter fleet concurrently.
+
+    The count of simultaneous connections is limited in total and per
+    gateway.  Gateways are served in turns, so one big gateway can't
+    starve the others.  If the meter returns an error, the job is tried
+    again with the same association.  If the connection fails or the job
+    is too slow, it is moved to the end of its gateway queue and it
+    continues later from the step that failed.
+    """
+
+    #
+    # Constructor.
+    #
+    # maxConcurrency: Maximum count of simultaneous connections.
+    # maxPerGateway: Maximum count of simultaneous connections per gateway.
+    # timeout: How long reply is waited in seconds.
+    #
+    def __init__(self, maxConcurrency=100, maxPerGateway=4, timeout=5):
+        self.maxConcurrency = maxConcurrency
+        self.maxPerGateway = maxPerGateway
+        # Gateway specific connection limits.  Key is the gateway name.
+        self.gatewayLimits = dict()
+        # How long reply is waited in seconds.
+        self.timeout = timeout
+        # How long one run of the job can take in seconds.
+        self.jobTimeout = 300
+        # How many times failed job is tried again.
+        self.retries = 2
+        # Called with the job when job is completed or it has failed.
+        self.onJobDone = None
+        self.jobs = list()
+        # Count of completed jobs.
+        self.completedCount = 0
+        # Count of failed jobs.
+        self.failedCount = 0
+        self.__start = None
+        self.__end = None
+
+    def add(self, job):
+        """
+        Add job to the scheduler.
+        """
+        self.jobs.append(job)
+
+    def getJobsPerSecond(self):
+        """
+        Returns count of completed jobs per second.
+        """
+        if self.__start is None:
+            return 0
+        end = self.__end
+        if end is None:
+            end = asyncio.get_running_loop().time()
+        if end == self.__start:
+            return 0
+        return self.completedCount / (end - self.__start)
+
+    def __getLimit(self, gateway):
+        if gateway is None:
+            return self.maxConcurrency
+        return self.gatewayLimits.get(gateway, self.maxPerGateway)
+
+    #pylint: disable=broad-except
+    async def __runJob(self, job):
+        job.attempts += 1
+        reader = None
+        try:
+            reader = await AsyncGXDLMSReader.connect(job.client, job.host, job.port, self.timeout)
+            while True:
+                try:
+                    await asyncio.wait_for(job.run(reader), self.jobTimeout)
+                    break
+                except GXDLMSException as ex:
+                    #  Meter returned an error, but the association is
+                    #  still valid.
+                    if job.attempts > self.retries:
+                        raise
+                    job.error = ex
+                    job.attempts += 1
+            job.error = None
+            await reader.close()
+        except Exception as ex:
+            job.error = ex
+            if reader and reader.writer:
+                reader.writer.close()
+                reader.writer = None
+        return job
+
+    async def run(self):
+        """
+        Run all added jobs.  Returns when all jobs are completed or
+        they have failed.  ValueError is raised if the connection limit
+        doesn't allow some job to run.
+        """
+        queues = OrderedDict()
+        for it in self.jobs:
+            if not it.completed:
+                queues.setdefault(it.gateway, deque()).append(it)
+        if self.maxConcurrency < 1:
+            raise ValueError("Invalid maximum concurrency.")
+        for it in queues:
+            if self.__getLimit(it) < 1:
+                raise ValueError("Invalid connection limit for gateway " + str(it) + ".")
+        loop = asyncio.get_running_loop()
+        self.__start = loop.time()
+        self.__end = None
+        running = dict()
+        tasks = set()
+        while queues or tasks:
+            # Start one job from each gateway in turn until limits are met.
+            started = True
+            while started and len(tasks) < self.maxConcurrency:
+                started = False
+                for gateway in list(queues):
+                    if len(tasks) == self.maxConcurrency:
+                        break
+                    if running.get(gateway, 0) < self.__getLimit(gateway):
+                        job = queues[gateway].popleft()
+                        if queues[gateway]:
+                            queues.move_to_end(gateway)
+                        else:
+                            del queues[gateway]
+                        running[gateway] = running.get(gateway, 0) + 1
+                        tasks.add(asyncio.ensure_future(self.__runJob(job)))
+                        started = True
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for it in done:
+                job = it.result()
+                running[job.gateway] -= 1
+                if job.completed:
+                    self.completedCount += 1
+                elif job.attempts <= self.retries:
+                    queues.setdefault(job.gateway, deque()).append(job)
+                    continue
+                else:
+                    self.failedCount += 1
+                if self.onJobDone:
+                    self.onJobDone(job)
+        self.__end = loop.time()
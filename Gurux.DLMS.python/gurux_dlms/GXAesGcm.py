@@ -0,0 +1,113 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+# cryptography is optional.  If it is installed AES-GCM is counted with it.
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = None
+from .enums.Security import Security
+from .GXDLMSChipperingStream import GXDLMSChipperingStream
+
+__all__ = ["GXAesGcm", "GXAesGcmCryptography"]
+
+#
+# AES-GCM implementation that is used to cipher DLMS messages.
+#
+# This is the pure Python implementation that is always available.
+# Tag size is 12 bytes.
+#
+class GXAesGcm:
+
+    #
+    # Encrypt data and count authentication tag.
+    #
+    # @param key
+    # Block cipher key.
+    # @param iv
+    # Initialization vector.
+    # @param aad
+    # Additional authenticated data.
+    # @param plainText
+    # Data to encrypt.  This is empty when only tag is counted.
+    # @return Cipher text and tag.
+    #
+    def encrypt(self, key, iv, aad, plainText):
+        gcm = GXDLMSChipperingStream(Security.AUTHENTICATION_ENCRYPTION, True, key, aad, iv, None)
+        gcm.write(plainText)
+        cipherText = gcm.flushFinalBlock()
+        return cipherText, gcm.tag
+
+    #
+    # Decrypt data.  Tag is not checked.
+    #
+    # @param key
+    # Block cipher key.
+    # @param iv
+    # Initialization vector.
+    # @param aad
+    # Additional authenticated data.
+    # @param cipherText
+    # Data to decrypt.
+    # @return Plain text.
+    #
+    def decrypt(self, key, iv, aad, cipherText):
+        gcm = GXDLMSChipperingStream(Security.ENCRYPTION, True, key, aad, iv, None)
+        gcm.write(cipherText)
+        return gcm.flushFinalBlock()
+
+    def __str__(self):
+        return "Python"
+
+#
+# AES-GCM implementation that uses cryptography package.
+#
+class GXAesGcmCryptography(GXAesGcm):
+
+    def __init__(self):
+        if AESGCM is None:
+            raise ValueError("cryptography package is not installed.")
+
+    def encrypt(self, key, iv, aad, plainText):
+        ret = AESGCM(bytes(key)).encrypt(bytes(iv), bytes(plainText), bytes(aad) if aad else None)
+        return bytearray(ret[0:-16]), bytearray(ret[-16:-4])
+
+    def decrypt(self, key, iv, aad, cipherText):
+        #  GCM encryption is CTR mode that starts from the counter value two.
+        counter = bytes(iv) + b"\x00\x00\x00\x02"
+        decryptor = Cipher(algorithms.AES(bytes(key)), modes.CTR(counter)).decryptor()
+        return bytearray(decryptor.update(bytes(cipherText)) + decryptor.finalize())
+
+    def __str__(self):
+        return "cryptography"
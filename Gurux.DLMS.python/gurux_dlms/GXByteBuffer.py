@@ -42,6 +42,15 @@ class GXByteBuffer(Sequence):
     """
 
     __ARRAY_CAPACITY = 10
+    #  DLMS uses big endian byte order.
+    __UINT16 = struct.Struct(">H")
+    __INT16 = struct.Struct(">h")
+    __UINT32 = struct.Struct(">I")
+    __INT32 = struct.Struct(">i")
+    __UINT64 = struct.Struct(">Q")
+    __INT64 = struct.Struct(">q")
+    __FLOAT = struct.Struct(">f")
+    __DOUBLE = struct.Struct(">d")
 
     def __init__(self, value=None):
         """
@@ -90,21 +99,26 @@ class GXByteBuffer(Sequence):
             self._data = bytearray()
             self.__size = 0
             self.__position = 0
-        else:
-            if not self._data:
-                self._data = bytearray(capacity)
-            else:
-                tmp = self._data
-                self._data = bytearray(capacity)
-                if self.size < capacity:
-                    self._data[0:self.size] = tmp
-                else:
-                    self._data[0:capacity] = self._data
-                    self.__size = capacity
+        elif capacity != len(self._data):
+            tmp = self._data
+            self._data = bytearray(capacity)
+            if self.__size > capacity:
+                self.__size = capacity
+                if self.__position > capacity:
+                    self.__position = capacity
+            self._data[0:self.__size] = memoryview(tmp)[0:self.__size]
 
     capacity = property(getCapacity, setCapacity)
     """Buffer capacity."""
 
+    def __ensureCapacity(self, size):
+        """
+        Make sure that buffer can hold size bytes.
+        Capacity is doubled when buffer grows so appending is amortized O(1).
+        """
+        if size > len(self._data):
+            self.setCapacity(max(size, 2 * len(self._data), self.__ARRAY_CAPACITY))
+
     def getPosition(self):
         return self.__position
 
@@ -160,6 +174,27 @@ class GXByteBuffer(Sequence):
             return self._data[index:index + count]
         return bytearray(0)
 
+    def view(self, index=0, count=None):
+        """
+        Returns memoryview of the buffer data without copying it.
+        The view is valid until the buffer is modified.
+
+        index: Start index.
+        count: Byte count. If not given, data to the end of the buffer is used.
+        """
+        if count is None:
+            count = self.__size - index
+        if index < 0 or count < 0 or index + count > self.__size:
+            raise ValueError("view")
+        return memoryview(self._data)[index:index + count]
+
+    def remainingView(self):
+        """
+        Returns non read bytes as memoryview without copying them.
+        The view is valid until the buffer is modified.
+        """
+        return self.view(self.__position, self.__size - self.__position)
+
     #
     #      Move content from source to destination.
     #
@@ -186,10 +221,10 @@ class GXByteBuffer(Sequence):
     #
     def trim(self):
         if self.size == self.position:
-            self.size(0)
+            self.size = 0
         else:
             self.move(self.position, 0, self.size - self.position)
-        self.position(0)
+        self.position = 0
 
     #
     #      Push the given byte into this buffer at the current position, and
@@ -203,11 +238,12 @@ class GXByteBuffer(Sequence):
         if isinstance(item, Enum):
             item = item.value
         if index is None:
-            self.setUInt8(item, self.size)
-            self.size += 1
+            index = self.__size
+            self.__ensureCapacity(index + 1)
+            self._data[index] = item
+            self.__size = index + 1
         else:
-            if index >= self.capacity:
-                self.capacity = index + self.__ARRAY_CAPACITY
+            self.__ensureCapacity(index + 1)
             self._data[index] = item
 
     #
@@ -222,181 +258,89 @@ class GXByteBuffer(Sequence):
         self.setUInt8(item & 0xFF, index)
 
     def setUInt16(self, item, index=None):
-        if index is None:
-            self.setUInt16(item, self.size)
-            self.size += 2
-        else:
-            if index + 2 >= self.capacity:
-                self.capacity = (index + self.__ARRAY_CAPACITY)
-            self._data[index] = int(((item >> 8) & 0xFF))
-            self._data[index + 1] = int((item & 0xFF))
+        self.__setValue(self.__UINT16, item & 0xFFFF, index)
 
     def setUInt32(self, item, index=None):
-        if index is None:
-            self.setUInt32(item, self.size)
-            self.size += 4
-        else:
-            if index + 4 >= self.capacity:
-                self.capacity = index + self.__ARRAY_CAPACITY
-            self._data[index] = int(((item >> 24) & 0xFF))
-            self._data[index + 1] = int(((item >> 16) & 0xFF))
-            self._data[index + 2] = int(((item >> 8) & 0xFF))
-            self._data[index + 3] = int((item & 0xFF))
+        self.__setValue(self.__UINT32, item & 0xFFFFFFFF, index)
 
     def setUInt64(self, item, index=None):
-        if index is None:
-            self.setUInt64(item, self.size)
-            self.size += 8
-        else:
-            if index + 8 >= self.capacity:
-                self.capacity = (index + self.__ARRAY_CAPACITY)
-            self._data[self.size] = int(((item >> 56) & 0xFF))
-            self._data[self.size + 1] = int(((item >> 48) & 0xFF))
-            self._data[self.size + 2] = int(((item >> 40) & 0xFF))
-            self._data[self.size + 3] = int(((item >> 32) & 0xFF))
-            self._data[self.size + 4] = int(((item >> 24) & 0xFF))
-            self._data[self.size + 5] = int(((item >> 16) & 0xFF))
-            self._data[self.size + 6] = int(((item >> 8) & 0xFF))
-            self._data[self.size + 7] = int((item & 0xFF))
+        self.__setValue(self.__UINT64, item & 0xFFFFFFFFFFFFFFFF, index)
 
     def setFloat(self, value, index=None):
-        if index is None:
-            self.setFloat(value, self.size)
-            self.size += 4
-        else:
-            self.set(struct.pack("f", value))
+        self.__setValue(self.__FLOAT, value, index)
 
     def setDouble(self, value, index=None):
+        self.__setValue(self.__DOUBLE, value, index)
+
+    def __setValue(self, fmt, value, index):
+        """
+        Pack fixed size value to the buffer.
+        If index is not given, value is appended to the end of the buffer.
+        """
         if index is None:
-            self.setDouble(value, self.size)
-            self.size += 8
+            index = self.__size
+            self.__ensureCapacity(index + fmt.size)
+            fmt.pack_into(self._data, index, value)
+            self.__size = index + fmt.size
         else:
-            self.set(struct.pack("d", value))
+            self.__ensureCapacity(index + fmt.size)
+            fmt.pack_into(self._data, index, value)
+
+    def __getValue(self, fmt, index, name):
+        """
+        Unpack fixed size value from the buffer.
+        If index is not given, value is read from the current position
+        and position is increased.
+        """
+        if index is None:
+            index = self.__position
+            if index + fmt.size > self.__size:
+                raise ValueError(name)
+            self.__position = index + fmt.size
+        elif index + fmt.size > self.__size:
+            raise ValueError(name)
+        return fmt.unpack_from(self._data, index)[0]
 
     def getUInt8(self, index=None):
         if index is None:
-            index = self.position
-            value = self._data[index] & 0xFF
-            value = value % 2 ** 8
-            self.position += 1
-            return value
-        if index >= self.size:
+            index = self.__position
+            if index >= self.__size:
+                raise ValueError("getUInt8")
+            self.__position = index + 1
+            return self._data[index]
+        if index >= self.__size:
             raise ValueError("getUInt8")
-        value = self._data[index] & 0xFF
-        value = value % 2 ** 8
-        return value
+        return self._data[index]
 
     def getInt8(self, index=None):
-        if index is None:
-            index = self.position
-            value = self._data[index]
-            value = (value + 2 ** 7) % 2 ** 8 - 2 ** 7
-            self.position += 1
-            return value
-        if index >= self.size:
-            raise ValueError("getInt8")
-        value = self._data[index]
-        value = (value + 2 ** 7) % 2 ** 8 - 2 ** 7
+        value = self.getUInt8(index)
+        if value > 0x7F:
+            return value - 0x100
         return value
 
     def getUInt16(self, index=None):
-        if index is None:
-            index = self.position
-            value = ((self._data[index] & 0xFF) << 8) | (self._data[index + 1] & 0xFF)
-            value = value % 2 ** 16
-            self.position += 2
-            return value
-        if index + 2 > self.size:
-            raise ValueError("getUInt16")
-        value = ((self._data[index] & 0xFF) << 8) | (self._data[index + 1] & 0xFF)
-        value = value % 2 ** 16
-        return value
+        return self.__getValue(self.__UINT16, index, "getUInt16")
 
-    def getInt16(self):
-        return (self.getUInt16() + 2 ** 15) % 2 ** 16 - 2 ** 15
+    def getInt16(self, index=None):
+        return self.__getValue(self.__INT16, index, "getInt16")
 
     def getInt32(self, index=None):
-        if index is None:
-            index = self.position
-            if index + 4 > self.size:
-                raise ValueError("getInt32")
-            value = (self._data[index] & 0xFF) << 24 | (self._data[index + 1] & 0xFF) << 16 | (self._data[index + 2] & 0xFF) << 8 | (self._data[index + 3] & 0xFF)
-            value = (value + 2 ** 31) % 2 ** 32 - 2 ** 31
-            self.position += 4
-            return value
-
-        if index + 4 > self.size:
-            raise ValueError("getInt32")
-        value = (self._data[index] & 0xFF) << 24 | (self._data[index + 1] & 0xFF) << 16 | (self._data[index + 2] & 0xFF) << 8 | (self._data[index + 3] & 0xFF)
-        value = (value + 2 ** 31) % 2 ** 32 - 2 ** 31
-        return value
+        return self.__getValue(self.__INT32, index, "getInt32")
 
     def getUInt32(self, index=None):
-        if index is None:
-            index = self.position
-            self.position += 4
-        if index + 4 > self.size:
-            raise ValueError("getUInt32")
-        value = self._data[index] & 0xFF
-        value = value << 24
-        value |= (self._data[index + 1] & 0xFF) << 16
-        value |= (self._data[index + 2] & 0xFF) << 8
-        value |= (self._data[index + 3] & 0xFF)
-        value = value % 2 ** 32
-        return value
+        return self.__getValue(self.__UINT32, index, "getUInt32")
 
     def getFloat(self, index=None):
-        if index is None:
-            index = self.position
-        tmp = bytearray(4)
-        self.get(tmp)
-        # Swap bytes.
-        tmp2 = tmp[0]
-        tmp[0] = tmp[3]
-        tmp[3] = tmp2
-        tmp2 = tmp[1]
-        tmp[1] = tmp[2]
-        tmp[2] = tmp2
-        return struct.unpack("f", tmp)
+        return self.__getValue(self.__FLOAT, index, "getFloat")
 
     def getDouble(self, index=None):
-        if index is None:
-            index = self.position
-        tmp = bytearray(8)
-        self.get(tmp)
-        # Swap bytes.
-        tmp2 = tmp[0]
-        tmp[0] = tmp[7]
-        tmp[7] = tmp2
-        tmp2 = tmp[1]
-        tmp[1] = tmp[6]
-        tmp[6] = tmp2
-        tmp2 = tmp[2]
-        tmp[2] = tmp[5]
-        tmp[5] = tmp2
-        tmp2 = tmp[3]
-        tmp[3] = tmp[4]
-        tmp[4] = tmp2
-        return struct.unpack("d", tmp)
+        return self.__getValue(self.__DOUBLE, index, "getDouble")
 
     def getInt64(self, index=None):
-        if index is None:
-            index = self.position
-            self.position += 8
-        value = ((self._data[index] & 0xFF)) << 56
-        value |= ((self._data[index + 1] & 0xFF)) << 48
-        value |= ((self._data[index + 2] & 0xFF)) << 40
-        value |= ((self._data[index + 3] & 0xFF)) << 32
-        value |= ((self._data[index + 4] & 0xFF)) << 24
-        value |= (self._data[index + 5] & 0xFF) << 16
-        value |= (self._data[index + 6] & 0xFF) << 8
-        value |= (self._data[index + 7] & 0xFF)
-        value = (value + 2 ** 63) % 2 ** 64 - 2 ** 63
-        return value
+        return self.__getValue(self.__INT64, index, "getInt64")
 
     def getUInt64(self, index=None):
-        value = self.getInt64(index)
-        return value % 2 ** 64
+        return self.__getValue(self.__UINT64, index, "getUInt64")
 
     #
     #      Check is byte buffer ASCII string.
@@ -447,8 +391,10 @@ class GXByteBuffer(Sequence):
                 self.set(value._data, index, count)
                 value.position = index + count
             elif value and count != 0:
-                if self.size + count > self.capacity:
-                    self.capacity = self.size + count + self.__ARRAY_CAPACITY
+                self.__ensureCapacity(self.size + count)
+                if isinstance(value, (bytes, bytearray, memoryview)):
+                    #  Copy straight from the source without a temporary slice.
+                    value = memoryview(value)
                 self._data[self.size:self.size + count] = value[index:index + count]
                 self.size += count
 
@@ -456,10 +402,8 @@ class GXByteBuffer(Sequence):
         len1 = len(target)
         if self.size - self.position < len1:
             raise ValueError("get")
-        index = 0
-        for index in range(0, len1):
-            target[index] = self._data[self.position]
-            self.position = self.position + 1
+        target[0:len1] = memoryview(self._data)[self.position:self.position + len1]
+        self.position += len1
 
     #
     #      Compares, whether two given arrays are similar starting from current
@@ -31,10 +31,12 @@
 #  This code is licensed under the GNU General Public License v2.
 #  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
 # ---------------------------------------------------------------------------
+import copy
 from .enums import Security
 from .GXICipher import GXICipher
 from .objects.enums import SecuritySuite
 from .GXDLMSChippering import GXDLMSChippering
+from .GXDLMSChipperingStream import GXDLMSChipperingStream
 from .AesGcmParameter import AesGcmParameter
 from .GXByteBuffer import GXByteBuffer
 
@@ -54,6 +56,7 @@ class GXCiphering(GXICipher):
         # System title.
         self.systemTitle = title
         # Block cipher key.
+        self.__blockCipherKey = None
         self.blockCipherKey = bytes((0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F))
         self.authenticationKey = bytes((0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0xDA, 0xDB, 0xDC, 0xDD, 0xDE, 0xDF))
         # Dedicated key.
@@ -64,8 +67,11 @@ class GXCiphering(GXICipher):
         self.ephemeralKeyPair = None
         # recipient system title.
         self.recipientSystemTitle = None
-        # Invocation Counter.
-        self.invocationCounter = 0
+        # Cipher that owns the invocation counter of the global key.  None
+        # if this cipher owns it.
+        self.__shared = None
+        # Invocation counter of this cipher.
+        self.__invocationCounter = 0
         # Used security suite.
         self.securitySuite = SecuritySuite.AES_GCM_128
         # Signing key pair.
@@ -77,6 +83,51 @@ class GXCiphering(GXICipher):
         # Shared secret is generated when connection is made.
         self.sharedSecret = None
 
+    def __getBlockCipherKey(self):
+        return self.__blockCipherKey
+
+    def __setBlockCipherKey(self, value):
+        #  Expanded old key is removed from the key cache.
+        if self.__blockCipherKey:
+            GXDLMSChipperingStream.clearKeyCache(self.__blockCipherKey)
+        self.__blockCipherKey = value
+
+    #
+    # Block cipher key.
+    #
+    blockCipherKey = property(__getBlockCipherKey, __setBlockCipherKey)
+
+    def __getInvocationCounter(self):
+        if self.__shared:
+            return self.__shared.invocationCounter
+        return self.__invocationCounter
+
+    def __setInvocationCounter(self, value):
+        if self.__shared:
+            self.__shared.invocationCounter = value
+        else:
+            self.__invocationCounter = value
+
+    #
+    # Invocation Counter.  If the cipher is created with copySession, the
+    # counter is shared with the original cipher.
+    #
+    invocationCounter = property(__getInvocationCounter, __setInvocationCounter)
+
+    def copySession(self):
+        """
+        Returns a copy of the cipher for a new association.  The copy shares
+        the invocation counter with this cipher, so the same nonce is never
+        used twice with the global key.  Dedicated key belongs to the copy.
+        Messages ciphered with the dedicated key also increase the shared
+        counter, because the ciphering doesn't tell which key the counter
+        is used with.
+        """
+        ret = copy.copy(self)
+        ret.__shared = self.__shared or self
+        ret.dedicatedKey = None
+        return ret
+
     @classmethod
     def decrypt(cls, c, p, data):
         tmp = []
@@ -107,7 +158,8 @@ class GXCiphering(GXICipher):
         Reset encrypt settings.
         """
         self.security = Security.NONE
-        self.invocationCounter = 0
+        #  Shared invocation counter is not reset.
+        self.__invocationCounter = 0
 
     def isCiphered(self):
         """
@@ -0,0 +1,88 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+
+#
+# Compact array contents as columns.
+#
+# Fixed size numeric columns are array.array or numpy arrays when numpy is
+# installed.  Other columns, and boolean columns without numpy, are lists.
+class GXCompactArray:
+
+    #
+    # Constructor.
+    #
+    # @param dataTypes
+    # Data type of the columns.  This is a list if compact array
+    # contains structures and a DataType if it contains single values.
+    # @param columns
+    # Column values.
+    #
+    def __init__(self, dataTypes=None, columns=None):
+        self.dataTypes = dataTypes
+        if columns is None:
+            columns = list()
+        self.columns = columns
+
+    #
+    # Get row.
+    #
+    # @param index
+    # Row index.
+    #
+    def getRow(self, index):
+        return [it[index] for it in self.columns]
+
+    #
+    # Get values in the same format as compact array is parsed without
+    # columns.  This is a list of rows if compact array contains
+    # structures.
+    #
+    def toList(self):
+        cols = [it.tolist() if hasattr(it, "tolist") else it for it in self.columns]
+        if not isinstance(self.dataTypes, list):
+            if cols:
+                return cols[0]
+            return list()
+        return [list(it) for it in zip(*cols)]
+
+    def __len__(self):
+        if self.columns:
+            return len(self.columns[0])
+        return 0
+
+    def __iter__(self):
+        return iter(self.toList())
+
+    def __str__(self):
+        return str(self.toList())
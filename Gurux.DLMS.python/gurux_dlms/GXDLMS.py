@@ -34,6 +34,7 @@
 from .GXByteBuffer import GXByteBuffer
 from .internal._GXCommon import _GXCommon
 from .internal._GXDataInfo import _GXDataInfo
+from .internal._GXDataReader import _GXDataReader
 from ._GXFCS16 import _GXFCS16
 from ._HDLCInfo import _HDLCInfo
 from .enums import Conformance, InterfaceType, RequestTypes, HdlcFrameType, Command, ErrorCode, Priority, ServiceClass, ObjectType
@@ -286,8 +287,9 @@ class GXDLMS:
             #  Add command type and invoke and priority.
             p.multipleBlocks = 2 + len(reply) + len_ > p.settings.maxPduSize
         if p.multipleBlocks:
-            #  Add command type and invoke and priority.
-            p.lastBlock = not 8 + len(reply) + len_ > p.settings.maxPduSize
+            #  Add command type and invoke and priority.  Rows that are not
+            #  encoded yet are sent in the next blocks.
+            p.lastBlock = p.settings.count == p.settings.index and not 8 + len(reply) + len_ > p.settings.maxPduSize
         if p.lastBlock:
             #  Add command type and invoke and priority.
             p.lastBlock = not 8 + len(reply) + len_ > p.settings.maxPduSize
@@ -332,15 +334,20 @@ class GXDLMS:
                 if p.command != Command.GET_REQUEST and p.data and reply:
                     cls.multipleBlocks(p, reply, ciphering)
                 if p.command == Command.SET_REQUEST:
-                    if p.multipleBlocks and (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) == 0:
+                    if p.multipleBlocks and (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) == Conformance.NONE:
                         if p.requestType == 1:
                             p.setRequestType(2)
                         elif p.requestType == 2:
                             p.setRequestType(3)
                 if p.command == Command.GET_RESPONSE:
-                    if p.multipleBlocks and (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) == 0:
-                        if p.requestType == 1:
+                    if p.multipleBlocks and (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) == Conformance.NONE:
+                        #  Normal and with list responses are sent with data blocks.
+                        if p.requestType in (1, 3):
+                            if p.requestType == 3:
+                                p.status = 0
                             p.requestType = 2
+                if p.command == Command.GET_REQUEST and p.requestType != GetCommandType.NEXT_DATA_BLOCK:
+                    p.settings.getRequestType = p.requestType
                 if p.command != Command.GENERAL_BLOCK_TRANSFER:
                     reply.setUInt8(p.requestType)
                     if p.invokeId != 0:
@@ -348,7 +355,7 @@ class GXDLMS:
                     else:
                         reply.setUInt8(cls.getInvokeIDPriority(p.settings))
             reply.set(p.attributeDescriptor)
-            if p.multipleBlocks and not p.settings.negotiatedConformance.contains(Conformance.GENERAL_BLOCK_TRANSFER):
+            if p.multipleBlocks and (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) == Conformance.NONE:
                 if p.lastBlock:
                     reply.setUInt8(1)
                     p.settings.setCount(0)
@@ -362,7 +369,7 @@ class GXDLMS:
                         reply.setUInt8(1)
                     reply.setUInt8(p.status)
                 if p.data:
-                    len_ = reply.data.size - reply.data.position
+                    len_ = p.data.size - p.data.position
                 else:
                     len_ = 0
                 totalLength = len_ + len(reply)
@@ -374,7 +381,7 @@ class GXDLMS:
                         len_ -= cls.__CIPHERING_HEADER_SIZE
                     len_ -= _GXCommon.getObjectCountSizeInBytes(len_)
                 _GXCommon.setObjectCount(len_, reply)
-                reply.set(p.data, len_)
+                reply.set(p.data, p.data.position, len_)
             if len_ == 0:
                 if p.status != 0xFF and p.command != Command.GENERAL_BLOCK_TRANSFER:
                     if p.status != 0 and p.command == Command.GET_RESPONSE:
@@ -392,7 +399,7 @@ class GXDLMS:
                         reply.setUInt8(len(p.settings.gateway.physicalDeviceAddress))
                         reply.set(p.settings.gateway.physicalDeviceAddress)
                         reply.set(tmp)
-                    if p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER != Conformance.NONE:
+                    if (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) != Conformance.NONE:
                         if 7 + len_ + len(reply) > p.settings.maxPduSize:
                             len_ = p.settings.maxPduSize - len(reply) - 7
                         if ciphering and p.command != Command.GENERAL_BLOCK_TRANSFER:
@@ -409,7 +416,7 @@ class GXDLMS:
                     elif p.command != Command.GET_REQUEST and len_ + len(reply) > p.settings.maxPduSize:
                         len_ = p.settings.maxPduSize - len(reply)
                     reply.set(p.data, p.data.position, len_)
-                elif (p.settings.gateway and p.settings.gateway.physicalDeviceAddress) and not (p.command == Command.GENERAL_BLOCK_TRANSFER or (p.multipleBlocks and (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER != Conformance.NONE))):
+                elif (p.settings.gateway and p.settings.gateway.physicalDeviceAddress) and not (p.command == Command.GENERAL_BLOCK_TRANSFER or (p.multipleBlocks and (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) != Conformance.NONE)):
                     if 3 + len_ + len(p.settings.gateway.physicalDeviceAddress) > p.settings.maxPduSize:
                         len_ -= (3 + len(p.settings.gateway.physicalDeviceAddress))
                     tmp = GXByteBuffer(reply)
@@ -419,13 +426,13 @@ class GXDLMS:
                     reply.setUInt8(len(p.settings.gateway.physicalDeviceAddress))
                     reply.set(p.settings.gateway.physicalDeviceAddress)
                     reply.set(tmp)
-            if ciphering and p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER == Conformance.NONE and p.command != Command.RELEASE_REQUEST:
+            if ciphering and (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) == Conformance.NONE and p.command != Command.RELEASE_REQUEST:
                 tmp = []
                 if p.settings.cipher.securitySuite == SecuritySuite.AES_GCM_128:
                     tmp = cls.cipher0(p, reply.array())
                 reply.size = 0
                 reply.set(tmp)
-        if p.command == Command.GENERAL_BLOCK_TRANSFER or (p.multipleBlocks and p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER != Conformance.NONE):
+        if p.command == Command.GENERAL_BLOCK_TRANSFER or (p.multipleBlocks and (p.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) != Conformance.NONE):
             bb = GXByteBuffer()
             bb.set(reply)
             reply.clear()
@@ -469,7 +476,7 @@ class GXDLMS:
         key = None
         cipher = p.settings.cipher
         if (p.settings.negotiatedConformance & Conformance.GENERAL_PROTECTION) == Conformance.NONE:
-            if (p.settings.connected & ConnectionState.DLMS) != 0 and cipher.dedicatedKey:
+            if (p.settings.connected & ConnectionState.DLMS) != ConnectionState.NONE and cipher.dedicatedKey:
                 cmd = cls.getDedMessage(p.command)
                 key = cipher.dedicatedKey
             else:
@@ -493,7 +500,7 @@ class GXDLMS:
         if p.command == Command.DATA_NOTIFICATION or p.command == Command.GENERAL_GLO_CIPHERING or p.command == Command.GENERAL_DED_CIPHERING:
             reply = GXByteBuffer()
             reply.setUInt8(tmp[0])
-            if p.settings.getStandard() == Standard.ITALY:
+            if p.settings.standard == Standard.ITALY:
                 reply.setUInt8(0)
             else:
                 _GXCommon.setObjectCount(len(p.settings.cipher.systemTitle), reply)
@@ -695,6 +702,40 @@ class GXDLMS:
             raise ValueError("Invalid address type.")
         return bb.array()
 
+    @classmethod
+    def getFrameSize(cls, settings, data):
+        """
+        Returns count of the bytes that are still needed before the next
+        frame is complete.  Frame starts from the current position of the
+        data.  Zero is returned if the size can't be resolved, and any
+        amount of data can be read.
+
+        settings: DLMS settings.
+        data: Received data.
+        """
+        # pylint: disable=protected-access
+        available = data.available()
+        if settings.interfaceType == InterfaceType.WRAPPER:
+            #  Header is version (1), source, target and the data length.
+            if available < 8:
+                return 8 - available
+            if data.getUInt16(data.position) != 1:
+                return 0
+            return 8 + data.getUInt16(data.position + 6) - available
+        if settings.interfaceType == InterfaceType.HDLC:
+            #  Frame is start flag, frame format, frame and end flag.
+            pos = data._data.find(_GXCommon.HDLC_FRAME_START_END, data.position, data.size)
+            if pos == -1:
+                return 0
+            available = data.size - pos
+            if available < 3:
+                return 3 - available
+            frame = data.getUInt16(pos + 1)
+            if (frame & 0xF000) != 0xA000:
+                return 0
+            return (frame & 0x7FF) + 2 - available
+        return 0
+
     @classmethod
     def getWrapperFrame(cls, settings, data):
         bb = GXByteBuffer()
@@ -755,11 +796,13 @@ class GXDLMS:
             bb.setUInt8(settings.getNextSend(True))
         else:
             bb.setUInt8(frame_)
-        crc = _GXFCS16.countFCS16(bb._data, 1, bb.size - 1)
-        bb.setUInt16(crc)
+        fcs16 = _GXFCS16.update(bb, 1, len(bb) - 1)
+        bb.setUInt16(_GXFCS16.finish(fcs16))
         if len1 != 0:
+            #  Frame CRC continues from the header CRC.
+            pos = len(bb) - 2
             bb.set(data, data.position, len1)
-            crc = _GXFCS16.countFCS16(bb._data, 1, len(bb) - 1)
+            crc = _GXFCS16.finish(_GXFCS16.update(bb, pos, len(bb) - pos, fcs16))
             bb.setUInt16(crc)
         bb.setUInt8(_GXCommon.HDLC_FRAME_START_END)
         if settings.isServer:
@@ -781,79 +824,85 @@ class GXDLMS:
     def getHdlcData(cls, server, settings, reply, data, notify):
         # pylint:disable=too-many-arguments,too-many-locals,too-many-return-statements, protected-access,broad-except
         ch = 0
-        pos = reply.position
-        packetStartID = reply.position
         frameLen = 0
         crc = 0
         crcRead = 0
-        if reply.size - reply.position < 9:
-            data.complete = False
-            return 0
-        data.complete = True
-        if notify:
-            notify.complete = True
-        isNotify = False
-        while pos < len(reply):
-            ch = reply.getUInt8()
-            if ch == _GXCommon.HDLC_FRAME_START_END:
-                packetStartID = pos
-                break
-            pos += 1
-        if reply.position == len(reply):
-            data.complete = False
-            return 0
-        frame_ = reply.getUInt8()
-        if (frame_ & 0xF0) != 0xA0:
-            reply.position = reply.position - 1
-            return GXDLMS.getHdlcData(server, settings, reply, data, notify)
-        if (frame_ & 0x7) != 0:
-            frameLen = ((frame_ & 0x7) << 8)
-        ch = reply.getUInt8()
-        frameLen += ch
-        if len(reply) - reply.position + 1 < frameLen:
-            data.complete = False
-            reply.position = packetStartID
-            return 0
-        eopPos = frameLen + packetStartID + 1
-        ch = reply.getUInt8(eopPos)
-        if ch != _GXCommon.HDLC_FRAME_START_END:
-            reply.position = reply.position - 2
-            return GXDLMS.getHdlcData(server, settings, reply, data, notify)
-        addresses = [0, 0]
-        try:
-            ret = GXDLMS.checkHdlcAddress(server, settings, reply, eopPos, addresses)
-        except Exception:
-            ret = False
-        if not ret:
-            if not (reply.position < len(reply) and reply.getUInt8(reply.position) == 0x13):
-                reply.position = 1 + eopPos
-                return GXDLMS.getHdlcData(server, settings, reply, data, notify)
+        #  Frames are searched in a loop.  If the found frame is not valid
+        #  search continues from the next possible start flag.
+        while True:
+            if reply.size - reply.position < 9:
+                data.complete = False
+                return 0
+            data.complete = True
             if notify:
-                isNotify = True
-                notify.clientAddress = addresses[1]
-                notify.serverAddress = addresses[0]
-        if (frame_ & 0x8) != 0:
-            if isNotify:
-                notify.moreData = (RequestTypes(notify.moreData | RequestTypes.FRAME))
-            else:
-                data.moreData = (RequestTypes(data.moreData | RequestTypes.FRAME))
-        else:
-            if isNotify:
-                notify.moreData = (RequestTypes(notify.moreData & ~RequestTypes.FRAME))
+                notify.complete = True
+            isNotify = False
+            packetStartID = reply._data.find(_GXCommon.HDLC_FRAME_START_END, reply.position, reply.size)
+            if packetStartID == -1:
+                reply.position = reply.size
+                data.complete = False
+                return 0
+            reply.position = packetStartID + 1
+            if reply.position == len(reply):
+                data.complete = False
+                return 0
+            frame_ = reply.getUInt8()
+            if (frame_ & 0xF0) != 0xA0:
+                reply.position = reply.position - 1
+                continue
+            frameLen = 0
+            if (frame_ & 0x7) != 0:
+                frameLen = ((frame_ & 0x7) << 8)
+            ch = reply.getUInt8()
+            frameLen += ch
+            if len(reply) - reply.position + 1 < frameLen:
+                data.complete = False
+                reply.position = packetStartID
+                return 0
+            eopPos = frameLen + packetStartID + 1
+            ch = reply.getUInt8(eopPos)
+            if ch != _GXCommon.HDLC_FRAME_START_END:
+                reply.position = reply.position - 2
+                continue
+            addresses = [0, 0]
+            try:
+                ret = GXDLMS.checkHdlcAddress(server, settings, reply, eopPos, addresses)
+            except Exception:
+                ret = False
+            if not ret:
+                if not (reply.position < len(reply) and reply.getUInt8(reply.position) == 0x13):
+                    reply.position = 1 + eopPos
+                    continue
+                if notify:
+                    isNotify = True
+                    notify.clientAddress = addresses[1]
+                    notify.serverAddress = addresses[0]
+            if (frame_ & 0x8) != 0:
+                if isNotify:
+                    notify.moreData = (RequestTypes(notify.moreData | RequestTypes.FRAME))
+                else:
+                    data.moreData = (RequestTypes(data.moreData | RequestTypes.FRAME))
             else:
-                data.moreData = (RequestTypes(data.moreData & ~RequestTypes.FRAME))
-        frame_ = reply.getUInt8()
-        if data.xml is None and not settings.checkFrame(frame_):
-            reply.position = eopPos + 1
-            return GXDLMS.getHdlcData(server, settings, reply, data, notify)
-        crc = _GXFCS16.countFCS16(reply, packetStartID + 1, reply.position - packetStartID - 1)
-        crcRead = reply.getUInt16()
-        if crc != crcRead:
-            if len(reply) - reply.position > 8:
-                return GXDLMS.getHdlcData(server, settings, reply, data, notify)
-            raise Exception("Wrong CRC.")
+                if isNotify:
+                    notify.moreData = (RequestTypes(notify.moreData & ~RequestTypes.FRAME))
+                else:
+                    data.moreData = (RequestTypes(data.moreData & ~RequestTypes.FRAME))
+            frame_ = reply.getUInt8()
+            if data.xml is None and not settings.checkFrame(frame_):
+                reply.position = eopPos + 1
+                continue
+            fcs16 = _GXFCS16.update(reply, packetStartID + 1, reply.position - packetStartID - 1)
+            crc = _GXFCS16.finish(fcs16)
+            crcRead = reply.getUInt16()
+            if crc != crcRead:
+                if len(reply) - reply.position > 8:
+                    continue
+                raise Exception("Wrong CRC.")
+            break
         if reply.position != packetStartID + frameLen + 1:
-            crc = _GXFCS16.countFCS16(reply, packetStartID + 1, frameLen - 2)
+            #  Frame CRC continues from the header CRC.
+            pos = reply.position - 2
+            crc = _GXFCS16.finish(_GXFCS16.update(reply, pos, packetStartID + frameLen - 1 - pos, fcs16))
             crcRead = reply.getUInt16(packetStartID + frameLen - 1)
             if crc != crcRead:
                 raise Exception("Wrong CRC.")
@@ -913,18 +962,18 @@ class GXDLMS:
         if server:
             if settings.serverAddress != 0 and settings.serverAddress != target:
                 if reply.getUInt8(reply.position) == Command.SNRM:
-                    settings.setServerAddress(target)
+                    settings.serverAddress = target
                 else:
                     raise Exception("Server addresses do not match. It is " + str(target) + ". It should be " + str(settings.serverAddress) + ".")
             else:
-                settings.setServerAddress(target)
+                settings.serverAddress = target
             if settings.clientAddress != 0 and settings.clientAddress != source:
                 if reply.getUInt8(reply.position) == Command.SNRM:
-                    settings.setClientAddress(source)
+                    settings.clientAddress = source
                 else:
                     raise Exception("Client addresses do not match. It is " + str(source) + ". It should be " + str(settings.clientAddress) + ".")
             else:
-                settings.setClientAddress(source)
+                settings.clientAddress = source
         else:
             if settings.clientAddress != target:
                 if settings.clientAddress == source and settings.serverAddress == target:
@@ -958,9 +1007,8 @@ class GXDLMS:
                     target = notify
                     isData = False
                 value = buff.getUInt16()
+                #  Buffer can hold also the next frames when requests are pipelined.
                 compleate = not (len(buff) - buff.position) < value
-                if compleate and (len(buff) - buff.position) != value:
-                    print("Data length is " + str(value) + "and there are " + str(len(buff) - buff.position) + " bytes.")
                 target.complete = (compleate)
                 if not compleate:
                     buff.position = pos
@@ -1017,8 +1065,8 @@ class GXDLMS:
             buff.getUInt8()
             configurationWord = buff.getUInt16()
             encryption = MBusEncryptionMode(configurationWord & 7)
-            settings.setClientAddress(buff.getUInt8())
-            settings.setServerAddress(buff.getUInt8())
+            settings.clientAddress = buff.getUInt8()
+            settings.serverAddress = buff.getUInt8()
             if data.xml and data.xml.comments:
                 data.xml.appendComment("Command: " + cmd)
                 data.xml.appendComment("Manufacturer: " + man)
@@ -1042,7 +1090,7 @@ class GXDLMS:
             value = buff.getUInt16()
             if settings.clientAddress != 0 and settings.clientAddress != value:
                 raise Exception("Source addresses do not match. It is " + str(value) + ". It should be " + str(settings.clientAddress) + ".")
-            settings.setClientAddress(value)
+            settings.clientAddress = value
             value = buff.getUInt16()
             if settings.serverAddress != 0 and settings.serverAddress != value:
                 raise Exception("Destination addresses do not match. It is " + str(value) + ". It should be " + str(settings.serverAddress) + ".")
@@ -1203,6 +1251,7 @@ class GXDLMS:
     def handleMethodResponse(cls, data):
         type_ = int(data.data.getUInt8())
         invoke = data.data.getUInt8()
+        data.invokeId = invoke
         if data.xml:
             data.xml.appendStartTag(Command.METHOD_RESPONSE)
             data.xml.appendStartTag(Command.METHOD_RESPONSE, type_)
@@ -1372,6 +1421,7 @@ class GXDLMS:
     def handleSetResponse(cls, data):
         type_ = SetResponseType(data.data.getUInt8())
         invokeId = data.data.getUInt8()
+        data.invokeId = invokeId
         if data.xml:
             data.xml.appendStartTag(Command.SET_RESPONSE)
             data.xml.appendStartTag(Command.SET_RESPONSE, type_)
@@ -1433,6 +1483,35 @@ class GXDLMS:
         if data.xml:
             data.xml.appendEndTag(Command.WRITE_RESPONSE)
 
+    @classmethod
+    def __getResponseWithList(cls, settings, reply):
+        data = reply.data
+        cnt = _GXCommon.getObjectCount(data)
+        values = list([None]*cnt)
+        if reply.xml:
+            reply.xml.appendStartTag(TranslatorTags.RESULT, "Qty", reply.xml.integerToHex(cnt, 2))
+        pos = 0
+        while pos != cnt:
+            ch = data.getUInt8()
+            if ch != 0:
+                reply.error = data.getUInt8()
+            else:
+                if reply.xml:
+                    di = _GXDataInfo()
+                    di.xml = (reply.xml)
+                    reply.xml.appendStartTag(Command.READ_RESPONSE, SingleReadResponse.DATA)
+                    _GXCommon.getData(reply.data, di)
+                    reply.xml.appendEndTag(Command.READ_RESPONSE, SingleReadResponse.DATA)
+                else:
+                    reply.readPosition = data.position
+                    cls.getValueFromData(settings, reply)
+                    data.position = reply.readPosition
+                    if values:
+                        values[pos] = reply.value
+                    reply.value = None
+            pos += 1
+        reply.value = values
+
     @classmethod
     def handleGetResponse(cls, settings, reply, index):
         # pylint: disable=too-many-locals
@@ -1440,6 +1519,7 @@ class GXDLMS:
         data = reply.data
         type_ = GetCommandType(data.getUInt8())
         ch = data.getUInt8()
+        reply.invokeId = ch
         if reply.xml:
             reply.xml.appendStartTag(Command.GET_RESPONSE)
             reply.xml.appendStartTag(Command.GET_RESPONSE, type_)
@@ -1499,39 +1579,18 @@ class GXDLMS:
                         raise ValueError("Invalid block length.")
                     reply.command = (Command.NONE)
                 if blockLength == 0:
-                    data.size(index)
+                    data.size = index
                 else:
                     cls.getDataFromBlock(data, index)
                 if reply.moreData == RequestTypes.NONE:
                     if not reply.peek:
                         data.position = 0
                         settings.resetBlockIndex()
+                        if settings.getRequestType == GetCommandType.WITH_LIST:
+                            cls.__getResponseWithList(settings, reply)
+                            ret = False
         elif type_ == GetCommandType.WITH_LIST:
-            cnt = _GXCommon.getObjectCount(data)
-            values = list([None]*cnt)
-            if reply.xml:
-                reply.xml.appendStartTag(TranslatorTags.RESULT, "Qty", reply.xml.integerToHex(cnt, 2))
-            pos = 0
-            while pos != cnt:
-                ch = data.getUInt8()
-                if ch != 0:
-                    reply.error = data.getUInt8()
-                else:
-                    if reply.xml:
-                        di = _GXDataInfo()
-                        di.xml = (reply.xml)
-                        reply.xml.appendStartTag(Command.READ_RESPONSE, SingleReadResponse.DATA)
-                        _GXCommon.getData(reply.data, di)
-                        reply.xml.appendEndTag(Command.READ_RESPONSE, SingleReadResponse.DATA)
-                    else:
-                        reply.readPosition = data.position
-                        cls.getValueFromData(settings, reply)
-                        data.position = reply.readPosition
-                        if values:
-                            values[pos] = reply.value
-                        reply.value = None
-                pos += 1
-            reply.value = values
+            cls.__getResponseWithList(settings, reply)
             ret = False
         else:
             raise ValueError("Invalid Get response.")
@@ -1724,11 +1783,13 @@ class GXDLMS:
             raise ValueError("Secure connection is not supported.")
         if (data.moreData.value & RequestTypes.FRAME.value) == 0:
             data.data.position = data.data.position - 1
-            p = None
-            if settings.cipher.dedicatedKey and (settings.connected & ConnectionState.DLMS) != 0:
-                p = AesGcmParameter(settings.sourceSystemTitle, settings.cipher.dedicatedKey, settings.cipher.authenticationKey)
+            p = AesGcmParameter(0)
+            p.systemTitle = settings.sourceSystemTitle
+            if settings.cipher.dedicatedKey and (settings.connected & ConnectionState.DLMS) != ConnectionState.NONE:
+                p.blockCipherKey = settings.cipher.dedicatedKey
             else:
-                p = AesGcmParameter(settings.sourceSystemTitle, settings.cipher.blockCipherKey, settings.cipher.authenticationKey)
+                p.blockCipherKey = settings.cipher.blockCipherKey
+            p.authenticationKey = settings.cipher.authenticationKey
             tmp = GXCiphering.decrypt(settings.cipher, p, data.data)
             data.data.clear()
             data.data.set(tmp)
@@ -1801,37 +1862,27 @@ class GXDLMS:
     @classmethod
     def getValueFromData(cls, settings, reply):
         data = reply.data
-        info = _GXDataInfo()
-        if isinstance(reply.value, list):
-            info.type_ = DataType.ARRAY
-            info.count = reply.totalCount
-            info.index = reply.getCount()
+        #  Continue parsing if part of the value is already parsed.
+        reader = reply.dataReader
+        if reader is None or reader.value is None or reader.value is not reply.value:
+            reader = _GXDataReader()
+            reply.dataReader = reader
+            reader.columnar = reply.columnar
         index = data.position
         data.position = reply.readPosition
         try:
-            value = _GXCommon.getData(data, info)
-            if value is not None:
-                if not isinstance(value, list):
-                    reply.valueType = info.type_
-                    reply.value = value
-                    reply.totalCount = 0
-                    reply.readPosition = data.position
-                else:
-                    if value:
-                        if reply.value is None:
-                            reply.value = value
-                        else:
-                            list_ = list()
-                            list_ += reply.value
-                            list_ += value
-                            reply.value = list_
-                    reply.readPosition = data.position
-                    reply.totalCount = info.count
-            elif info.complete and reply.command == Command.DATA_NOTIFICATION:
-                reply.readPosition = data.position
+            reader.read(data)
+            reply.readPosition = data.position
+            if reader.complete and reader.value == []:
+                #  Empty array or structure is returned as None.
+                reply.value = None
+            elif reader.value is not None:
+                reply.valueType = reader.type_
+                reply.value = reader.value
+                reply.totalCount = reader.count
         finally:
             data.position = index
-        if reply.command != Command.DATA_NOTIFICATION and info.complete and reply.moreData == RequestTypes.NONE:
+        if reply.command != Command.DATA_NOTIFICATION and reader.complete and reply.moreData == RequestTypes.NONE:
             if settings:
                 settings.resetBlockIndex()
             data.position = 0
@@ -1875,23 +1926,21 @@ class GXDLMS:
         offset = len(data)
         cnt = info.packetLength - reply.position
         if cnt != 0:
-            data.capacity = offset + cnt
-            data.set(reply, reply.position, cnt)
+            data.set(reply.view(reply.position, cnt))
+            reply.position = reply.position + cnt
             if hdlc:
                 reply.position = reply.position + 3
         data.position = offset
 
     @classmethod
     def getDataFromBlock(cls, data, index):
-        # pylint: disable=protected-access
         if len(data) == data.position:
             data.clear()
             return 0
         len_ = data.position - index
-        data._data[data.position - len_:data.position] = data._data[data.position : len(data)]
-        data.position = data.position - len_
-        data.size = len(data) - len_
-        return len
+        data.move(data.position, index, len(data) - data.position)
+        data.position = index
+        return len_
 
     @classmethod
     def getActionInfo(cls, objectType, value, count):
@@ -1953,10 +2002,10 @@ class GXDLMS:
     @classmethod
     def parseSnrmUaResponse(cls, data, limits):
         if data.available() == 0:
-            limits.setMaxInfoTX(GXDLMSLimits.DEFAULT_MAX_INFO_TX)
-            limits.setMaxInfoRX(GXDLMSLimits.DEFAULT_MAX_INFO_RX)
-            limits.setWindowSizeTX(GXDLMSLimits.DEFAULT_WINDOWS_SIZE_TX)
-            limits.setWindowSizeRX(GXDLMSLimits.DEFAULT_WINDOWS_SIZE_RX)
+            limits.maxInfoTX = GXDLMSLimits.DEFAULT_MAX_INFO_TX
+            limits.maxInfoRX = GXDLMSLimits.DEFAULT_MAX_INFO_RX
+            limits.windowSizeTX = GXDLMSLimits.DEFAULT_WINDOWS_SIZE_TX
+            limits.windowSizeRX = GXDLMSLimits.DEFAULT_WINDOWS_SIZE_RX
         else:
             data.getUInt8()
             data.getUInt8()
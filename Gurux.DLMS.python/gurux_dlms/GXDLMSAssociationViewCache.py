@@ -0,0 +1,214 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import os
+import time
+import datetime
+import hashlib
+from enum import Enum
+from .GXByteBuffer import GXByteBuffer
+from .internal._GXCommon import _GXCommon
+from .internal._GXDataInfo import _GXDataInfo
+from .enums import DataType, ObjectType
+from .enums.AccessMode import AccessMode
+from .enums.MethodAccessMode import MethodAccessMode
+from .objects.GXDLMSObjectCollection import GXDLMSObjectCollection
+from .objects.GXDLMSData import GXDLMSData
+from ._GXObjectFactory import _GXObjectFactory
+from .GXDLMSScalerUnitCache import GXDLMSScalerUnitCache
+
+class GXDLMSAssociationViewCache:
+    """
+    Association view cache.
+
+    Meters of the same model and firmware have the same association view.
+    The cache stores the object list with the access rights and the
+    scaler and unit of the registers, so the association view is not
+    read again from every meter.  Entries are saved in A-XDR format to the
+    cache directory, if it is given.
+    """
+    # Version of the file format.
+    VERSION = 1
+
+    #
+    # Constructor.
+    #
+    # path: Cache directory.  If None, the entries are kept only in memory.
+    # maxAge: Entry is read again from the meter when it's older than
+    #     maxAge seconds.  Zero if the entries don't expire.
+    #
+    def __init__(self, path=None, maxAge=0):
+        self.path = path
+        self.maxAge = maxAge
+        # Attributes that identify the meter model and the firmware as
+        # (COSEM object, attribute index) tuples.  Default is the active
+        # firmware identifier.  If the logical device name is added, the
+        # entry is meter specific.  Short names are resolved from the
+        # association view.
+        self.fingerprintObjects = [(GXDLMSData("1.0.0.2.0.255"), 2)]
+        # Encoded entries by file name.
+        self.__items = dict()
+
+    @classmethod
+    def __getName(cls, fingerprint):
+        return hashlib.sha1(str(fingerprint).encode("utf-8")).hexdigest()
+
+    def __getFileName(self, name):
+        return os.path.join(self.path, name + ".axdr")
+
+    def get(self, client, fingerprint):
+        """
+        Returns cached association view or None if the meter must be read.
+        Objects are also set to the client.
+
+        client: DLMS client.
+        fingerprint: Value that identifies the meter model and firmware.
+        """
+        name = self.__getName(fingerprint)
+        data = self.__items.get(name)
+        if data is None and self.path:
+            try:
+                with open(self.__getFileName(name), "rb") as f:
+                    data = f.read()
+            except OSError:
+                return None
+            self.__items[name] = data
+        if data is None:
+            return None
+        buff = GXByteBuffer(data)
+        info = _GXDataInfo()
+        values = _GXCommon.getData(buff, info)
+        if values[0] != self.VERSION or str(values[1]) != str(fingerprint):
+            return None
+        if self.maxAge and values[2] + self.maxAge < time.time():
+            return None
+        objects = GXDLMSObjectCollection(client)
+        for it in values[3]:
+            obj = _GXObjectFactory.createObject(ObjectType(it[0]))
+            obj.version = it[1]
+            obj.shortName = it[2]
+            obj.logicalName = _GXCommon.toLogicalName(it[3])
+            for index, mode in it[4]:
+                obj.setAccess(index, AccessMode(mode))
+            for index, mode in it[5]:
+                obj.setMethodAccess(index, MethodAccessMode(mode))
+            if it[6] is not None:
+                obj.scaler = it[6][0]
+                obj.unit = it[6][1]
+                obj.setLastReadTime(GXDLMSScalerUnitCache.getScalerUnitIndex(obj), datetime.datetime.now())
+            objects.append(obj)
+        client.settings.objects = objects
+        return objects
+
+    def set(self, fingerprint, objects):
+        """
+        Add association view to the cache.  Call this again after scalers
+        and units are read, so they are cached as well.
+
+        fingerprint: Value that identifies the meter model and firmware.
+        objects: Association view.
+        """
+        data = GXByteBuffer()
+        data.setUInt8(DataType.STRUCTURE.value)
+        data.setUInt8(4)
+        _GXCommon.setData(data, DataType.UINT8, self.VERSION)
+        _GXCommon.setData(data, DataType.STRING, str(fingerprint))
+        _GXCommon.setData(data, DataType.UINT32, int(time.time()))
+        data.setUInt8(DataType.ARRAY.value)
+        _GXCommon.setObjectCount(len(objects), data)
+        for it in objects:
+            data.setUInt8(DataType.STRUCTURE.value)
+            data.setUInt8(7)
+            _GXCommon.setData(data, DataType.UINT16, it.objectType.value)
+            _GXCommon.setData(data, DataType.UINT8, it.version)
+            _GXCommon.setData(data, DataType.UINT16, it.shortName)
+            _GXCommon.setData(data, DataType.OCTET_STRING, _GXCommon.logicalNameToBytes(it.logicalName))
+            self.__setAccessRights(data, it.attributes, "access")
+            self.__setAccessRights(data, it.methodAttributes, "methodAccess")
+            self.__setScalerUnit(data, it)
+        name = self.__getName(fingerprint)
+        self.__items[name] = data.array()
+        if self.path:
+            fileName = self.__getFileName(name)
+            with open(fileName + ".tmp", "wb") as f:
+                f.write(self.__items[name])
+            os.replace(fileName + ".tmp", fileName)
+
+    def getFingerprintObjects(self, client):
+        """
+        Returns fingerprint objects as (COSEM object, attribute index)
+        tuples.  With short name referencing the short names are not known
+        before the association view is read, so the objects are taken from
+        the association view of the client.  Objects that are not in the
+        association view are skipped.
+
+        client: DLMS client.
+        """
+        if client.useLogicalNameReferencing:
+            return list(self.fingerprintObjects)
+        list_ = list()
+        for it, index in self.fingerprintObjects:
+            obj = client.objects.findByLN(it.objectType, it.logicalName)
+            if obj is not None:
+                list_.append((obj, index))
+        return list_
+
+    def clear(self):
+        """
+        Remove all entries from the memory.  Files are not removed.
+        """
+        self.__items.clear()
+
+    @classmethod
+    def __setAccessRights(cls, data, attributes, name):
+        list_ = [it for it in attributes if getattr(it, name, None) is not None]
+        data.setUInt8(DataType.ARRAY.value)
+        _GXCommon.setObjectCount(len(list_), data)
+        for it in list_:
+            data.setUInt8(DataType.STRUCTURE.value)
+            data.setUInt8(2)
+            _GXCommon.setData(data, DataType.INT8, it.index)
+            _GXCommon.setData(data, DataType.ENUM, getattr(it, name).value)
+
+    @classmethod
+    def __setScalerUnit(cls, data, item):
+        if GXDLMSScalerUnitCache.isScalerUnitRead(item):
+            unit = item.unit
+            if isinstance(unit, Enum):
+                unit = unit.value
+            data.setUInt8(DataType.STRUCTURE.value)
+            data.setUInt8(2)
+            _GXCommon.setData(data, DataType.INT8, item.scaler)
+            _GXCommon.setData(data, DataType.ENUM, unit)
+        else:
+            data.setUInt8(DataType.NONE.value)
@@ -36,11 +36,37 @@ from .GXByteBuffer import GXByteBuffer
 from .CountType import CountType
 from .objects.enums.SecuritySuite import SecuritySuite
 from .GXDLMSChipperingStream import GXDLMSChipperingStream
+from .GXAesGcm import GXAesGcm, GXAesGcmCryptography
 from .internal._GXCommon import _GXCommon
 from .enums.Command import Command
 
 #pylint: disable=too-many-instance-attributes,too-many-public-methods
 class GXDLMSChippering:
+    #  Used AES-GCM implementation.
+    __backend = None
+
+    #
+    #      * Get used AES-GCM implementation.  cryptography package is used
+    #      * if it is installed.
+    #      * @return AES-GCM implementation.
+    #
+    @classmethod
+    def getBackend(cls):
+        if cls.__backend is None:
+            try:
+                cls.__backend = GXAesGcmCryptography()
+            except ValueError:
+                cls.__backend = GXAesGcm()
+        return cls.__backend
+
+    #
+    #      * Set used AES-GCM implementation.
+    #      * @param value AES-GCM implementation.  If value is None
+    #      * implementation is selected automatically.
+    #
+    @classmethod
+    def setBackend(cls, value):
+        cls.__backend = value
 
     #
     #      * Get nonse from frame counter and system title.
@@ -51,7 +77,7 @@ class GXDLMSChippering:
     @classmethod
     def getNonse(cls, invocationCounter, systemTitle):
         nonce = bytearray(12)
-        nonce[0:7] = systemTitle
+        nonce[0:8] = systemTitle
         nonce[8] = ((invocationCounter >> 24) & 0xFF)
         nonce[9] = ((invocationCounter >> 16) & 0xFF)
         nonce[10] = ((invocationCounter >> 8) & 0xFF)
@@ -74,18 +100,18 @@ class GXDLMSChippering:
         tmp[3] = (invocationCounter & 0xFF)
         aad = cls.getAuthenticatedData(p, plainText)
         iv = cls.getNonse(invocationCounter, p.systemTitle)
-        gcm = GXDLMSChipperingStream(p.security, True, p.blockCipherKey, aad, iv, None)
         #  Encrypt the secret message
         if p.security != Security.AUTHENTICATION:
-            gcm.write(plainText)
-        ciphertext = gcm.flushFinalBlock()
+            ciphertext, tag = cls.getBackend().encrypt(p.blockCipherKey, iv, aad, plainText)
+        else:
+            ciphertext, tag = cls.getBackend().encrypt(p.blockCipherKey, iv, aad, bytearray())
         if p.security == Security.AUTHENTICATION:
             if p.type_ == CountType.PACKET:
                 data.set(tmp)
             if (p.type_ & CountType.DATA) != 0:
                 data.set(plainText)
             if (p.type_ & CountType.TAG) != 0:
-                p.countTag = gcm.tag
+                p.countTag = tag
                 data.set(p.countTag)
         elif p.security == Security.ENCRYPTION:
             if p.type_ == CountType.PACKET:
@@ -97,7 +123,7 @@ class GXDLMSChippering:
             if (p.type_ & CountType.DATA) != 0:
                 data.set(ciphertext)
             if (p.type_ & CountType.TAG) != 0:
-                p.countTag = gcm.tag
+                p.countTag = tag
                 data.set(p.countTag)
         else:
             raise ValueError("security")
@@ -259,8 +285,7 @@ class GXDLMSChippering:
             data.get(tag)
         aad = cls.getAuthenticatedData(p, ciphertext)
         iv = cls.getNonse(invocationCounter, p.systemTitle)
-        gcm = GXDLMSChipperingStream(security, True, p.blockCipherKey, aad, iv, tag)
-        gcm.write(ciphertext)
+        ret = cls.getBackend().decrypt(p.blockCipherKey, iv, aad, ciphertext)
         if transactionId != 0:
             p.setInvocationCounter(transactionId)
-        return gcm.flushFinalBlock()
+        return ret
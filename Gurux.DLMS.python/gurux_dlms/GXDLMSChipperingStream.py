@@ -31,6 +31,8 @@
 #  This code is licensed under the GNU General Public License v2.
 #  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
 # ---------------------------------------------------------------------------
+import threading
+from collections import OrderedDict
 from .GXByteBuffer import GXByteBuffer
 from .enums.Security import Security
 
@@ -217,6 +219,17 @@ class GXDLMSChipperingStream:
 
     blockSize = 16
 
+    #  Maximum count of block cipher keys in the key cache.
+    KEY_CACHE_SIZE = 16
+
+    #  Expanded keys and GHASH tables of the last used block cipher keys.
+    #  Key is (block cipher key, is encrypt) and value is
+    #  [rounds, working key, H, GHASH tables].  Only AES-GCM keys are
+    #  cached.  Key Encrypting Keys are never kept in memory.
+    __keyCache = OrderedDict()
+    #  Guards the key cache.
+    __keyCacheLock = threading.Lock()
+
     #
     #      * Constructor.
     #      *
@@ -237,18 +250,31 @@ class GXDLMSChipperingStream:
         elif len(self.tag) != 12:
             raise ValueError("Invalid tag.")
         self.encrypt = forEncrypt
-        self.workingKey = self.generateKey(forEncrypt, blockCipherKey)
+        if iv:
+            key = self.__getKey(forEncrypt, blockCipherKey)
+            self.rounds = key[0]
+            self.workingKey = key[1]
+        else:
+            #  Key Encrypting Key is not cached.
+            self.workingKey = self.generateKey(forEncrypt, blockCipherKey)
         if self.encrypt:
             bufLength = GXDLMSChipperingStream.BLOCK_SIZE
         else:
             bufLength = (GXDLMSChipperingStream.BLOCK_SIZE + GXDLMSChipperingStream.TAG_SIZE)
         self.bufBlock = bytearray(bufLength)
         self.aad = forAad
-        self.h = bytearray(GXDLMSChipperingStream.BLOCK_SIZE)
         if iv:
-            self.processBlock(self.h, 0, self.h, 0)
-            self.mArray = [[None] * 32] * 32
-            self.init(self.h)
+            if key[2] is None:
+                h = bytearray(GXDLMSChipperingStream.BLOCK_SIZE)
+                self.processBlock(h, 0, h, 0)
+                self.mArray = [[None] * 32] * 32
+                self.init(h)
+                #  Tables are set before H so other threads don't see H
+                #  without them.
+                key[3] = self.mArray
+                key[2] = h
+            self.h = key[2]
+            self.mArray = key[3]
             self.j0 = bytearray(16)
             self.j0[0:len(iv)] = iv[0:]
             self.j0[15] = 0x01
@@ -258,10 +284,46 @@ class GXDLMSChipperingStream:
             self.counter = self.clone(self.j0)
         self.bytesRemaining = 0
         self.totalLength = 0
-        self.output = GXByteBuffer()
+        self.output = bytearray()
         self.c0 = self.c1 = self.c2 = self.c3 = 0
         self.blockSize = 16
 
+    def __getKey(self, forEncrypt, blockCipherKey):
+        """
+        Get expanded key from the key cache.  Key is generated if it is not
+        in the cache.
+        """
+        cache = GXDLMSChipperingStream.__keyCache
+        id_ = (bytes(blockCipherKey), forEncrypt)
+        with GXDLMSChipperingStream.__keyCacheLock:
+            key = cache.get(id_)
+            if key is not None:
+                cache.move_to_end(id_)
+                return key
+        workingKey = self.generateKey(forEncrypt, blockCipherKey)
+        key = [self.rounds, workingKey, None, None]
+        with GXDLMSChipperingStream.__keyCacheLock:
+            #  Another thread may have added the same key meanwhile.
+            key = cache.setdefault(id_, key)
+            cache.move_to_end(id_)
+            if len(cache) > GXDLMSChipperingStream.KEY_CACHE_SIZE:
+                cache.popitem(False)
+        return key
+
+    @classmethod
+    def clearKeyCache(cls, blockCipherKey=None):
+        """
+        Remove block cipher key from the key cache.
+        blockCipherKey: Removed key.  All keys are removed if key is None.
+        """
+        with cls.__keyCacheLock:
+            if blockCipherKey is None:
+                cls.__keyCache.clear()
+            else:
+                blockCipherKey = bytes(blockCipherKey)
+                cls.__keyCache.pop((blockCipherKey, True), None)
+                cls.__keyCache.pop((blockCipherKey, False), None)
+
     @classmethod
     def clone(cls, value):
         """
@@ -628,26 +690,29 @@ class GXDLMSChipperingStream:
                     pos >>= 1
 
 
-    def gCTRBlock(self, buf, bufCount):
+    def gCTRBlock(self, buf, bufCount, outOffset):
+        """
+        Cipher one block with the counter and add it to the GHASH.
+        buf: Block to cipher. Only bufCount bytes are used.
+        outOffset: Position where ciphered block is written in the output.
+        """
         i = 15
         while i >= 12:
-            self.counter[i] += 1
+            self.counter[i] = (self.counter[i] + 1) & 0xFF
             if self.counter[i] != 0:
                 break
             i -= 1
         tmp = bytearray(self.BLOCK_SIZE)
         self.processBlock(self.counter, 0, tmp, 0)
+        value = int.from_bytes(tmp[0:bufCount], "big") ^ int.from_bytes(buf[0:bufCount], "big")
+        value = value.to_bytes(bufCount, "big")
+        self.output[outOffset:outOffset + bufCount] = value
         if self.encrypt:
-            zeroes = bytearray(self.BLOCK_SIZE)
-            tmp[bufCount:self.BLOCK_SIZE] = zeroes[bufCount:self.BLOCK_SIZE]
-            hashBytes = tmp
+            hashBytes = value
         else:
-            hashBytes = buf
-        pos = 0
-        while pos != bufCount:
-            tmp[pos] ^= buf[pos]
-            self.output.setUInt8(tmp[pos])
-            pos += 1
+            hashBytes = buf[0:bufCount]
+        if bufCount != self.BLOCK_SIZE:
+            hashBytes = hashBytes + bytes(self.BLOCK_SIZE - bufCount)
         self.xor(self.s, hashBytes)
         self.multiplyH(self.s)
         self.totalLength += bufCount
@@ -673,24 +738,41 @@ class GXDLMSChipperingStream:
         return True
 
     def write(self, input_):
-        for it in input_:
-            self.bufBlock[self.bytesRemaining] = it
-            self.bytesRemaining += 1
-            if self.bytesRemaining == self.BLOCK_SIZE:
-                self.gCTRBlock(self.bufBlock, self.BLOCK_SIZE)
-                if not self.encrypt:
-                    #System.arraycopy(self.bufBlock, self.BLOCK_SIZE,
-                    #self.bufBlock, 0,)
-                    self.bufBlock[0:len(self.tag)] = self.bufBlock[self.blockSize:self.blockSize + len(self.tag)]
-                self.bytesRemaining = 0
+        """
+        Cipher data.  Full blocks are ciphered directly from the input and
+        only the remaining bytes are buffered until the next write.
+        """
+        size = self.BLOCK_SIZE
+        count = len(input_)
+        pos = 0
+        #  Output is allocated once for all full blocks.
+        outOffset = len(self.output)
+        self.output.extend(bytes(((self.bytesRemaining + count) // size) * size))
+        if self.bytesRemaining != 0:
+            pos = min(size - self.bytesRemaining, count)
+            self.bufBlock[self.bytesRemaining:self.bytesRemaining + pos] = input_[0:pos]
+            self.bytesRemaining += pos
+            if self.bytesRemaining != size:
+                return
+            self.gCTRBlock(self.bufBlock, size, outOffset)
+            outOffset += size
+            self.bytesRemaining = 0
+        while count - pos >= size:
+            self.gCTRBlock(input_[pos:pos + size], size, outOffset)
+            outOffset += size
+            pos += size
+        if pos != count:
+            self.bytesRemaining = count - pos
+            self.bufBlock[0:self.bytesRemaining] = input_[pos:count]
 
     def flushFinalBlock(self):
         if self.bytesRemaining > 0:
-            tmp = self.bufBlock[0:self.bytesRemaining]
-            self.gCTRBlock(tmp, self.bytesRemaining)
+            outOffset = len(self.output)
+            self.output.extend(bytes(self.bytesRemaining))
+            self.gCTRBlock(self.bufBlock, self.bytesRemaining, outOffset)
         if self.security == Security.ENCRYPTION:
             self.reset()
-            return self.output.array()
+            return self.output[:]
         x = bytearray(16)
         self.setPackLength(8 * len(self.aad), x, 0)
         self.setPackLength(self.totalLength * 8, x, 8)
@@ -707,7 +789,7 @@ class GXDLMSChipperingStream:
             #Tag size is 12 bytes.
             self.tag = generatedTag[0:12]
         self.reset()
-        return self.output.array()
+        return self.output[:]
 
     def generateKey(self, isEncrypt, key):
         #Key length in words.
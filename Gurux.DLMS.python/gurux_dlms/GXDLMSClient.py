@@ -31,12 +31,13 @@
 #  This code is licensed under the GNU General Public License v2.
 #  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
 # ---------------------------------------------------------------------------
+import datetime
 from .GXDLMSSettings import GXDLMSSettings
 from .enums import Authentication, InterfaceType, SourceDiagnostic, DataType, AccessMode, MethodAccessMode
 from .ConnectionState import ConnectionState
 from .GXByteBuffer import GXByteBuffer
 from .GXDLMSLimits import GXDLMSLimits
-from .enums import Command, ObjectType, DateTimeSkips
+from .enums import Command, ObjectType, DateTimeSkips, Conformance, Unit
 from .GXDLMS import GXDLMS
 from ._GXAPDU import _GXAPDU
 from ._HDLCInfo import _HDLCInfo
@@ -60,6 +61,9 @@ from .enums.ErrorCode import ErrorCode
 from .GXDLMSTranslatorStructure import GXDLMSTranslatorStructure
 from .enums.RequestTypes import RequestTypes
 from .SerialnumberCounter import SerialNumberCounter
+from .GXDLMSScalerUnitCache import GXDLMSScalerUnitCache
+from .GXDLMSReadListPlanner import GXDLMSReadListPlanner
+from .internal._GXDataReader import _GXDataReader
 
 # pylint:disable=too-many-instance-attributes,too-many-arguments,too-many-public-methods
 class GXDLMSClient:
@@ -97,6 +101,19 @@ class GXDLMSClient:
         self.isAuthenticationRequired = False
         # Auto increase Invoke ID.
         self.autoIncreaseInvokeID = False
+        # Scaler and unit cache that is shared with the meters of the same model.
+        self.scalerUnitCache = None
+        # Meter model.  Scaler and unit cache is using it as a key.  Cache
+        # is not used if the model is not set.
+        self.model = None
+        # Logical names of the registers whose scaler and unit are set from
+        # the scaler and unit cache.
+        self.__cachedScalerUnits = set()
+        # Is scaler and unit from the cache read from the meter in this
+        # association.
+        self.__scalerUnitsVerified = False
+        # Splits readList to the requests.
+        self.readListPlanner = GXDLMSReadListPlanner()
 
     def __getObjects(self):
         return self.settings.objects
@@ -338,7 +355,7 @@ class GXDLMSClient:
         return self.settings.invokeId
 
     def __setInvokeID(self, value):
-        self.settings.invokeID = value
+        self.settings.setInvokeID(value)
 
     #
     # Invoke ID.
@@ -468,6 +485,8 @@ class GXDLMSClient:
         self.settings.resetBlockIndex()
         GXDLMS.checkInit(self.settings)
         self.settings.setStoCChallenge(None)
+        #  Cached scaler and unit is verified again in the new association.
+        self.__scalerUnitsVerified = False
         if self.autoIncreaseInvokeID:
             self.settings.setInvokeID(0)
         else:
@@ -573,7 +592,7 @@ class GXDLMSClient:
         self.settings.connected |= ConnectionState.DLMS
 
     def releaseRequest(self):
-        if (self.settings.connected & ConnectionState.DLMS) == 0:
+        if (self.settings.connected & ConnectionState.DLMS) == ConnectionState.NONE:
             return None
         buff = GXByteBuffer()
         buff.setUInt8(0)
@@ -720,6 +739,7 @@ class GXDLMSClient:
         e = ValueEventArgs(self.settings, target, attributeIndex, 0, parameters)
         e.value = value
         target.setValue(self.settings, e)
+        self.__updateScalerUnit(target, attributeIndex, value)
         return target.getValues()[attributeIndex - 1]
 
     @classmethod
@@ -729,13 +749,123 @@ class GXDLMSClient:
 
 
     def updateValues(self, list_, values):
+        self.readListPlanner.update(list_, values)
         pos = 0
         for k, v in list_:
             e = ValueEventArgs(self.settings, k, v, 0, None)
             e.value = values[pos]
             k.setValue(self.settings, e)
+            self.__updateScalerUnit(k, v, values[pos])
             pos += 1
 
+    def getRows(self, pg, reply, columns=None, lastRow=None):
+        """
+        Returns profile generic rows that are received so far.  Call this
+        after each received data block or general block transfer window.
+        Returned rows are removed from the reply and the handled bytes are
+        removed from the reply data, so the used memory doesn't grow when
+        a big profile is read.  Rows are converted like in updateValue,
+        but they are not added to the buffer of the profile generic.
+
+        pg: Profile generic.
+        reply: Received reply.
+        columns: Read columns.  If None, all capture objects are read.
+        lastRow: Last row of the previous call.  It's used to solve the
+            time of the rows that don't have it.
+        """
+        if (reply.moreData.value & RequestTypes.FRAME.value) != 0:
+            return list()
+        reader = reply.dataReader
+        if reader is None or reader.value is not reply.value:
+            reader = _GXDataReader()
+            reply.dataReader = reader
+            reply.readPosition = 0
+        if not reader.complete:
+            data = reply.data
+            offset = self.__getValueOffset(data, reader)
+            if offset is None:
+                return list()
+            data.position = offset + reply.readPosition
+            reader.read(data)
+            #  Remove handled bytes.  Header of the general block transfer
+            #  is kept, because it's parsed when the last block is received.
+            if data.position == data.size:
+                data.size = offset
+            else:
+                data.move(data.position, offset, data.size - data.position)
+            data.position = offset
+            reply.readPosition = 0
+            reply.value = reader.value
+            reply.valueType = reader.type_
+            reply.totalCount = reader.count
+        return pg.convertRows(reader.popRows(), columns, lastRow)
+
+    @classmethod
+    def __getValueOffset(cls, data, reader):
+        """
+        Returns position where the value starts in the reply data or None
+        if the value can't be parsed yet.
+        """
+        if data.size == 0:
+            return 0
+        tag = data.getUInt8(0)
+        if tag == Command.GET_RESPONSE:
+            #  General block transfer.
+            if data.size > 4 and data.getUInt8(1) == GetCommandType.NORMAL and data.getUInt8(3) == 0:
+                return 4
+            return None
+        if reader.value is None and tag != DataType.ARRAY.value:
+            return None
+        return 0
+
+    def updateScalerUnits(self, objects):
+        """
+        Set scaler and unit of the registers from the scaler and unit cache.
+        Returns the registers whose scaler and unit must be read from the meter.
+        All registers are returned if the meter model is not set.
+
+        objects: COSEM objects.
+        """
+        list_ = list()
+        for it in objects:
+            if GXDLMSScalerUnitCache.getScalerUnitIndex(it) != 0:
+                value = None
+                if self.scalerUnitCache is not None and self.model is not None:
+                    value = self.scalerUnitCache.get(self.model, it.logicalName)
+                    if value is not None and not self.__scalerUnitsVerified:
+                        #  First cached scaler and unit of the association is
+                        #  read from the meter to check that the model is right.
+                        self.__scalerUnitsVerified = True
+                        value = None
+                if value is None:
+                    list_.append(it)
+                else:
+                    it.scaler = value[0]
+                    it.unit = value[1]
+                    it.setLastReadTime(GXDLMSScalerUnitCache.getScalerUnitIndex(it), datetime.datetime.now())
+                    self.__cachedScalerUnits.add(it.logicalName)
+        return list_
+
+    def __updateScalerUnit(self, target, attributeIndex, value):
+        index = GXDLMSScalerUnitCache.getScalerUnitIndex(target)
+        if index == attributeIndex:
+            #  Unit can be zero, so read time tells that scaler and unit are known.
+            target.setLastReadTime(index, datetime.datetime.now())
+        if self.scalerUnitCache is None or self.model is None:
+            return
+        if index == attributeIndex:
+            self.__cachedScalerUnits.discard(target.logicalName)
+            self.scalerUnitCache.set(self.model, target.logicalName, target.scaler, target.unit)
+        elif index > attributeIndex > 1 and value is not None and not isinstance(value, (int, float)):
+            #  Value is not a number.  Cached scaler and unit are not
+            #  valid for this meter and they are read again.
+            self.scalerUnitCache.remove(self.model, target.logicalName)
+            if target.logicalName in self.__cachedScalerUnits:
+                self.__cachedScalerUnits.discard(target.logicalName)
+                target.scaler = 1
+                target.unit = Unit.NONE
+                target.readTimes.pop(index, None)
+
     @classmethod
     def changeType(cls, value, type_):
         return _GXCommon.changeType(value, type_)
@@ -921,46 +1051,40 @@ class GXDLMSClient:
     def readList(self, list_):
         if not list_:
             raise ValueError("Invalid parameter.")
+        if self.negotiatedConformance != Conformance.NONE and (self.negotiatedConformance & Conformance.MULTIPLE_REFERENCES) == Conformance.NONE:
+            raise ValueError("Meter doesn't support multiple references.")
         messages = list()
         data = GXByteBuffer()
         self.settings.resetBlockIndex()
         if self.useLogicalNameReferencing:
             p = GXDLMSLNParameters(self.settings, 0, Command.GET_REQUEST, GetCommandType.WITH_LIST, data, None, 0xff)
-            pos = 0
-            count = (self.settings.maxPduSize - 12) / 10
-            if len(list_) < count:
-                count = len(list_)
-            if count > 10:
-                count = 10
-            _GXCommon.setObjectCount(count, data)
-            for k, v in list_:
-                data.setUInt16(k.objectType.value)
-                data.set(_GXCommon.logicalNameToBytes(k.logicalName))
-                data.setUInt8(v)
-                data.setUInt8(0)
-                pos += 1
-                if pos % count == 0 and len(list_) != pos:
-                    messages.append(GXDLMS.getLnMessages(p))
-                    data.clear()
-                    if len(list_) - pos < count:
-                        _GXCommon.setObjectCount(len(list_) - pos, data)
-                    else:
-                        _GXCommon.setObjectCount(count, data)
-            messages.append(GXDLMS.getLnMessages(p))
+            #  Class ID, logical name, attribute index and access selection.
+            for batch in self.readListPlanner.getBatches(self.settings, list_, 10):
+                data.clear()
+                _GXCommon.setObjectCount(len(batch), data)
+                for k, v in batch:
+                    data.setUInt16(k.objectType.value)
+                    data.set(_GXCommon.logicalNameToBytes(k.logicalName))
+                    data.setUInt8(v)
+                    data.setUInt8(0)
+                messages.append(GXDLMS.getLnMessages(p))
         else:
-            p = GXDLMSSNParameters(self.settings, Command.READ_REQUEST, len(list_), 0xFF, data, None)
-            for k, v in list_:
-                data.setUInt8(VariableAccessSpecification.VARIABLE_NAME)
-                sn = k.shortName
-                sn += (v - 1) * 8
-                data.setUInt16(sn)
-            messages.append(GXDLMS.getSnMessages(p))
+            #  Variable name tag and short name.
+            for batch in self.readListPlanner.getBatches(self.settings, list_, 3):
+                data.clear()
+                p = GXDLMSSNParameters(self.settings, Command.READ_REQUEST, len(batch), 0xFF, data, None)
+                for k, v in batch:
+                    data.setUInt8(VariableAccessSpecification.VARIABLE_NAME)
+                    sn = k.shortName
+                    sn += (v - 1) * 8
+                    data.setUInt16(sn)
+                messages.append(GXDLMS.getSnMessages(p))
         return messages
 
     def keepAlive(self):
         if self.interfaceType == InterfaceType.WRAPPER:
             return None
-        return GXDLMS.getHdlcFrame(self.settings, self.settings.getReceiverReady(), None)
+        return GXDLMS.getHdlcFrame(self.settings, self.settings.getKeepAlive(), None)
 
 
     def readRowsByEntry(self, pg, index, count, columns=None):
@@ -1219,8 +1343,12 @@ class GXDLMSClient:
         return objects
 
     def getFrameSize(self, data):
-        if self.interfaceType == InterfaceType.WRAPPER:
-            if data.available() < 8 or data.getUInt16(data.position) != 1:
-                return 8 - data.available()
-            return data.getUInt16(data.position + 6)
-        return 1
+        """
+        Returns count of the bytes that are still needed before the next
+        frame is complete.  Frame starts from the current position of the
+        data.  Zero is returned if the size can't be resolved, and any
+        amount of data can be read.
+
+        data: Received data.
+        """
+        return GXDLMS.getFrameSize(self.settings, data)
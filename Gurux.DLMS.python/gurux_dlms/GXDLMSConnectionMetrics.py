@@ -0,0 +1,87 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+
+# pylint: disable=too-many-instance-attributes
+class GXDLMSConnectionMetrics:
+    """
+    Metrics of one connection of AsyncGXDLMSListener.
+
+    Metrics are given as connection info to the server, so they are also
+    available in onConnected and onDisconnected.
+    """
+
+    #
+    # Constructor.
+    #
+    # address: Remote address as (host, port) tuple.
+    # transport: Transport protocol, "TCP" or "UDP".
+    # now: Time when connection was opened.
+    #
+    def __init__(self, address, transport, now):
+        self.address = address
+        self.transport = transport
+        # Server session of the connection.
+        self.session = None
+        # When connection was opened.  Event loop time in seconds.
+        self.connected = now
+        # When data was received or sent last time.  Event loop time in
+        # seconds.
+        self.lastActivity = now
+        # When connection was closed.  None if connection is open.
+        self.closed = None
+        # Count of received frames.
+        self.requests = 0
+        # Count of sent frames.
+        self.replies = 0
+        # Count of received bytes.
+        self.bytesReceived = 0
+        # Count of sent bytes.
+        self.bytesSent = 0
+        # Why connection was closed.  None if connection is open.
+        self.closeReason = None
+
+    def getDuration(self, now):
+        """
+        Returns how long connection has been open in seconds.
+
+        now: Current event loop time.
+        """
+        if self.closed is not None:
+            return self.closed - self.connected
+        return now - self.connected
+
+    def __str__(self):
+        return "%s %s:%s requests: %d replies: %d received: %d sent: %d" % \
+            (self.transport, self.address[0], self.address[1], self.requests, \
+             self.replies, self.bytesReceived, self.bytesSent)
@@ -216,10 +216,10 @@ class GXDLMSLNCommandHandler:
                     rowsize = 0
                     pg = e.target
                     #  Count how many rows we can fit to one PDU.
-                    for it in pg.getCaptureObjects():
-                        dt = it.getKey().getDataType(it.value.getAttributeIndex())
+                    for k, v in pg.captureObjects:
+                        dt = k.getDataType(v.attributeIndex)
                         if dt == DataType.OCTET_STRING:
-                            dt = it.getKey().getUIDataType(it.value.getAttributeIndex())
+                            dt = k.getUIDataType(v.attributeIndex)
                             if dt == DataType.DATETIME:
                                 rowsize += _GXCommon.getDataTypeSize(DataType.DATETIME)
                             elif dt == DataType.DATE:
@@ -232,14 +232,14 @@ class GXDLMSLNCommandHandler:
                             rowsize += _GXCommon.getDataTypeSize(dt)
                     if rowsize != 0:
                         e.rowToPdu = int(settings.maxPduSize / rowsize)
-                server.notifyRead()
+                server.onPreRead([e])
                 value = None
                 if e.handled:
                     value = e.value
                 else:
                     settings.setCount(e.rowEndIndex - e.rowBeginIndex)
                     value = obj.getValue(settings, e)
-                server.onPostRead()
+                server.onPostRead([e])
                 if e.byteArray:
                     bb.set(int(value))
                 else:
@@ -247,7 +247,7 @@ class GXDLMSLNCommandHandler:
                 status = e.error
         GXDLMS.getLNPdu(GXDLMSLNParameters(settings, e.invokeId, Command.GET_RESPONSE, 1, None, bb, status.value), replyData)
         if settings.count != settings.index or len(bb) != bb.position:
-            server.setTransaction(GXDLMSLongTransaction(e, Command.GET_REQUEST, bb))
+            server.transaction = GXDLMSLongTransaction([e], Command.GET_REQUEST, bb)
 
     #
     # Handle get request next data block command.
@@ -270,17 +270,20 @@ class GXDLMSLNCommandHandler:
         settings.increaseBlockIndex()
         p = GXDLMSLNParameters(settings, invokeID, Command.GENERAL_BLOCK_TRANSFER if streaming else Command.GET_RESPONSE, 2, None, bb, ErrorCode.OK.value)
         p.streaming = streaming
-        p.windowSize = settings.getWindowSize()
+        p.windowSize = settings.windowSize
         #  If transaction is not in progress.
-        if server.getTransaction() is None:
-            p.status = int(ErrorCode.NO_LONG_GET_OR_READ_IN_PROGRESS)
+        if server.transaction is None:
+            p.status = ErrorCode.NO_LONG_GET_OR_READ_IN_PROGRESS.value
         else:
-            bb.set(server.getTransaction().data)
+            #  Data that is not sent yet is used as is.
+            bb = server.transaction.data
+            p.data = bb
             moreData = settings.index != settings.getCount()
             if moreData:
                 #  If there is multiple blocks on the buffer.
                 #  This might happen when Max PDU size is very small.
-                if len(bb) < settings.getMaxPduSize():
+                if len(bb) - bb.position < settings.maxPduSize:
+                    bb.trim()
                     value = None
                     for arg in server.transaction.targets:
                         arg.invokeId = (p.invokeId)
@@ -299,9 +302,9 @@ class GXDLMSLNCommandHandler:
             p.multipleBlocks = True
             GXDLMS.getLNPdu(p, replyData)
             if moreData or len(bb) - bb.position != 0:
-                server.getTransaction().setData(bb)
+                server.transaction.data = bb
             else:
-                server.setTransaction(None)
+                server.transaction = None
                 settings.resetBlockIndex()
 
     #
@@ -381,11 +384,11 @@ class GXDLMSLNCommandHandler:
                 p.invokeId = it.invokeId
             except Exception:
                 bb.setUInt8(ErrorCode.HARDWARE_FAULT)
-            if settings.index != settings.count:
-                server.setTransaction(GXDLMSLongTransaction(list_, Command.GET_REQUEST, None))
             pos += 1
         server.onPostRead(list_)
         GXDLMS.getLNPdu(p, replyData)
+        if settings.index != settings.count or len(bb) != bb.position:
+            server.transaction = GXDLMSLongTransaction(list_, Command.GET_REQUEST, bb)
 
     @classmethod
     def handleSetRequestNormal(cls, settings, server, data, type_, p, xml):
@@ -460,7 +463,7 @@ class GXDLMSLNCommandHandler:
                     e.value = value
                     list_ = list(e)
                     if p.isMultipleBlocks():
-                        server.setTransaction(GXDLMSLongTransaction(list_, Command.GET_REQUEST, data))
+                        server.transaction = GXDLMSLongTransaction(list_, Command.GET_REQUEST, data)
                     server.onPreWrite(list_)
                     if e.error != ErrorCode.OK:
                         p.status = e.error
@@ -492,10 +495,10 @@ class GXDLMSLNCommandHandler:
                 xml.appendLine(TranslatorTags.RAW_DATA, "Value", data.remainingHexString(False))
                 xml.appendEndTag(TranslatorTags.DATA_BLOCK)
                 return
-            server.getTransaction().data.set(data)
+            server.transaction.data.set(data)
             if not p.isMultipleBlocks():
                 try:
-                    value = _GXCommon.getData(server.getTransaction().data, reply)
+                    value = _GXCommon.getData(server.transaction.data, reply)
                     if isinstance(value, bytearray):
                         dt = server.transaction.targets[0].target.getDataType(server.transaction.targets[0].index)
                         if dt not in (DataType.NONE, DataType.OCTET_STRING):
@@ -508,7 +511,7 @@ class GXDLMSLNCommandHandler:
                 except Exception:
                     p.setStatus(ErrorCode.HARDWARE_FAULT.value)
                 finally:
-                    server.setTransaction(None)
+                    server.transaction = None
                 settings.resetBlockIndex()
         p.multipleBlocks = True
 
@@ -651,12 +654,12 @@ class GXDLMSLNCommandHandler:
         p = GXDLMSLNParameters(settings, invokeId, Command.METHOD_RESPONSE, 1, None, bb, error.value)
         GXDLMS.getLNPdu(p, replyData)
         if isinstance(obj, (GXDLMSAssociationLogicalName,)) and id_ == 1:
-            if (obj).getAssociationStatus() == AssociationStatus.ASSOCIATED:
-                server.notifyConnected(connectionInfo)
-                settings.setConnected(settings.connected | ConnectionState.DLMS)
+            if obj.associationStatus == AssociationStatus.ASSOCIATED:
+                server.onConnected(connectionInfo)
+                settings.connected = settings.connected | ConnectionState.DLMS
             else:
                 server.onInvalidConnection(connectionInfo)
-                settings.setConnected(settings.connected & ~ConnectionState.DLMS)
+                settings.connected = settings.connected & ~ConnectionState.DLMS
 
     @classmethod
     def handleAccessRequest(cls, settings, server, data, reply, xml):
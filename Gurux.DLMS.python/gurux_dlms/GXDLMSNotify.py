@@ -164,7 +164,7 @@ class GXDLMSNotify:
         return self.settings.invokeId
 
     def __setInvokeID(self, value):
-        self.settings.invokeID = value
+        self.settings.setInvokeID(value)
 
     #
     # Invoke ID.
@@ -228,7 +228,7 @@ class GXDLMSNotify:
         else:
             p = GXDLMSSNParameters(self.settings, Command.DATA_NOTIFICATION, 1, 0, data, None)
             reply = GXDLMS.getSnMessages(p)
-        if self.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER == 0 and len(reply) != 1:
+        if (self.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) == Conformance.NONE and len(reply) != 1:
             raise ValueError("Data is not fit to one PDU. Use general block transfer.")
         return reply
 
@@ -0,0 +1,180 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+from .GXDLMSScalerUnitCache import GXDLMSScalerUnitCache
+
+# pylint: disable=too-many-instance-attributes
+class GXDLMSPollJob:
+    """
+    Read job of one meter.  AsyncGXDLMSScheduler runs the job.
+
+    Job remembers which steps are already read.  If the connection breaks
+    the job is run again from the step that failed.
+    """
+
+    #
+    # Constructor.
+    #
+    # client: DLMS client of the meter.
+    # host: Host name or IP address of the meter.
+    # port: TCP port.
+    # gateway: Name of the gateway or data concentrator the meter is behind.
+    #
+    def __init__(self, client, host, port, gateway=None):
+        # DLMS client.  Client keeps meter settings like the invocation
+        # counter between the runs.
+        self.client = client
+        self.host = host
+        self.port = port
+        # Meters without gateway are limited only by the total concurrency.
+        self.gateway = gateway
+        # Is association view read first.
+        self.readAssociationView = False
+        # Association view cache.
+        self.cache = None
+        # Are scaler and unit read before the register values.
+        self.readScalers = True
+        # Read attributes as (COSEM object, attribute index) tuples.
+        self.attributes = list()
+        # Read profile generic ranges as (profile generic, start, end) tuples.
+        self.profiles = list()
+        # Profile checkpoint store.  If it's set, only the rows that are
+        # not collected yet are read and start and end of the profiles
+        # are ignored.
+        self.checkpoints = None
+        # Meter identifier in the checkpoint store.
+        self.meterId = "%s:%s" % (host, port)
+        # Count of started runs.
+        self.attempts = 0
+        # Error of the last run.
+        self.error = None
+        # Is job completed.
+        self.completed = False
+        self.__steps = None
+        self.__position = 0
+        # Fingerprint of the meter in the association view cache.
+        self.__fingerprint = None
+        # Reader whose association is made.
+        self.__reader = None
+
+    def __getSteps(self):
+        steps = list()
+        if self.readAssociationView:
+            steps.append((None,))
+        if self.readScalers:
+            #  Scalers and units that are in the scaler and unit cache are not read.
+            for it in self.client.updateScalerUnits([k for k, v in self.attributes]):
+                scaler = (it, GXDLMSScalerUnitCache.getScalerUnitIndex(it))
+                if scaler not in steps and scaler not in self.attributes:
+                    steps.append(scaler)
+        steps.extend(self.attributes)
+        for pg, start, end in self.profiles:
+            if not pg.captureObjects:
+                steps.append((pg, 3))
+            steps.append((pg, start, end))
+        return steps
+
+    def getProgress(self):
+        """
+        Returns count of read steps and count of all steps.
+        """
+        if self.__steps is None:
+            self.__steps = self.__getSteps()
+        return self.__position, len(self.__steps)
+
+    async def run(self, reader):
+        """
+        Make association and read steps that are not read yet.  If the
+        job is run again with the same reader, the association is not
+        made again.
+
+        reader: Asynchronous reader that is connected to the meter.
+        """
+        if self.__steps is None:
+            self.__steps = self.__getSteps()
+        if reader is not self.__reader:
+            await reader.initializeConnection()
+            self.__reader = reader
+        while self.__position != len(self.__steps):
+            step = self.__steps[self.__position]
+            if len(step) == 1:
+                await reader.getAssociationView(self.cache)
+                self.__fingerprint = reader.fingerprint
+                self.__getScalerUnits(reader.client.objects)
+            elif len(step) == 2:
+                await reader.read(step[0], step[1])
+            elif self.checkpoints is not None:
+                await reader.readNewRows(step[0], self.checkpoints, self.meterId)
+            else:
+                await reader.readRowsByRange(step[0], step[1], step[2])
+            self.__position += 1
+        if self.cache and self.__fingerprint is not None:
+            self.__setScalerUnits(reader.client.objects)
+        self.completed = True
+        self.__reader = None
+
+    def __getScalerUnits(self, objects):
+        """
+        Set scalers and units that are known in the association view to
+        the registers of the job and remove their read steps.
+        """
+        pos = self.__position + 1
+        steps = list()
+        for it in self.__steps[pos:]:
+            if len(it) == 2 and it not in self.attributes and GXDLMSScalerUnitCache.getScalerUnitIndex(it[0]) == it[1]:
+                obj = objects.findByLN(it[0].objectType, it[0].logicalName)
+                if obj is not None and GXDLMSScalerUnitCache.isScalerUnitRead(obj):
+                    it[0].scaler = obj.scaler
+                    it[0].unit = obj.unit
+                    it[0].setLastReadTime(it[1], obj.getLastReadTime(it[1]))
+                    continue
+            steps.append(it)
+        self.__steps[pos:] = steps
+
+    def __setScalerUnits(self, objects):
+        """
+        Set scalers and units that the job has read to the association view
+        and save it again, so they are cached.
+        """
+        changed = False
+        for it, _ in self.attributes:
+            if GXDLMSScalerUnitCache.isScalerUnitRead(it):
+                obj = objects.findByLN(it.objectType, it.logicalName)
+                if obj is not None and not GXDLMSScalerUnitCache.isScalerUnitRead(obj):
+                    index = GXDLMSScalerUnitCache.getScalerUnitIndex(it)
+                    obj.scaler = it.scaler
+                    obj.unit = it.unit
+                    obj.setLastReadTime(index, it.getLastReadTime(index))
+                    changed = True
+        if changed:
+            self.cache.set(self.__fingerprint, objects)
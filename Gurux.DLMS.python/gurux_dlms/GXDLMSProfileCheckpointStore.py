@@ -0,0 +1,210 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import os
+import hashlib
+import datetime
+from .GXByteBuffer import GXByteBuffer
+from .internal._GXCommon import _GXCommon
+from .internal._GXDataInfo import _GXDataInfo
+from .enums import DataType
+from .objects.GXDLMSClock import GXDLMSClock
+from .objects.enums.SortMethod import SortMethod
+
+class GXDLMSProfileCheckpointStore:
+    """
+    Remembers which profile generic rows are already collected.
+
+    Checkpoint is the entry index and the capture time of the last
+    collected row for each meter and profile generic.  Only the new rows
+    are read on the next collection.  Checkpoints are saved in A-XDR
+    format to the directory, if it is given.  Override get, set and
+    remove to keep the checkpoints in a database, like
+    GXDLMSSqliteCheckpointStore does.
+    """
+    # Version of the file format.  Capture time is saved as ISO 8601
+    # string, because DLMS date-time doesn't tell if the time zone is UTC
+    # or unknown.
+    VERSION = 2
+
+    #
+    # Constructor.
+    #
+    # path: Checkpoint directory.  If None, checkpoints are kept only in
+    #     memory.
+    #
+    def __init__(self, path=None):
+        self.path = path
+        # Checkpoints by meter.  Value is dictionary where key is the
+        # logical name of the profile generic.
+        self.__items = dict()
+
+    def __getFileName(self, meter):
+        name = hashlib.sha1(str(meter).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, name + ".axdr")
+
+    def __getItems(self, meter):
+        items = self.__items.get(meter)
+        if items is None:
+            items = dict()
+            if self.path:
+                try:
+                    with open(self.__getFileName(meter), "rb") as f:
+                        values = _GXCommon.getData(GXByteBuffer(f.read()), _GXDataInfo())
+                    if values[0] == self.VERSION and values[1] == str(meter):
+                        for ln, index, time in values[2]:
+                            if time is not None:
+                                time = datetime.datetime.fromisoformat(time)
+                            items[_GXCommon.toLogicalName(ln)] = (index, time)
+                except OSError:
+                    pass
+            self.__items[meter] = items
+        return items
+
+    def get(self, meter, ln):
+        """
+        Returns (entry index, capture time) of the last collected row or
+        None if the profile generic is not collected yet.
+
+        meter: Meter identifier, for example the serial number.
+        ln: Logical name of the profile generic.
+        """
+        return self.__getItems(meter).get(ln)
+
+    def set(self, meter, ln, index, time):
+        """
+        Save the checkpoint.
+
+        meter: Meter identifier, for example the serial number.
+        ln: Logical name of the profile generic.
+        index: Entry index of the last collected row.
+        time: Capture time of the last collected row or None.
+        """
+        self.__getItems(meter)[ln] = (index, time)
+        self.__save(meter)
+
+    def remove(self, meter, ln):
+        """
+        Remove the checkpoint.  All rows are read on the next collection.
+
+        meter: Meter identifier, for example the serial number.
+        ln: Logical name of the profile generic.
+        """
+        items = self.__getItems(meter)
+        if ln in items:
+            del items[ln]
+            self.__save(meter)
+
+    def __save(self, meter):
+        if not self.path:
+            return
+        items = self.__items[meter]
+        fileName = self.__getFileName(meter)
+        if not items:
+            try:
+                os.remove(fileName)
+            except OSError:
+                pass
+            return
+        data = GXByteBuffer()
+        data.setUInt8(DataType.STRUCTURE.value)
+        data.setUInt8(3)
+        _GXCommon.setData(data, DataType.UINT8, self.VERSION)
+        _GXCommon.setData(data, DataType.STRING, str(meter))
+        data.setUInt8(DataType.ARRAY.value)
+        _GXCommon.setObjectCount(len(items), data)
+        for k, v in items.items():
+            data.setUInt8(DataType.STRUCTURE.value)
+            data.setUInt8(3)
+            _GXCommon.setData(data, DataType.OCTET_STRING, _GXCommon.logicalNameToBytes(k))
+            _GXCommon.setData(data, DataType.UINT32, v[0])
+            if v[1] is None:
+                data.setUInt8(DataType.NONE.value)
+            else:
+                _GXCommon.setData(data, DataType.STRING, v[1].isoformat())
+        with open(fileName + ".tmp", "wb") as f:
+            f.write(data.array())
+        os.replace(fileName + ".tmp", fileName)
+
+    def clear(self):
+        """
+        Remove all checkpoints from the memory.  Files are not removed.
+        """
+        self.__items.clear()
+
+    @classmethod
+    def getTimeColumn(cls, pg):
+        """
+        Returns index of the capture time column or -1 if the profile
+        generic doesn't capture the clock.
+        """
+        pos = 0
+        for k, v in pg.captureObjects:
+            if isinstance(k, GXDLMSClock) and v.attributeIndex == 2:
+                return pos
+            pos += 1
+        return -1
+
+    def getNewRows(self, meter, pg):
+        """
+        Returns (index, count, start) of the rows that are not collected
+        yet.  If start is None, count rows are read by entry from the
+        one based index and there are no new rows if count is zero.
+        Otherwise rows are read by range from start and the rows that are
+        not newer than start are skipped.
+
+        Capture objects, sort method, entries in use and profile entries
+        of the profile generic must be read before this is called.
+
+        meter: Meter identifier, for example the serial number.
+        pg: Profile generic.
+        """
+        checkpoint = self.get(meter, pg.logicalName)
+        entries = pg.entriesInUse
+        if checkpoint is None or entries < checkpoint[0]:
+            #  Profile is not collected yet or the buffer is cleared.
+            return 1, entries, None
+        index, time = checkpoint
+        full = pg.profileEntries != 0 and entries >= pg.profileEntries
+        if pg.sortMethod in (SortMethod.FIFO, SortMethod.LIFO):
+            if not full or (index < entries and pg.sortMethod == SortMethod.LIFO):
+                #  New rows are added to the end.  When LIFO buffer is full
+                #  the last row is overwritten.
+                return index + 1, entries - index, None
+        #  Rows are moved when the FIFO buffer is full and sorted rows are
+        #  not in capture order.  New rows are found by the capture time.
+        if time is not None and self.getTimeColumn(pg) != -1:
+            return 0, 0, time
+        if pg.sortMethod == SortMethod.LIFO:
+            return entries, 1, None
+        return 1, entries, None
@@ -0,0 +1,168 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+from .enums.Security import Security
+from .GXDateTime import GXDateTime
+from .internal._GXCommon import _GXCommon
+
+class GXDLMSReadListPlanner:
+    """
+    Splits the read list to the requests.
+
+    Request and the expected reply must fit to the negotiated PDU.  Reply
+    that is split to the data blocks needs a round trip for each block, so
+    bigger requests would not save anything.  Reply sizes are learned from
+    the read values.  Planner can be shared with the clients of the meters
+    of the same model.
+    """
+    # Size of the request or reply header.
+    HEADER_SIZE = 12
+    # How much ciphering adds to the request and reply.
+    CIPHERING_SIZE = 24
+
+    def __init__(self):
+        # Maximum count of the items in one request.  Zero if not limited.
+        # It is halved when the meter rejects the request and doubled
+        # again after successful reads.
+        self.maxCount = 0
+        # How many successful reads are needed before the maximum count of
+        # the items is doubled.
+        self.recoverCount = 4
+        # Expected reply size of the attribute that is not read before.
+        self.defaultSize = 16
+        self.__sizes = dict()
+        self.__lastCount = 0
+        # Item count of the request that was rejected when count was not
+        # limited.
+        self.__rejectedCount = 0
+        self.__successCount = 0
+        # Needed successful reads are multiplied with this when the
+        # doubled count is rejected again.
+        self.__backoff = 1
+        # Is the count doubled after the last read.
+        self.__increased = False
+
+    def getBatches(self, settings, list_, itemSize):
+        """
+        Returns read list split to the batches.
+
+        settings: DLMS settings.
+        list_: List of (COSEM object, attribute index) tuples.
+        itemSize: Size of one item in the request.
+        """
+        header = self.HEADER_SIZE
+        if settings.cipher and settings.cipher.security != Security.NONE:
+            header += self.CIPHERING_SIZE
+        batches = list()
+        batch = list()
+        request = reply = header
+        for it in list_:
+            size = 1 + self.__sizes.get((it[0].objectType, it[0].logicalName, it[1]), self.defaultSize)
+            if batch and (request + itemSize > settings.maxPduSize or reply + size > settings.maxPduSize or len(batch) == self.maxCount):
+                batches.append(batch)
+                batch = list()
+                request = reply = header
+            batch.append(it)
+            request += itemSize
+            reply += size
+        if batch:
+            batches.append(batch)
+        self.__lastCount = max([len(it) for it in batches] + [0])
+        return batches
+
+    def reject(self):
+        """
+        Meter rejected the request.  Item count of the request is halved.
+        Returns False if the request had only one item.
+        """
+        if self.__lastCount < 2:
+            return False
+        if self.maxCount == 0:
+            self.__rejectedCount = self.__lastCount
+        if self.__increased:
+            self.__backoff *= 2
+            self.__increased = False
+        self.maxCount = self.__lastCount // 2
+        self.__successCount = 0
+        return True
+
+    def update(self, list_, values):
+        """
+        Update expected reply sizes from the read values.  After enough
+        successful reads, the maximum count of the items is doubled until
+        the count is not limited again.
+
+        list_: List of (COSEM object, attribute index) tuples.
+        values: Read values.
+        """
+        if self.__increased:
+            self.__increased = False
+            self.__backoff = 1
+        if self.maxCount:
+            self.__successCount += 1
+            if self.__successCount >= self.recoverCount * self.__backoff:
+                self.__successCount = 0
+                self.__increased = True
+                self.maxCount *= 2
+                if self.maxCount >= self.__rejectedCount:
+                    self.maxCount = 0
+        for (k, v), value in zip(list_, values):
+            self.__sizes[(k.objectType, k.logicalName, v)] = self.getSize(value)
+
+    @classmethod
+    def getSize(cls, value):
+        """
+        Returns estimated size of the encoded value.
+        """
+        if value is None:
+            ret = 1
+        elif isinstance(value, bool):
+            ret = 2
+        elif isinstance(value, int):
+            if -0x80000000 <= value <= 0xFFFFFFFF:
+                ret = 5
+            else:
+                ret = 9
+        elif isinstance(value, float):
+            ret = 9
+        elif isinstance(value, (bytes, bytearray, str)):
+            ret = 1 + _GXCommon.getObjectCountSizeInBytes(len(value)) + len(value)
+        elif isinstance(value, (list, tuple)):
+            ret = 1 + _GXCommon.getObjectCountSizeInBytes(len(value))
+            for it in value:
+                ret += cls.getSize(it)
+        elif isinstance(value, GXDateTime):
+            ret = 14
+        else:
+            ret = 16
+        return ret
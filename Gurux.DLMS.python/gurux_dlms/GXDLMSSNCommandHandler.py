@@ -207,7 +207,7 @@ class GXDLMSSNCommandHandler:
             settings.resetBlockIndex()
             return
         if server.transaction is None:
-            server.setTransaction(GXDLMSLongTransaction(None, command, data))
+            server.transaction = GXDLMSLongTransaction(None, command, data)
         else:
             server.transaction.data.set(data)
         if lastBlock == 0:
@@ -222,7 +222,7 @@ class GXDLMSSNCommandHandler:
         if server.transaction:
             data.size(0)
             data.set(server.transaction.data)
-            server.setTransaction(None)
+            server.transaction = None
         if command == Command.READ_RESPONSE:
             cls.handleReadRequest(settings, server, data, replyData, xml)
         else:
@@ -283,7 +283,7 @@ class GXDLMSSNCommandHandler:
                 reads.append(it)
             if reads:
                 server.onPostRead(reads)
-            server.setTransaction(GXDLMSLongTransaction(reads, Command.READ_REQUEST, bb))
+            server.transaction = GXDLMSLongTransaction(reads, Command.READ_REQUEST, bb)
         elif server.transaction:
             replyData.set(bb)
             return
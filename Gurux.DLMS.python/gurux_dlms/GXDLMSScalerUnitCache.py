@@ -0,0 +1,139 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+from .objects.GXDLMSRegister import GXDLMSRegister
+from .objects.GXDLMSExtendedRegister import GXDLMSExtendedRegister
+from .objects.GXDLMSDemandRegister import GXDLMSDemandRegister
+
+class GXDLMSScalerUnitCache:
+    """
+    Scaler and unit cache.
+
+    Scaler and unit of the register don't change between the meters of
+    the same model.  One cache is shared with the clients and the key is
+    the meter model and the logical name of the register.
+    """
+
+    #
+    # Constructor.
+    #
+    # verifyInterval: Cached scaler and unit is read again from the meter
+    #     after it is used this many times.  Zero if cached values are not
+    #     read again.
+    #
+    def __init__(self, verifyInterval=100):
+        # Scaler, unit and use count by model and logical name.
+        self.__items = dict()
+        self.verifyInterval = verifyInterval
+        # Count of scaler and units that meter returned different than
+        # they were in the cache.
+        self.mismatchCount = 0
+
+    @classmethod
+    def getScalerUnitIndex(cls, item):
+        """
+        Returns index of the scaler and unit attribute or zero if the
+        object doesn't have scaler and unit.
+        """
+        if isinstance(item, GXDLMSDemandRegister):
+            return 4
+        if isinstance(item, (GXDLMSRegister, GXDLMSExtendedRegister)):
+            return 3
+        return 0
+
+    @classmethod
+    def isScalerUnitRead(cls, item):
+        """
+        Returns True if scaler and unit are read from the meter or set from
+        the cache.  Unit can't be used for this, because zero is a valid
+        unit.
+        """
+        index = cls.getScalerUnitIndex(item)
+        return index != 0 and item.getLastReadTime(index) is not None
+
+    def get(self, model, ln):
+        """
+        Returns scaler and unit as a tuple or None if they are not known.
+        None is also returned every verifyInterval:th time, so scaler and
+        unit are read from the meter and set compares them with the cached
+        values.
+
+        model: Meter model.
+        ln: Logical name of the register.
+        """
+        item = self.__items.get((model, ln))
+        if item is None:
+            return None
+        item[2] += 1
+        if self.verifyInterval and item[2] >= self.verifyInterval:
+            item[2] = 0
+            return None
+        return item[0], item[1]
+
+    def set(self, model, ln, scaler, unit):
+        """
+        Set scaler and unit.
+
+        model: Meter model.
+        ln: Logical name of the register.
+        scaler: Scaler.
+        unit: Unit.
+        """
+        if model is None:
+            raise ValueError("Meter model is not set.")
+        key = (model, ln)
+        old = self.__items.get(key)
+        if old is None:
+            self.__items[key] = [scaler, unit, 0]
+        elif old[0] != scaler or old[1] != unit:
+            self.mismatchCount += 1
+            old[0] = scaler
+            old[1] = unit
+
+    def remove(self, model, ln):
+        """
+        Remove scaler and unit.  They are read again from the next meter.
+
+        model: Meter model.
+        ln: Logical name of the register.
+        """
+        self.__items.pop((model, ln), None)
+
+    def clear(self):
+        """
+        Remove all scalers and units.
+        """
+        self.__items.clear()
+
+    def __len__(self):
+        return len(self.__items)
@@ -32,9 +32,10 @@
 #  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
 # ---------------------------------------------------------------------------
 from abc import ABCMeta, abstractmethod
-import datetime
-from .GXReplyData import GXReplyData
+import copy
+import time
 from .GXDLMSSettings import GXDLMSSettings
+from .GXDLMSServerSession import GXDLMSServerSession
 from .enums.Command import Command
 from .GXDLMSLongTransaction import GXDLMSLongTransaction
 from .ServiceError import ServiceError
@@ -80,25 +81,133 @@ class GXDLMSServer:
     # interfaceType: Interface type.
     #
     def __init__(self, logicalNameReferencing, interfaceType):
-        self.info = GXReplyData()
-        # Received data.
-        self.receivedData = GXByteBuffer()
-        # Reply data.
-        self.replyData = GXByteBuffer()
-        # Long get or read transaction information.
-        self.transaction = None
-        # Server settings.
-        self.settings = GXDLMSSettings(True)
+        # Default session.  Settings of the default session are copied to
+        # the new sessions.
+        self.__default = GXDLMSServerSession(GXDLMSSettings(True))
+        # Session that handles the current request.
+        self.__session = self.__default
         # Is server initialized.
         self.initialized = False
-        # When data was received last time.
-        self.dataReceived = 0
         self.settings.setUseLogicalNameReferencing(logicalNameReferencing)
         self.settings.interfaceType = interfaceType
         self.hdlc = None
         self.wrapper = None
+        # Is inactivity timeout of the HDLC or Wrapper setup checked when
+        # request is received.  AsyncGXDLMSListener closes idle
+        # connections itself and turns this off.
+        self.checkInactivity = True
+        self.reset()
+
+    def __getSettings(self):
+        return self.__session.settings
+
+    def __setSettings(self, value):
+        self.__session.settings = value
+
+    # Settings of the current session.
+    settings = property(__getSettings, __setSettings)
+
+    def __getInfo(self):
+        return self.__session.info
+
+    def __setInfo(self, value):
+        self.__session.info = value
+
+    # Received request of the current session.
+    info = property(__getInfo, __setInfo)
+
+    def __getReceivedData(self):
+        return self.__session.receivedData
+
+    def __setReceivedData(self, value):
+        self.__session.receivedData = value
+
+    # Received data of the current session.
+    receivedData = property(__getReceivedData, __setReceivedData)
+
+    def __getReplyData(self):
+        return self.__session.replyData
+
+    def __setReplyData(self, value):
+        self.__session.replyData = value
+
+    # Reply data of the current session.
+    replyData = property(__getReplyData, __setReplyData)
+
+    def __getTransaction(self):
+        return self.__session.transaction
+
+    def __setTransaction(self, value):
+        self.__session.transaction = value
+
+    # Long get or read transaction of the current session.
+    transaction = property(__getTransaction, __setTransaction)
+
+    def __getDataReceived(self):
+        return self.__session.dataReceived
+
+    def __setDataReceived(self, value):
+        self.__session.dataReceived = value
+
+    # When data was received last time in the current session.
+    dataReceived = property(__getDataReceived, __setDataReceived)
+
+    def createSession(self):
+        """
+        Create new session for the association.  Settings are copied from
+        the default session, so configure the server before the sessions
+        are created.  Object model and callbacks are shared.
+
+        Set the session to GXServerReply.session when the request of the
+        association is handled.  Requests of the different sessions can
+        be handled in any order, but only from one thread at the time.
+        """
+        settings = copy.copy(self.__default.settings)
+        settings.limits = copy.copy(settings.limits)
+        if settings.cipher:
+            settings.cipher = settings.cipher.copySession()
+        settings.resetFrameSequence()
+        settings.resetBlockIndex()
+        settings.negotiatedConformance = Conformance.NONE
+        session = GXDLMSServerSession(settings)
+        self.__run(session, self.reset)
+        return session
+
+    def closeSession(self, session, connectionInfo=None):
+        """
+        Close the session when the connection is closed.  onDisconnected
+        is called if the association is open.
+
+        session: Closed session.
+        connectionInfo: Connection info.
+        """
+        self.__run(session, self.__closeSession, connectionInfo)
+
+    def __closeSession(self, connectionInfo):
+        if (self.settings.connected & ConnectionState.DLMS) != ConnectionState.NONE:
+            self.onDisconnected(connectionInfo)
         self.reset()
 
+    def __run(self, session, method, *args):
+        current = self.__session
+        self.__session = session
+        self.__bind(session)
+        try:
+            return method(*args)
+        finally:
+            self.__session = current
+            self.__bind(current)
+
+    def __bind(self, session):
+        """
+        Keep the association state of the current association object in
+        the session.  State of the default session is kept in the object.
+        """
+        if self.useLogicalNameReferencing:
+            ln = self.items.findByLN(ObjectType.ASSOCIATION_LOGICAL_NAME, "0.0.40.0.0.255")
+            if ln:
+                ln.session = None if session is self.__default else session
+
     def __getItems(self):
         return self.settings.objects
 
@@ -121,10 +230,10 @@ class GXDLMSServer:
     limits = property(__getLimits)
 
     def __getMaxReceivePDUSize(self):
-        return self.maxReceivePDUSize
+        return self.settings.maxServerPDUSize
 
     def __setMaxReceivePDUSize(self, value):
-        self.maxReceivePDUSize = value
+        self.settings.maxServerPDUSize = value
 
     #
     # Retrieves the maximum size of received PDU.  PDU size tells maximum size
@@ -136,10 +245,10 @@ class GXDLMSServer:
     maxReceivePDUSize = property(__getMaxReceivePDUSize, __setMaxReceivePDUSize)
 
     def __getUseLogicalNameReferencing(self):
-        return self.useLogicalNameReferencing
+        return self.settings.getUseLogicalNameReferencing()
 
     def __setUseLogicalNameReferencing(self, value):
-        self.useLogicalNameReferencing = value
+        self.settings.setUseLogicalNameReferencing(value)
 
     #
     # Determines, whether Logical, or Short name, referencing is used.
@@ -386,7 +495,7 @@ class GXDLMSServer:
         else:
             p = GXDLMSSNParameters(self.settings, Command.DATA_NOTIFICATION, 1, 0, data, None)
             reply = GXDLMS.getSnMessages(p)
-        if (self.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) == 0 and len(reply) != 1:
+        if (self.settings.negotiatedConformance & Conformance.GENERAL_BLOCK_TRANSFER) == Conformance.NONE and len(reply) != 1:
             raise ValueError("Data is not fit to one PDU. Use general block transfer.")
         return reply
 
@@ -440,7 +549,7 @@ class GXDLMSServer:
         return self.settings.invokeId
 
     def __setInvokeID(self, value):
-        self.settings.invokeID = value
+        self.settings.setInvokeID(value)
 
     # Invoke ID.
     invokeID = property(__getInvokeID, __setInvokeID)
@@ -476,18 +585,18 @@ class GXDLMSServer:
                 raise ValueError("Invalid Logical Name.")
             it.start = self
             if isinstance(it, (GXDLMSAssociationShortName,)) and not self.useLogicalNameReferencing:
-                if (it).objectList.size() == 0:
-                    (it).objectList.append(self.items)
+                if not it.objectList:
+                    it.objectList.extend(self.items)
                 associationObject = it
             elif isinstance(it, (GXDLMSAssociationLogicalName,)) and self.useLogicalNameReferencing:
                 ln = it
-                if ln.objectList.size() == 0:
-                    ln.objectList.append(self.items)
+                if not ln.objectList:
+                    ln.objectList.extend(self.items)
                 associationObject = it
                 ln.xDLMSContextInfo.maxReceivePduSize = self.settings.maxServerPDUSize
                 ln.xDLMSContextInfo.maxSendPduSize = self.settings.maxServerPDUSize
             elif not isinstance(it, IGXDLMSBase):
-                self.settings.objects.remove(pos)
+                del self.settings.objects[pos]
                 pos -= 1
             pos += 1
         if not associationObject:
@@ -496,11 +605,11 @@ class GXDLMSServer:
                 it.xDLMSContextInfo.maxReceivePduSize = self.settings.maxServerPDUSize
                 it.xDLMSContextInfo.maxSendPduSize = self.settings.maxServerPDUSize
                 self.items.append(it)
-                it.objectList.append(self.items)
+                it.objectList.extend(self.items)
             else:
                 it = GXDLMSAssociationShortName()
                 self.items.append(it)
-                it.objectList.append(self.items)
+                it.objectList.extend(self.items)
         if not self.useLogicalNameReferencing:
             self.updateShortNames(False)
 
@@ -642,11 +751,11 @@ class GXDLMSServer:
         GXDLMS.appendHdlcParameter(self.replyData, self.limits.maxInfoRX)
         self.replyData.setUInt8(_HDLCInfo.WINDOW_SIZE_TX)
         self.replyData.setUInt8(4)
-        self.replyData.setUInt32(self.limits.getWindowSizeTX())
+        self.replyData.setUInt32(self.limits.windowSizeTX)
         self.replyData.setUInt8(_HDLCInfo.WINDOW_SIZE_RX)
         self.replyData.setUInt8(4)
-        self.replyData.setUInt32(self.limits.getWindowSizeRX())
-        self.replyData.setUInt8(2, len(self.replyData) - 3)
+        self.replyData.setUInt32(self.limits.windowSizeRX)
+        self.replyData.setUInt8(len(self.replyData) - 3, 2)
         self.settings.connected = ConnectionState.HDLC
 
     def generateDisconnectRequest(self):
@@ -654,18 +763,16 @@ class GXDLMSServer:
         self.replyData.setUInt8(0x80)
         self.replyData.setUInt8(0)
         self.replyData.setUInt8(_HDLCInfo.MAX_INFO_TX)
-        self.replyData.setUInt8(1)
-        self.replyData.setUInt8(self.limits.maxInfoTX)
+        GXDLMS.appendHdlcParameter(self.replyData, self.limits.maxInfoTX)
         self.replyData.setUInt8(_HDLCInfo.MAX_INFO_RX)
-        self.replyData.setUInt8(1)
-        self.replyData.setUInt8(self.limits.maxInfoRX)
+        GXDLMS.appendHdlcParameter(self.replyData, self.limits.maxInfoRX)
         self.replyData.setUInt8(_HDLCInfo.WINDOW_SIZE_TX)
         self.replyData.setUInt8(4)
         self.replyData.setUInt32(self.limits.windowSizeTX)
         self.replyData.setUInt8(_HDLCInfo.WINDOW_SIZE_RX)
         self.replyData.setUInt8(4)
         self.replyData.setUInt32(self.limits.windowSizeRX)
-        self.replyData.setUInt8(2, len(self.replyData) - 3)
+        self.replyData.setUInt8(len(self.replyData) - 3, 2)
 
 
     def reset(self, connect=False):
@@ -683,6 +790,7 @@ class GXDLMSServer:
         self.settings.connected = ConnectionState.NONE
         self.replyData.clear()
         self.settings.authentication = Authentication.NONE
+        self.__session.associationStatus = AssociationStatus.NON_ASSOCIATED
         if self.settings.cipher:
             self.settings.cipher.reset()
 
@@ -690,13 +798,19 @@ class GXDLMSServer:
         self.reset(False)
 
     def handleRequest(self, sr):
-        #pylint: disable=too-many-return-statements,broad-except
         """
         Handles client request.
 
         buff: Received data from the client.
         Returns Response to the request. Response is null if request packet is not complete.
         """
+        if sr.session is not None and sr.session is not self.__session:
+            self.__run(sr.session, self.__handleRequest, sr)
+        else:
+            self.__handleRequest(sr)
+
+    def __handleRequest(self, sr):
+        #pylint: disable=too-many-return-statements,broad-except
         if not sr.isStreaming() and not sr.data:
             return
         if not self.initialized:
@@ -708,15 +822,16 @@ class GXDLMSServer:
                 try:
                     GXDLMS.getData(self.settings, self.receivedData, self.info, None)
                 except Exception:
-                    self.dataReceived = datetime.datetime.now()
+                    if self.checkInactivity:
+                        self.dataReceived = time.monotonic()
                     self.receivedData.size = 0
-                    sr.setReply(GXDLMS.getHdlcFrame(self.settings, Command.UNACCEPTABLE_FRAME, self.replyData))
+                    sr.reply = GXDLMS.getHdlcFrame(self.settings, Command.UNACCEPTABLE_FRAME, self.replyData)
                     return
                 if not self.info.complete:
                     return
                 self.receivedData.clear()
                 if self.info.command == Command.DISCONNECT_REQUEST and (self.settings.connected == ConnectionState.NONE):
-                    sr.setReply(GXDLMS.getHdlcFrame(self.settings, Command.DISCONNECT_MODE, self.replyData))
+                    sr.reply = GXDLMS.getHdlcFrame(self.settings, Command.DISCONNECT_MODE, self.replyData)
                     self.info.clear()
                     return
                 if first or self.info.command == Command.SNRM or (self.settings.interfaceType == InterfaceType.WRAPPER and self.info.command == Command.AARQ):
@@ -724,48 +839,51 @@ class GXDLMSServer:
                         self.info.clear()
                         return
                 if (self.info.moreData.value & RequestTypes.FRAME.value) == RequestTypes.FRAME.value:
-                    self.dataReceived = datetime.datetime.now()
-                    sr.setReply(GXDLMS.getHdlcFrame(self.settings, self.settings.getReceiverReady(), self.replyData))
+                    if self.checkInactivity:
+                        self.dataReceived = time.monotonic()
+                    sr.reply = GXDLMS.getHdlcFrame(self.settings, self.settings.getReceiverReady(), self.replyData)
                     return
                 if self.info.command == Command.NONE:
                     if self.transaction:
                         self.info.command = (self.transaction.command)
                     elif not self.replyData:
-                        sr.setReply(GXDLMS.getHdlcFrame(self.settings, self.settings.getReceiverReady(), self.replyData))
+                        #  Nothing to send.  Reply to keep-alive.
+                        sr.reply = GXDLMS.getHdlcFrame(self.settings, self.settings.getKeepAlive(), self.replyData)
                         return
-                if self.hdlc and self.hdlc.inactivityTimeout != 0:
-                    if self.info.command != Command.SNRM:
-                        elapsed = int((datetime.datetime.now() - self.dataReceived)) / 1000
-                        if elapsed >= self.hdlc.inactivityTimeout:
-                            self.reset()
-                            self.dataReceived = 0
-                            return
-                elif self.wrapper and self.wrapper.inactivityTimeout != 0:
-                    if self.info.command != Command.AARQ:
-                        elapsed = int((datetime.datetime.now() - self.dataReceived)) / 1000
-                        if elapsed >= self.wrapper.inactivityTimeout:
-                            self.reset()
-                            self.dataReceived = 0
-                            return
+                if self.checkInactivity and self.dataReceived != 0:
+                    #  Inactivity timeout is in seconds.
+                    if self.hdlc and self.hdlc.inactivityTimeout != 0:
+                        if self.info.command != Command.SNRM:
+                            if time.monotonic() - self.dataReceived >= self.hdlc.inactivityTimeout:
+                                self.reset()
+                                self.dataReceived = 0
+                                return
+                    elif self.wrapper and self.wrapper.inactivityTimeout != 0:
+                        if self.info.command != Command.AARQ:
+                            if time.monotonic() - self.dataReceived >= self.wrapper.inactivityTimeout:
+                                self.reset()
+                                self.dataReceived = 0
+                                return
             else:
                 self.info.command = (Command.GENERAL_BLOCK_TRANSFER)
             try:
-                sr.setReply(self.handleCommand(self.info.command, self.info.data, sr))
+                sr.reply = self.handleCommand(self.info.command, self.info.data, sr)
             except Exception:
-                self.receivedData.size(0)
-                sr.setReply(GXDLMS.getHdlcFrame(self.settings, Command.UNACCEPTABLE_FRAME, self.replyData))
-            self.dataReceived = datetime.datetime.now()
+                self.receivedData.size = 0
+                sr.reply = GXDLMS.getHdlcFrame(self.settings, Command.UNACCEPTABLE_FRAME, self.replyData)
+            if self.checkInactivity:
+                self.dataReceived = time.monotonic()
             self.info.clear()
         except Exception as e:
             if isinstance(e, (GXDLMSConfirmedServiceError,)):
-                sr.setReply(self.reportConfirmedServiceError(e))
+                sr.reply = self.reportConfirmedServiceError(e)
                 self.transaction = None
                 self.settings.setCount(0)
                 self.settings.setIndex(0)
                 self.info.clear()
                 self.receivedData.clear()
             elif self.info.command != Command.NONE:
-                sr.setReply(self.reportError(self.info.command, ErrorCode.HARDWARE_FAULT))
+                sr.reply = self.reportError(self.info.command, ErrorCode.HARDWARE_FAULT)
                 self.transaction = None
                 self.settings.setCount(0)
                 self.settings.setIndex(0)
@@ -773,7 +891,7 @@ class GXDLMSServer:
                 self.receivedData.clear()
             else:
                 self.reset()
-                if (self.settings.connected & ConnectionState.DLMS) != 0:
+                if (self.settings.connected & ConnectionState.DLMS) != ConnectionState.NONE:
                     self.settings.connected = self.settings.connected & ~ConnectionState.DLMS
                     self.onDisconnected(sr.connectionInfo)
 
@@ -832,23 +950,23 @@ class GXDLMSServer:
         elif cmd == Command.READ_REQUEST:
             GXDLMSSNCommandHandler.handleReadRequest(self.settings, self, data, self.replyData, None)
         elif cmd == Command.METHOD_REQUEST:
-            GXDLMSLNCommandHandler.handleMethodRequest(self.settings, self, data, sr.getConnectionInfo(), self.replyData, None)
+            GXDLMSLNCommandHandler.handleMethodRequest(self.settings, self, data, sr.connectionInfo, self.replyData, None)
         elif cmd == Command.SNRM:
             self.handleSnrmRequest(data)
             frame_ = int(Command.UA)
         elif cmd == Command.AARQ:
-            self.handleAarqRequest(data, sr.getConnectionInfo())
-            if (self.settings.connected & ConnectionState.DLMS) != 0:
-                self.onConnected(sr.getConnectionInfo())
+            self.handleAarqRequest(data, sr.connectionInfo)
+            if (self.settings.connected & ConnectionState.DLMS) != ConnectionState.NONE:
+                self.onConnected(sr.connectionInfo)
         elif cmd == Command.RELEASE_REQUEST:
             self.handleReleaseRequest(data)
-            if (self.settings.connected & ConnectionState.DLMS) != 0:
+            if (self.settings.connected & ConnectionState.DLMS) != ConnectionState.NONE:
                 self.settings.connected = self.settings.connected & ~ConnectionState.DLMS
-                self.onDisconnected(sr.getConnectionInfo())
+                self.onDisconnected(sr.connectionInfo)
         elif cmd == Command.DISCONNECT_REQUEST:
             self.generateDisconnectRequest()
-            if (self.settings.connected & ConnectionState.DLMS) != 0:
-                self.onDisconnected(sr.getConnectionInfo())
+            if (self.settings.connected & ConnectionState.DLMS) != ConnectionState.NONE:
+                self.onDisconnected(sr.connectionInfo)
             self.settings.connected = ConnectionState.HDLC
             frame_ = Command.UA
         elif cmd == Command.GENERAL_BLOCK_TRANSFER:
@@ -873,12 +991,12 @@ class GXDLMSServer:
             if self.transaction.command == Command.GET_REQUEST:
                 if sr.count == 0:
                     self.settings.setBlockNumberAck(self.settings.blockNumberAck + 1)
-                    sr.setCount(self.settings.windowSize)
+                    sr.count = self.settings.windowSize
                 GXDLMSLNCommandHandler.getRequestNextDataBlock(self.settings, 0, self, data, self.replyData, None, True)
                 if sr.count != 0:
-                    sr.setCount(sr.getCount() - 1)
+                    sr.count -= 1
                 if not self.transaction:
-                    sr.setCount(0)
+                    sr.count = 0
             else:
                 bc = data.getUInt8()
                 blockNumber = data.getUInt16()
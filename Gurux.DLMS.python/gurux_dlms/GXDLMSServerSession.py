@@ -0,0 +1,77 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+from .GXReplyData import GXReplyData
+from .GXByteBuffer import GXByteBuffer
+from .objects.enums.AssociationStatus import AssociationStatus
+
+class GXDLMSServerSession:
+    """
+    State of one association of GXDLMSServer.
+
+    Session keeps the settings of the association, like HDLC frame
+    sequence, block index, long transaction, ciphering and authentication.
+    Association status, application context name and authentication
+    mechanism name of the current association object are also kept in the
+    session.
+    Object model and callbacks are shared with the other sessions of the
+    server.  Sessions are created with GXDLMSServer.createSession.
+    """
+
+    #
+    # Constructor.
+    #
+    # settings: DLMS settings of the association.
+    #
+    def __init__(self, settings):
+        # DLMS settings of the association.
+        self.settings = settings
+        # Received request.
+        self.info = GXReplyData()
+        # Received data.
+        self.receivedData = GXByteBuffer()
+        # Reply data.
+        self.replyData = GXByteBuffer()
+        # Long get or read transaction information.
+        self.transaction = None
+        # When data was received last time as time.monotonic() value.
+        # Zero if nothing is received yet.
+        self.dataReceived = 0
+        # Association status of the current association.
+        self.associationStatus = AssociationStatus.NON_ASSOCIATED
+        # Application context name of the current association.  None until
+        # the current association object is used in the session.
+        self.applicationContextName = None
+        # Authentication mechanism name of the current association.  None
+        # until the current association object is used in the session.
+        self.authenticationMechanismName = None
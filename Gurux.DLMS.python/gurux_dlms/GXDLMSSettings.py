@@ -121,9 +121,11 @@ class GXDLMSSettings:
         self.useUtc2NormalTime = False
         self.standard = Standard.DLMS
         self.negotiatedConformance = Conformance.NONE
-        self.invokeID = 0
         self.receiverFrame = 0
         self.senderFrame = 0
+        # Type of the last get request.  Reply of the get request with list
+        # is parsed as a list also when it's received in data blocks.
+        self.getRequestType = 0
 
     #
     # Client to Server challenge.
@@ -182,7 +184,8 @@ class GXDLMSSettings:
                 return True
         #  If S -frame.
         if (frame_ & HdlcFrameType.S_FRAME.value) == HdlcFrameType.S_FRAME.value:
-            self.receiverFrame = self.increaseReceiverSequence(self.receiverFrame)
+            #  Receive sequence is taken from the frame.  Keep-alive doesn't increase it.
+            self.receiverFrame = (frame_ & 0xE0) | 0x10 | (self.receiverFrame & 0xF)
             return True
         #  Handle I-frame.
         expected = int()
@@ -251,7 +254,12 @@ class GXDLMSSettings:
     #
     def getKeepAlive(self):
         self.senderFrame = (self.senderFrame | 1)
-        return self.senderFrame & 0xF1
+        value = self.senderFrame
+        #  Receive sequence of the next I-frame is increased when it's sent.
+        #  Last received I-frame is acknowledged already here.
+        if ((self.receiverFrame >> 1) + 1) & 0x7 != (value >> 5) & 0x7:
+            value = self.increaseReceiverSequence(value)
+        return value & 0xF1
 
     #
     # Gets starting block index in HDLC framing.  Default is One based,
@@ -329,7 +337,7 @@ class GXDLMSSettings:
     # Invoke ID.
     #
     def getInvokeID(self):
-        return self.invokeID
+        return self.invokeId
 
     #
     # @param value
@@ -344,7 +352,7 @@ class GXDLMSSettings:
             self.serviceClass = ServiceClass.CONFIRMED
         else:
             self.serviceClass = ServiceClass.UN_CONFIRMED
-        self.invokeID = int((value & 0xF))
+        self.invokeId = int((value & 0xF))
 
     #
     # @param value
@@ -353,7 +361,7 @@ class GXDLMSSettings:
     def setInvokeID(self, value):
         if value > 0xF:
             raise ValueError("Invalid InvokeID")
-        self.invokeID = int(value)
+        self.invokeId = int(value)
 
     #
     # Invoke ID.
@@ -0,0 +1,104 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import datetime
+import sqlite3
+from .GXDLMSProfileCheckpointStore import GXDLMSProfileCheckpointStore
+
+class GXDLMSSqliteCheckpointStore(GXDLMSProfileCheckpointStore):
+    """
+    Profile checkpoint store that keeps the checkpoints in SQLite
+    database.  Several collectors can share the same database file.
+    """
+
+    #
+    # Constructor.
+    #
+    # database: Database file name.  Checkpoints are kept only in memory
+    #     if the name is ":memory:".
+    #
+    def __init__(self, database=":memory:"):
+        super(GXDLMSSqliteCheckpointStore, self).__init__()
+        self.__connection = sqlite3.connect(database, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS Checkpoint(Meter TEXT NOT NULL, " +
+                                      "LogicalName TEXT NOT NULL, EntryIndex INTEGER NOT NULL, " +
+                                      "CaptureTime TEXT, PRIMARY KEY(Meter, LogicalName))")
+
+    def get(self, meter, ln):
+        """
+        Returns (entry index, capture time) of the last collected row or
+        None if the profile generic is not collected yet.
+
+        meter: Meter identifier, for example the serial number.
+        ln: Logical name of the profile generic.
+        """
+        row = self.__connection.execute("SELECT EntryIndex, CaptureTime FROM Checkpoint " +
+                                        "WHERE Meter = ? AND LogicalName = ?", (str(meter), ln)).fetchone()
+        if row is None:
+            return None
+        time = row[1]
+        if time is not None:
+            time = datetime.datetime.fromisoformat(time)
+        return row[0], time
+
+    def set(self, meter, ln, index, time):
+        """
+        Save the checkpoint.
+
+        meter: Meter identifier, for example the serial number.
+        ln: Logical name of the profile generic.
+        index: Entry index of the last collected row.
+        time: Capture time of the last collected row or None.
+        """
+        if time is not None:
+            time = time.isoformat()
+        with self.__connection:
+            self.__connection.execute("INSERT OR REPLACE INTO Checkpoint(Meter, LogicalName, EntryIndex, CaptureTime) " +
+                                      "VALUES(?, ?, ?, ?)", (str(meter), ln, index, time))
+
+    def remove(self, meter, ln):
+        """
+        Remove the checkpoint.  All rows are read on the next collection.
+
+        meter: Meter identifier, for example the serial number.
+        ln: Logical name of the profile generic.
+        """
+        with self.__connection:
+            self.__connection.execute("DELETE FROM Checkpoint WHERE Meter = ? AND LogicalName = ?", (str(meter), ln))
+
+    def close(self):
+        """
+        Close the database.
+        """
+        self.__connection.close()
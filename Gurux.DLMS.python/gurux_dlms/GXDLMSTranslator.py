@@ -873,11 +873,11 @@ class GXDLMSTranslator:
         elif tag == TranslatorGeneralTags.CALLING_AP_TITLE:
             s.settings.setCtoSChallenge(GXByteBuffer.hexToBytes(cls.getValue(node, s)))
         elif tag == int(TranslatorGeneralTags.CALLING_AE_INVOCATION_ID):
-            s.settings.setUserId(s.parseInt(cls.getValue(node, s)))
+            s.settings.userId = s.parseInt(cls.getValue(node, s))
         elif tag == int(TranslatorGeneralTags.CALLED_AE_INVOCATION_ID):
-            s.settings.setUserId(s.parseInt(cls.getValue(node, s)))
+            s.settings.userId = s.parseInt(cls.getValue(node, s))
         elif tag == TranslatorGeneralTags.RESPONDING_AE_INVOCATION_ID:
-            s.settings.setUserId(s.parseInt(cls.getValue(node, s)))
+            s.settings.userId = s.parseInt(cls.getValue(node, s))
         elif tag == 0xA4:
             s.settings.setStoCChallenge(GXByteBuffer.hexToBytes(cls.getValue(node, s)))
         elif tag == 0xBE03:
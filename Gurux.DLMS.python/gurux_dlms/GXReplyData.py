@@ -82,6 +82,9 @@ class GXReplyData:
         self.packetLength = 0
         # Try get value.
         self.peek = False
+        # Are compact arrays returned as GXCompactArray columns.  Fixed
+        # size columns are parsed with one pass.
+        self.columnar = False
         # Data type.
         self.dataType = DataType.NONE
         # Cipher index is position where data is decrypted.
@@ -111,6 +114,8 @@ class GXReplyData:
         # Gateway information.
         self.gateway = None
         self.valueType = 0
+        # Resumable parser of the value.  This is for internal use.
+        self.dataReader = None
 
     def clear(self):
         """"
@@ -133,6 +138,7 @@ class GXReplyData:
             self.xml.xml = ""
         self.invokeId = 0
         self.value = None
+        self.dataReader = None
 
     def isMoreData(self):
         """
@@ -187,8 +193,8 @@ class GXReplyData:
     #      @see #getTotalCount
     #
     def getCount(self):
-        if isinstance(self.dataValue, list):
-            return len(self.dataValue)
+        if isinstance(self.value, list):
+            return len(self.value)
         return 0
 
     #
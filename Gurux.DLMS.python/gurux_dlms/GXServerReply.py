@@ -47,6 +47,8 @@ class GXServerReply:
         self.count = 0
         # Server received data.
         self.data = value
+        # Server session.  If None, default session of the server is used.
+        self.session = None
 
     #
     # Is GBT streaming in progress.
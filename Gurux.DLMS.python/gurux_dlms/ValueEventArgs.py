@@ -85,8 +85,11 @@ class ValueEventArgs:
         self.rowBeginIndex = 0
         # Rows end index.
         self.rowEndIndex = 0
+        # Selected rows of the profile generic.  This is reserved for
+        # internal use.
+        self.rows = None
         # DLMS server.
-        self.server = None
+        self.server = None if isinstance(s, GXDLMSSettings) else s
         # Invoke ID.
         self.invokeId = 0
         self.rowEndIndex = 0
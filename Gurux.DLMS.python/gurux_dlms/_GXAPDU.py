@@ -741,10 +741,10 @@ class _GXAPDU:
                 len_ = buff.getUInt8()
                 tag = buff.getUInt8()
                 len_ = buff.getUInt8()
-                settings.setUserId(buff.getUInt8())
+                settings.userId = buff.getUInt8()
                 if xml:
                     #  CallingAPTitle
-                    xml.appendLine(TranslatorGeneralTags.CALLED_AE_INVOCATION_ID, "Value", xml.integerToHex(settings.getUserId(), 2))
+                    xml.appendLine(TranslatorGeneralTags.CALLED_AE_INVOCATION_ID, "Value", xml.integerToHex(settings.userId, 2))
             elif tag == BerType.CONTEXT.value | BerType.CONSTRUCTED.value | 7:
                 #  0xA7
                 len_ = buff.getUInt8()
@@ -969,14 +969,20 @@ class _GXAPDU:
         bb = GXByteBuffer(4)
         bb.setUInt32(settings.negotiatedConformance.value)
         data.set(bb.subArray(1, 3))
-        data.setUInt16(settings.getMaxPduSize())
+        data.setUInt16(settings.maxPduSize)
         #  VAA Name VAA name (0x0007 for LN referencing and 0xFA00 for SN)
         if settings.getUseLogicalNameReferencing():
             data.setUInt16(0x0007)
         else:
             data.setUInt16(0xFA00)
         if cipher and cipher.isCiphered():
-            p = AesGcmParameter(Command.GLO_INITIATE_RESPONSE, cipher.security, cipher.invocationCounter, cipher.systemTitle, cipher.blockCipherKey, cipher.authenticationKey)
+            cipher.invocationCounter = cipher.invocationCounter + 1
+            p = AesGcmParameter(Command.GLO_INITIATE_RESPONSE)
+            p.security = cipher.security
+            p.invocationCounter = cipher.invocationCounter
+            p.systemTitle = cipher.systemTitle
+            p.blockCipherKey = cipher.blockCipherKey
+            p.authenticationKey = cipher.authenticationKey
             return GXCiphering.encrypt(p, data.array())
         return data.array()
 
@@ -987,15 +993,15 @@ class _GXAPDU:
     def generateAARE(cls, settings, data, result, diagnostic, cipher, errorData, encryptedData):
         offset = len(data)
         #  Set AARE tag and length 0x61
-        data.setUInt8(BerType.APPLICATION | BerType.CONSTRUCTED.value | PduType.APPLICATION_CONTEXT_NAME)
+        data.setUInt8(BerType.APPLICATION.value | BerType.CONSTRUCTED.value | PduType.APPLICATION_CONTEXT_NAME.value)
         #  Length is updated later.
         data.setUInt8(0)
         cls.generateApplicationContextName(settings, data, cipher)
         #  Result 0xA2
-        data.setUInt8(BerType.CONTEXT.value | BerType.CONSTRUCTED.value | BerType.INTEGER)
+        data.setUInt8(BerType.CONTEXT.value | BerType.CONSTRUCTED.value | BerType.INTEGER.value)
         data.setUInt8(3)
         #  len
-        data.setUInt8(BerType.INTEGER)
+        data.setUInt8(BerType.INTEGER.value)
         #  Tag
         #  Choice for result (INTEGER, universal)
         data.setUInt8(1)
@@ -1019,17 +1025,17 @@ class _GXAPDU:
         data.setUInt8(diagnostic.value)
         #  SystemTitle
         if cipher and (settings.authentication == Authentication.HIGH_GMAC or cipher.isCiphered()):
-            data.setUInt8(BerType.CONTEXT.value | BerType.CONSTRUCTED.value | PduType.CALLED_AP_INVOCATION_ID)
-            data.setUInt8((len(cipher.systemTitle)))
-            data.setUInt8(BerType.OCTET_STRING)
-            data.setUInt8()
+            data.setUInt8(BerType.CONTEXT.value | BerType.CONSTRUCTED.value | PduType.CALLED_AP_INVOCATION_ID.value)
+            data.setUInt8(2 + len(cipher.systemTitle))
+            data.setUInt8(BerType.OCTET_STRING.value)
+            data.setUInt8(len(cipher.systemTitle))
             data.set(cipher.systemTitle)
         #  Add CalledAEInvocationId.
-        if settings.getUserId() != -1:
-            data.setUInt8(BerType.CONTEXT.value | BerType.CONSTRUCTED.value | PduType.CALLED_AE_INVOCATION_ID)
+        if settings.userId != -1:
+            data.setUInt8(BerType.CONTEXT.value | BerType.CONSTRUCTED.value | PduType.CALLED_AE_INVOCATION_ID.value)
             #  LEN
             data.setUInt8(3)
-            data.setUInt8(BerType.INTEGER)
+            data.setUInt8(BerType.INTEGER.value)
             #  LEN
             data.setUInt8(1)
             data.setUInt8(settings.userId)
@@ -1052,15 +1058,15 @@ class _GXAPDU:
             data.setUInt8(settings.authentication.value)
             #  Add tag.
             data.setUInt8(0xAA)
-            data.setUInt8((len(settings.stoCChallenge)))
+            data.setUInt8(2 + len(settings.stoCChallenge))
             #  Len
-            data.setUInt8(BerType.CONTEXT)
-            data.setUInt8()
-            data.set(settings.StoCChallenge)
+            data.setUInt8(BerType.CONTEXT.value)
+            data.setUInt8(len(settings.stoCChallenge))
+            data.set(settings.stoCChallenge)
         if result == AssociationResult.ACCEPTED or not cipher or cipher.security == Security.NONE:
             #  Add User Information
             #  Tag 0xBE
-            data.setUInt8(BerType.CONTEXT.value | BerType.CONSTRUCTED.value | PduType.USER_INFORMATION)
+            data.setUInt8(BerType.CONTEXT.value | BerType.CONSTRUCTED.value | PduType.USER_INFORMATION.value)
             if encryptedData:
                 tmp2 = GXByteBuffer(2 + len(encryptedData))
                 tmp2.setUInt8(Command.GLO_INITIATE_RESPONSE)
@@ -1072,10 +1078,10 @@ class _GXAPDU:
                     tmp = errorData
                 else:
                     tmp = cls.getUserInformation(settings, cipher)
-            data.setUInt8((len(tmp)))
+            data.setUInt8(2 + len(tmp))
             #  Coding the choice for user-information (Octet STRING, universal)
-            data.setUInt8(BerType.OCTET_STRING)
+            data.setUInt8(BerType.OCTET_STRING.value)
             #  Length
-            data.setUInt8()
+            data.setUInt8(len(tmp))
             data.set(tmp)
-        data.setUInt8((offset + 1), (len(data) - offset - 2))
+        data.setUInt8(len(data) - offset - 2, offset + 1)
@@ -33,19 +33,28 @@
 # ---------------------------------------------------------------------------
 from .ActionRequestType import *
 from .ActionResponseType import *
+from .AsyncGXDLMSReader import *
+from .AsyncGXDLMSPool import *
+from .AsyncGXDLMSListener import *
+from .GXDLMSPollJob import *
+from .AsyncGXDLMSScheduler import *
 from .ConfirmedServiceError import *
 from .ConnectionState import *
 from .GetCommandType import *
 from ._GXAPDU import *
+from .GXAesGcm import *
 from .GXBitString import *
+from .GXCompactArray import *
 from .GXByteBuffer import *
 from .GXDate import *
 from .GXDateTime import *
 from .GXDLMS import *
 from .GXDLMSAccessItem import *
+from .GXDLMSAssociationViewCache import *
 from .GXDLMSClient import *
 from .GXDLMSConfirmedServiceError import *
 from .GXDLMSConnectionEventArgs import *
+from .GXDLMSConnectionMetrics import *
 from .GXDLMSConverter import *
 from .GXDLMSException import *
 from .GXDLMSGateway import *
@@ -54,8 +63,13 @@ from .GXDLMSLNCommandHandler import *
 from .GXDLMSLNParameters import *
 from .GXDLMSLongTransaction import *
 from .GXDLMSNotify import *
+from .GXDLMSProfileCheckpointStore import *
+from .GXDLMSSqliteCheckpointStore import *
 from .GXDLMSServer import *
+from .GXDLMSServerSession import *
 from .GXDLMSSettings import *
+from .GXDLMSScalerUnitCache import *
+from .GXDLMSReadListPlanner import *
 from .GXDLMSSNCommandHandler import *
 from .GXDLMSSNParameters import *
 from .GXDLMSTranslator import *
@@ -32,6 +32,9 @@
 #  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
 # ---------------------------------------------------------------------------
 from enum import Enum
+import array
+import struct
+import sys
 import time
 import calendar
 from datetime import datetime
@@ -41,6 +44,12 @@ from dateutil.tz import tzoffset
 # If E0401: Unable to import 'pytz'
 # pip install pytz
 import pytz
+# numpy is optional.  If it is installed compact array columns are numpy
+# arrays.
+try:
+    import numpy
+except ImportError:
+    numpy = None
 from ._GXDataInfo import _GXDataInfo
 from ..GXByteBuffer import GXByteBuffer
 from ..GXBitString import GXBitString
@@ -58,6 +67,11 @@ class _GXCommon:
     HDLC_FRAME_START_END = 0x7E
     LLC_SEND_BYTES = bytes([0xE6, 0xE6, 0x00])
     LLC_REPLY_BYTES = bytes([0xE6, 0xE7, 0x00])
+
+    #  Struct format of the fixed size compact array columns.
+    COMPACT_ARRAY_FORMATS = {DataType.BOOLEAN: "?", DataType.INT8: "b", DataType.UINT8: "B", DataType.ENUM: "B", \
+        DataType.INT16: "h", DataType.UINT16: "H", DataType.INT32: "i", DataType.UINT32: "I", \
+        DataType.INT64: "q", DataType.UINT64: "Q", DataType.FLOAT32: "f", DataType.FLOAT64: "d"}
     DATA_TYPE_OFFSET = 0xFF0000
     zeroes = "00000000000000000000000000000000"
 
@@ -240,62 +254,24 @@ class _GXCommon:
         info.complete = True
         knownType = info.type_ != DataType.NONE
         #  Get data type if it is unknown.
-        if not knownType:
-            info.type_ = DataType(data.getUInt8())
-        if info.type_ == DataType.NONE:
+        if knownType:
+            tag = info.type_.value
+        else:
+            tag = data.getUInt8()
+            info.type_ = _GXCommon.DATA_TYPES[tag]
+            if info.type_ is None:
+                raise ValueError("Invalid data type.")
+        if tag == 0:
             if info.xml:
                 info.xml.appendLine("<" + info.xml.getDataType(info.type_) + " />")
             return value
         if data.position == len(data):
             info.complete = False
             return None
-        if info.type_ == DataType.ARRAY or info.type_ == DataType.STRUCTURE:
-            value = cls.getArray(data, info, startIndex)
-        elif info.type_ == DataType.BOOLEAN:
-            value = cls.getBoolean(data, info)
-        elif info.type_ == DataType.BITSTRING:
-            value = cls.getBitString(data, info)
-        elif info.type_ == DataType.INT32:
-            value = cls.getInt32(data, info)
-        elif info.type_ == DataType.UINT32:
-            value = cls.getUInt32(data, info)
-        elif info.type_ == DataType.STRING:
-            value = cls.getString(data, info, knownType)
-        elif info.type_ == DataType.STRING_UTF8:
-            value = cls.getUtfString(data, info, knownType)
-        elif info.type_ == DataType.OCTET_STRING:
-            value = cls.getOctetString(data, info, knownType)
-        elif info.type_ == DataType.BCD:
-            value = cls.getBcd(data, info)
-        elif info.type_ == DataType.INT8:
-            value = cls.getInt8(data, info)
-        elif info.type_ == DataType.INT16:
-            value = cls.getInt16(data, info)
-        elif info.type_ == DataType.UINT8:
-            value = cls.getUInt8(data, info)
-        elif info.type_ == DataType.UINT16:
-            value = cls.getUInt16(data, info)
-        elif info.type_ == DataType.COMPACT_ARRAY:
-            value = cls.getCompactArray(data, info)
-        elif info.type_ == DataType.INT64:
-            value = cls.getInt64(data, info)
-        elif info.type_ == DataType.UINT64:
-            value = cls.getUInt64(data, info)
-        elif info.type_ == DataType.ENUM:
-            value = cls.getEnum(data, info)
-        elif info.type_ == DataType.FLOAT32:
-            value = cls.getFloat(data, info)
-        elif info.type_ == DataType.FLOAT64:
-            value = cls.getDouble(data, info)
-        elif info.type_ == DataType.DATETIME:
-            value = cls.getDateTime(data, info)
-        elif info.type_ == DataType.DATE:
-            value = cls.getDate(data, info)
-        elif info.type_ == DataType.TIME:
-            value = cls.getTime(data, info)
-        else:
+        reader = _GXCommon.DATA_READERS[tag]
+        if reader is None:
             raise ValueError("Invalid data type.")
-        return value
+        return reader(data, info, knownType, startIndex)
 
     #
     # Convert value to hex string.
@@ -743,7 +719,9 @@ class _GXCommon:
         dt = None
         pos = 0
         while pos != len_:
-            dt = DataType(buff.getUInt8())
+            dt = cls.DATA_TYPES[buff.getUInt8()]
+            if dt is None:
+                raise ValueError("Invalid data type.")
             if dt == DataType.ARRAY:
                 cnt = buff.getUInt16()
                 tmp = list()
@@ -793,8 +771,8 @@ class _GXCommon:
         if len(buff) - buff.position < 2:
             info.complete = (False)
             return None
-        dt = DataType(buff.getUInt8())
-        if dt == DataType.ARRAY:
+        dt = cls.DATA_TYPES[buff.getUInt8()]
+        if dt is None or dt == DataType.ARRAY:
             raise ValueError("Invalid compact array data.")
         len_ = _GXCommon.getObjectCount(buff)
         list_ = list()
@@ -803,6 +781,8 @@ class _GXCommon:
             cols = list()
             cls.getDataTypes(buff, cols, len_)
             len_ = _GXCommon.getObjectCount(buff)
+            if info.columnar and not info.xml:
+                return cls.getCompactArrayColumns(buff, info, cols, len_)
             if info.xml:
                 info.xml.appendStartTag(info.xml.getDataType(DataType.COMPACT_ARRAY), None, None)
                 info.xml.appendStartTag(TranslatorTags.CONTENTS_DESCRIPTION)
@@ -863,6 +843,8 @@ class _GXCommon:
                 info.xml.appendEndTag(TranslatorTags.ARRAY_CONTENTS)
                 info.xml.appendEndTag(info.xml.getDataType(DataType.COMPACT_ARRAY))
         else:
+            if info.columnar and not info.xml:
+                return cls.getCompactArrayColumns(buff, info, dt, len_)
             if info.xml:
                 info.xml.appendStartTag(info.xml.getDataType(DataType.COMPACT_ARRAY), None, None)
                 info.xml.appendStartTag(TranslatorTags.CONTENTS_DESCRIPTION)
@@ -887,6 +869,98 @@ class _GXCommon:
                 info.xml.appendEndTag(info.xml.getDataType(DataType.COMPACT_ARRAY))
         return list_
 
+    #
+    # Get compact array contents as columns.
+    #
+    # buff
+    # Received DLMS data.
+    # info
+    # Data info.
+    # dataTypes
+    # Column data types or data type of the single values.
+    # len_
+    # Size of the contents in bytes.
+    # Parsed GXCompactArray.
+    #
+    @classmethod
+    def getCompactArrayColumns(cls, buff, info, dataTypes, len_):
+        from ..GXCompactArray import GXCompactArray
+        #  If there is not enough data available.
+        if len(buff) - buff.position < len_:
+            info.complete = False
+            return None
+        cols = dataTypes
+        if not isinstance(cols, list):
+            cols = [cols]
+        formats = [cls.COMPACT_ARRAY_FORMATS.get(it) if isinstance(it, DataType) else None for it in cols]
+        start = buff.position
+        data = buff.view(start, len_)
+        if None not in formats:
+            #  All columns are fixed size. Parse them with one pass.
+            fmt = struct.Struct(">" + "".join(formats))
+            if len_ % fmt.size != 0:
+                raise ValueError("Invalid compact array data.")
+            if numpy is not None:
+                rows = numpy.frombuffer(data, numpy.dtype([("f" + str(pos), ">" + it) for pos, it in enumerate(formats)]))
+                columns = [rows["f" + str(pos)].astype(it) for pos, it in enumerate(formats)]
+            elif len(formats) == 1:
+                columns = [cls.__toArray(formats[0], data)]
+            else:
+                columns = [cls.__toArray(it, values) for it, values in zip(formats, zip(*fmt.iter_unpack(data)))]
+                if not columns:
+                    columns = [cls.__toArray(it, []) for it in formats]
+            buff.position = start + len_
+            return GXCompactArray(dataTypes, columns)
+        #  Fixed size columns next to each other are parsed with one struct
+        #  and other columns cell by cell.
+        parts = list()
+        for dt, fmt in zip(cols, formats):
+            if fmt is None:
+                parts.append(dt)
+            elif parts and isinstance(parts[-1], str):
+                parts[-1] += fmt
+            else:
+                parts.append(fmt)
+        parts = [struct.Struct(">" + it) if isinstance(it, str) else it for it in parts]
+        columns = [list() for it in cols]
+        pos = 0
+        while pos < len_:
+            row = list()
+            for it in parts:
+                if isinstance(it, struct.Struct):
+                    row += it.unpack_from(data, pos)
+                    pos += it.size
+                else:
+                    buff.position = start + pos
+                    cls.getCompactArrayItem(buff, it, row, 1)
+                    pos = buff.position - start
+            for column, value in zip(columns, row):
+                column.append(value)
+        if pos != len_:
+            raise ValueError("Invalid compact array data.")
+        buff.position = start + len_
+        for index, fmt in enumerate(formats):
+            if fmt is not None:
+                columns[index] = cls.__toArray(fmt, columns[index])
+        return GXCompactArray(dataTypes, columns)
+
+    @classmethod
+    def __toArray(cls, fmt, values):
+        """Convert fixed size column values to array."""
+        if numpy is not None:
+            return numpy.array(values, fmt)
+        if fmt == "?":
+            #  array.array doesn't have a boolean type.
+            return [bool(it) for it in values]
+        if isinstance(values, memoryview):
+            #  Values are big endian bytes.
+            ret = array.array(fmt)
+            ret.frombytes(values)
+            if sys.byteorder == "little":
+                ret.byteswap()
+            return ret
+        return array.array(fmt, values)
+
     #
     # Get UInt8 value from DLMS data.
     #
@@ -1019,8 +1093,8 @@ class _GXCommon:
             if len(buff) - buff.position < len_:
                 info.complete = (False)
                 return None
-        tmp = bytearray(len_)
-        buff.get(tmp)
+        tmp = bytearray(buff.view(buff.position, len_))
+        buff.position += len_
         value = tmp
         if info.xml:
             if info.xml.comments and tmp:
@@ -1217,75 +1291,21 @@ class _GXCommon:
     #
     @classmethod
     def setData(cls, buff, dataType, value):
-        from ..GXDateTime import GXDateTime
-        from ..GXDate import GXDate
-        from ..GXTime import GXTime
         #  If value is enum get integer value.
         if isinstance(value, Enum):
             value = value.value
-        if dataType in (DataType.ARRAY, DataType.STRUCTURE) and isinstance(value, (GXByteBuffer, bytearray, bytes)):
+        if isinstance(value, (GXByteBuffer, bytearray, bytes)) and dataType in (DataType.ARRAY, DataType.STRUCTURE):
             #  If byte array is added do not add type.
             buff.set(value)
             return
 
-        buff.setUInt8(dataType.value)
-        if dataType == DataType.NONE:
-            pass
-        elif dataType == DataType.BOOLEAN:
-            if value:
-                buff.setUInt8(1)
-            else:
-                buff.setUInt8(0)
-        elif dataType == DataType.UINT8:
-            buff.setUInt8(value)
-        elif dataType in (DataType.INT8, DataType.ENUM):
-            buff.setInt8(value)
-        elif dataType in (DataType.UINT16, DataType.INT16):
-            buff.setUInt16(value)
-        elif dataType in (DataType.UINT32, DataType.INT32):
-            buff.setUInt32(value)
-        elif dataType in (DataType.UINT64, DataType.INT64):
-            buff.setUInt64(value)
-        elif dataType == DataType.FLOAT32:
-            buff.setFloat(value)
-        elif dataType == DataType.FLOAT64:
-            buff.setDouble(value)
-        elif dataType == DataType.BITSTRING:
-            cls.setBitString(buff, value, True)
-        elif dataType == DataType.STRING:
-            cls.setString(buff, value)
-        elif dataType == DataType.STRING_UTF8:
-            cls.setUtfString(buff, value)
-        elif dataType == DataType.OCTET_STRING:
-            if isinstance(value, GXDate):
-                #  Add size
-                buff.setUInt8(5)
-                cls.setDate(buff, value)
-            elif isinstance(value, GXTime):
-                #  Add size
-                buff.setUInt8(4)
-                cls.setTime(buff, value)
-            elif isinstance(value, (GXDateTime, datetime)):
-                buff.setUInt8(12)
-                cls.setDateTime(buff, value)
-            else:
-                cls.setOctetString(buff, value)
-        elif dataType in (DataType.ARRAY, DataType.STRUCTURE):
-            cls.setArray(buff, value)
-        elif dataType == DataType.BCD:
-            cls.setBcd(buff, value)
-        elif dataType == DataType.COMPACT_ARRAY:
+        writer = _GXCommon.DATA_WRITERS[dataType.value]
+        if writer is None:
             #  Compact array is not work with python because we don't know data
             #  types of each element.
             raise ValueError("Invalid data type.")
-        elif dataType == DataType.DATETIME:
-            cls.setDateTime(buff, value)
-        elif dataType == DataType.DATE:
-            cls.setDate(buff, value)
-        elif dataType == DataType.TIME:
-            cls.setTime(buff, value)
-        else:
-            raise ValueError("Invalid data type.")
+        buff.setUInt8(dataType.value)
+        writer(buff, value)
 
     #
     # Convert time to DLMS bytes.
@@ -1468,7 +1488,21 @@ class _GXCommon:
 
     @classmethod
     def setOctetString(cls, buff, value):
-        if isinstance(value, str):
+        from ..GXDateTime import GXDateTime
+        from ..GXDate import GXDate
+        from ..GXTime import GXTime
+        if isinstance(value, GXDate):
+            #  Add size
+            buff.setUInt8(5)
+            cls.setDate(buff, value)
+        elif isinstance(value, GXTime):
+            #  Add size
+            buff.setUInt8(4)
+            cls.setTime(buff, value)
+        elif isinstance(value, (GXDateTime, datetime)):
+            buff.setUInt8(12)
+            cls.setDateTime(buff, value)
+        elif isinstance(value, str):
             tmp = GXByteBuffer.hexToBytes(value)
             _GXCommon.setObjectCount(len(tmp), buff)
             buff.set(tmp)
@@ -1704,3 +1738,67 @@ class _GXCommon:
         #UTC time.
         sb += "Z"
         return sb
+
+
+#  Data types, decoders and encoders indexed by DLMS data type tag.
+#  This is faster than calling DataType constructor and comparing enums.
+_GXCommon.DATA_TYPES = [None] * 256
+for _it in DataType:
+    _GXCommon.DATA_TYPES[_it.value] = _it
+
+_GXCommon.DATA_READERS = [None] * 256
+for _type, _reader in (
+        (DataType.ARRAY, lambda buff, info, knownType, index: _GXCommon.getArray(buff, info, index)),
+        (DataType.STRUCTURE, lambda buff, info, knownType, index: _GXCommon.getArray(buff, info, index)),
+        (DataType.BOOLEAN, lambda buff, info, knownType, index: _GXCommon.getBoolean(buff, info)),
+        (DataType.BITSTRING, lambda buff, info, knownType, index: _GXCommon.getBitString(buff, info)),
+        (DataType.INT32, lambda buff, info, knownType, index: _GXCommon.getInt32(buff, info)),
+        (DataType.UINT32, lambda buff, info, knownType, index: _GXCommon.getUInt32(buff, info)),
+        (DataType.STRING, lambda buff, info, knownType, index: _GXCommon.getString(buff, info, knownType)),
+        (DataType.STRING_UTF8, lambda buff, info, knownType, index: _GXCommon.getUtfString(buff, info, knownType)),
+        (DataType.OCTET_STRING, lambda buff, info, knownType, index: _GXCommon.getOctetString(buff, info, knownType)),
+        (DataType.BCD, lambda buff, info, knownType, index: _GXCommon.getBcd(buff, info)),
+        (DataType.INT8, lambda buff, info, knownType, index: _GXCommon.getInt8(buff, info)),
+        (DataType.INT16, lambda buff, info, knownType, index: _GXCommon.getInt16(buff, info)),
+        (DataType.UINT8, lambda buff, info, knownType, index: _GXCommon.getUInt8(buff, info)),
+        (DataType.UINT16, lambda buff, info, knownType, index: _GXCommon.getUInt16(buff, info)),
+        (DataType.COMPACT_ARRAY, lambda buff, info, knownType, index: _GXCommon.getCompactArray(buff, info)),
+        (DataType.INT64, lambda buff, info, knownType, index: _GXCommon.getInt64(buff, info)),
+        (DataType.UINT64, lambda buff, info, knownType, index: _GXCommon.getUInt64(buff, info)),
+        (DataType.ENUM, lambda buff, info, knownType, index: _GXCommon.getEnum(buff, info)),
+        (DataType.FLOAT32, lambda buff, info, knownType, index: _GXCommon.getFloat(buff, info)),
+        (DataType.FLOAT64, lambda buff, info, knownType, index: _GXCommon.getDouble(buff, info)),
+        (DataType.DATETIME, lambda buff, info, knownType, index: _GXCommon.getDateTime(buff, info)),
+        (DataType.DATE, lambda buff, info, knownType, index: _GXCommon.getDate(buff, info)),
+        (DataType.TIME, lambda buff, info, knownType, index: _GXCommon.getTime(buff, info))):
+    _GXCommon.DATA_READERS[_type.value] = _reader
+
+_GXCommon.DATA_WRITERS = [None] * 256
+for _type, _writer in (
+        (DataType.NONE, lambda buff, value: None),
+        (DataType.BOOLEAN, lambda buff, value: buff.setUInt8(1 if value else 0)),
+        (DataType.UINT8, lambda buff, value: buff.setUInt8(value)),
+        (DataType.INT8, lambda buff, value: buff.setInt8(value)),
+        (DataType.ENUM, lambda buff, value: buff.setInt8(value)),
+        (DataType.UINT16, lambda buff, value: buff.setUInt16(value)),
+        (DataType.INT16, lambda buff, value: buff.setUInt16(value)),
+        (DataType.UINT32, lambda buff, value: buff.setUInt32(value)),
+        (DataType.INT32, lambda buff, value: buff.setUInt32(value)),
+        (DataType.UINT64, lambda buff, value: buff.setUInt64(value)),
+        (DataType.INT64, lambda buff, value: buff.setUInt64(value)),
+        (DataType.FLOAT32, lambda buff, value: buff.setFloat(value)),
+        (DataType.FLOAT64, lambda buff, value: buff.setDouble(value)),
+        (DataType.BITSTRING, lambda buff, value: _GXCommon.setBitString(buff, value, True)),
+        (DataType.STRING, _GXCommon.setString),
+        (DataType.STRING_UTF8, _GXCommon.setUtfString),
+        (DataType.OCTET_STRING, _GXCommon.setOctetString),
+        (DataType.ARRAY, _GXCommon.setArray),
+        (DataType.STRUCTURE, _GXCommon.setArray),
+        (DataType.BCD, _GXCommon.setBcd),
+        (DataType.DATETIME, _GXCommon.setDateTime),
+        (DataType.DATE, _GXCommon.setDate),
+        (DataType.TIME, _GXCommon.setTime)):
+    _GXCommon.DATA_WRITERS[_type.value] = _writer
+
+#  Loop variables are not part of the module.
+del _it, _type, _reader, _writer
@@ -46,6 +46,8 @@ class _GXDataInfo:
         # Is data parsed to the end.
         self.complete = True
         self.xml = None
+        # Are compact arrays returned as GXCompactArray columns.
+        self.columnar = False
 
     def clear(self):
         self.index = 0
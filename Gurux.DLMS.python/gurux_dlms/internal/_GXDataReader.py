@@ -0,0 +1,150 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+from ..enums import DataType
+from ._GXCommon import _GXCommon
+from ._GXDataInfo import _GXDataInfo
+
+class _GXDataReader:
+    """
+    Resumable DLMS data parser.
+
+    Open arrays and structures are kept in a stack, so when the value is
+    split between several blocks parsing continues where the last block
+    ended.  Each byte is parsed only once and completed rows are appended
+    to the same list.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        # Open arrays and structures. Each item is (expected count, values).
+        self.stack = []
+        # Parsed value.  For array or structure this is the root list and it
+        # holds the rows that are parsed so far.
+        self.value = None
+        # Data type of the root value.
+        self.type_ = DataType.NONE
+        # Expected count of elements in the root array.
+        self.count = 0
+        # Is value parsed to the end.
+        self.complete = False
+        # Are compact arrays returned as GXCompactArray columns.
+        self.columnar = False
+
+    #
+    # Parse data from the buffer.
+    #
+    # buff
+    # Received data.  Position is left to the point where parsing must
+    # continue when more data is received.
+    # Returns true if value is parsed to the end.
+    #
+    def read(self, buff):
+        stack = self.stack
+        readers = _GXCommon.DATA_READERS
+        size = len(buff)
+        while not self.complete:
+            start = buff.position
+            if start == size:
+                return False
+            tag = buff.getUInt8()
+            #  Array or structure.
+            if tag in (1, 2):
+                cnt = self.__getObjectCount(buff)
+                if cnt == -1:
+                    buff.position = start
+                    return False
+                value = list()
+                if not stack and self.value is None:
+                    self.type_ = _GXCommon.DATA_TYPES[tag]
+                    self.count = cnt
+                    self.value = value
+                if cnt != 0:
+                    stack.append((cnt, value))
+                    continue
+            elif tag == 0:
+                value = None
+            else:
+                reader = readers[tag]
+                if reader is None:
+                    raise ValueError("Invalid data type.")
+                if start + 1 == size:
+                    buff.position = start
+                    return False
+                info = _GXDataInfo()
+                info.type_ = _GXCommon.DATA_TYPES[tag]
+                info.columnar = self.columnar
+                value = reader(buff, info, False, start)
+                if not info.complete:
+                    buff.position = start
+                    return False
+            #  Add value to the parent and close arrays and structures that
+            #  are parsed to the end.
+            while stack:
+                cnt, items = stack[-1]
+                items.append(value)
+                if len(items) != cnt:
+                    break
+                value = stack.pop()[1]
+            else:
+                if self.value is None:
+                    self.type_ = _GXCommon.DATA_TYPES[tag]
+                    self.value = value
+                self.complete = True
+        return True
+
+    def popRows(self):
+        """
+        Remove and return rows of the root array that are parsed to the
+        end.  Rows that are split between blocks are kept until they are
+        completed.
+        """
+        if self.type_ != DataType.ARRAY or not self.value:
+            return list()
+        rows = list(self.value)
+        del self.value[:]
+        if self.stack:
+            cnt, items = self.stack[0]
+            self.stack[0] = (cnt - len(rows), items)
+        return rows
+
+    @classmethod
+    def __getObjectCount(cls, buff):
+        """Get object count or -1 if all bytes are not received yet."""
+        available = len(buff) - buff.position
+        if available == 0:
+            return -1
+        cnt = buff.getUInt8(buff.position)
+        if cnt > 0x80 and available < 1 + (cnt & 0x7F):
+            return -1
+        return _GXCommon.getObjectCount(buff)
@@ -31,6 +31,7 @@
 #  This code is licensed under the GNU General Public License v2.
 #  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
 # ---------------------------------------------------------------------------
+import copy
 from .GXDLMSObject import GXDLMSObject
 from .IGXDLMSBase import IGXDLMSBase
 from ..enums import ErrorCode
@@ -60,6 +61,11 @@ class GXDLMSAssociationLogicalName(GXDLMSObject, IGXDLMSBase):
     #
     def __init__(self, ln="0.0.40.0.0.255"):
         super(GXDLMSAssociationLogicalName, self).__init__(ObjectType.ASSOCIATION_LOGICAL_NAME, ln)
+        # Server session that keeps the association status, application
+        # context name and authentication mechanism name.  None if they are
+        # kept in this object.  GXDLMSServer sets this while it handles the
+        # requests of the session.
+        self.session = None
         self.objectList = GXDLMSObjectCollection(self)
         self.applicationContextName = GXApplicationContextName()
         self.xDLMSContextInfo = GXxDLMSContextType()
@@ -74,6 +80,52 @@ class GXDLMSAssociationLogicalName(GXDLMSObject, IGXDLMSBase):
         self.userList = list()
         self.currentUser = None
 
+    def __getApplicationContextName(self):
+        if self.session is not None:
+            if self.session.applicationContextName is None:
+                self.session.applicationContextName = copy.copy(self.__applicationContextName)
+            return self.session.applicationContextName
+        return self.__applicationContextName
+
+    def __setApplicationContextName(self, value):
+        if self.session is not None:
+            self.session.applicationContextName = value
+        else:
+            self.__applicationContextName = value
+
+    # Application context name.
+    applicationContextName = property(__getApplicationContextName, __setApplicationContextName)
+
+    def __getAuthenticationMechanismName(self):
+        if self.session is not None:
+            if self.session.authenticationMechanismName is None:
+                self.session.authenticationMechanismName = copy.copy(self.__authenticationMechanismName)
+            return self.session.authenticationMechanismName
+        return self.__authenticationMechanismName
+
+    def __setAuthenticationMechanismName(self, value):
+        if self.session is not None:
+            self.session.authenticationMechanismName = value
+        else:
+            self.__authenticationMechanismName = value
+
+    # Authentication mechanism name.
+    authenticationMechanismName = property(__getAuthenticationMechanismName, __setAuthenticationMechanismName)
+
+    def __getAssociationStatus(self):
+        if self.session is not None:
+            return self.session.associationStatus
+        return self.__associationStatus
+
+    def __setAssociationStatus(self, value):
+        if self.session is not None:
+            self.session.associationStatus = value
+        else:
+            self.__associationStatus = value
+
+    # Association status.
+    associationStatus = property(__getAssociationStatus, __setAssociationStatus)
+
     #
     # Updates secret.
     #
@@ -256,7 +308,7 @@ class GXDLMSAssociationLogicalName(GXDLMSObject, IGXDLMSBase):
                 self.__getAccessRights(it, e.server, data)
                 settings.index = settings.index + 1
                 if settings.isServer:
-                    if not e.isSkipMaxPduSize and len(data) >= settings.maxPduSize:
+                    if not e.skipMaxPduSize and len(data) >= settings.maxPduSize:
                         break
         return data
 
@@ -43,6 +43,9 @@ class GXDLMSObject:
     # Constructor,
     #
     def __init__(self, ot, ln=None, sn=0):
+        # Collection that owns the object.  It's notified when the name
+        # changes.
+        self.parent = None
         # DLMS version number.
         self.version = 0
         self.objectType = ot
@@ -59,6 +62,38 @@ class GXDLMSObject:
         self.logicalName = ln
         self.readTimes = dict()
 
+    #
+    # Logical Name of COSEM object.
+    #
+    @property
+    def logicalName(self):
+        return self.__logicalName
+
+    @logicalName.setter
+    def logicalName(self, value):
+        if self.parent is not None and value != self.__logicalName:
+            ln = self.__logicalName
+            self.__logicalName = value
+            self.parent.onNameChanged(self, ln, self.shortName)
+        else:
+            self.__logicalName = value
+
+    #
+    # Short Name of COSEM object.
+    #
+    @property
+    def shortName(self):
+        return self.__shortName
+
+    @shortName.setter
+    def shortName(self, value):
+        if self.parent is not None and value != self.__shortName:
+            sn = self.__shortName
+            self.__shortName = value
+            self.parent.onNameChanged(self, self.logicalName, sn)
+        else:
+            self.__shortName = value
+
     #
     # Is attribute read.  This can be used with static attributes to
     #      make meter
@@ -80,7 +115,7 @@ class GXDLMSObject:
     # Is attribute read only.
     #
     def getLastReadTime(self, attributeIndex):
-        for k, v in self.readTimes:
+        for k, v in self.readTimes.items():
             if k == attributeIndex:
                 return v
         return None
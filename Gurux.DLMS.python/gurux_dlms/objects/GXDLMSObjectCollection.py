@@ -51,12 +51,216 @@ class GXDLMSObjectCollection(list):
     def __init__(self, forParent=None):
         super(GXDLMSObjectCollection, self).__init__()
         self.parent = forParent
+        # Objects by (object type, logical name) and by short name.  Indexes
+        # are built when objects are searched first time.
+        self.__lnIndex = None
+        self.__snIndex = None
+        # Are there several objects with the same logical or short name.
+        self.__lnDuplicates = False
+        self.__snDuplicates = False
+        # Are there objects that are owned by other collection.  Name
+        # changes of those objects are not notified to this collection, so
+        # objects are searched one by one.
+        self.__shared = False
+
+    def __own(self, item):
+        """
+        Collection where the object is added first owns it.
+        """
+        if item.parent is None:
+            item.parent = self
+        elif item.parent is not self and not self.__shared:
+            self.__shared = True
+            self.__clearIndex()
+
+    def __release(self, item):
+        if item.parent is self and not any(it is item for it in self):
+            item.parent = None
 
     def append(self, item):
         if not isinstance(item, GXDLMSObject):
             raise TypeError('item is not of type GXDLMSObject')
         super(GXDLMSObjectCollection, self).append(item)
-        item.parent = self
+        self.__own(item)
+        if self.__lnIndex is not None:
+            self.__addIndex(item)
+
+    @classmethod
+    def __getName(cls, ln):
+        if ln:
+            return ln.strip()
+        return ln
+
+    @classmethod
+    def __getKeys(cls, item, ln):
+        ln = cls.__getName(ln)
+        return [(item.objectType, ln), (ObjectType.NONE, ln)]
+
+    def __addIndex(self, item, last=True):
+        """
+        Add object to the indexes.  First object in the collection is
+        found if there are several objects with the same name.
+
+        last: Is object the last object in the collection.
+        """
+        for key in self.__getKeys(item, item.logicalName):
+            if self.__addKey(self.__lnIndex, key, item, last):
+                self.__lnDuplicates = True
+        if self.__addKey(self.__snIndex, item.shortName, item, last):
+            self.__snDuplicates = True
+
+    def __addKey(self, index, key, item, last):
+        """
+        Add object to the index.  True is returned if there is another
+        object with the same key.
+        """
+        it = index.get(key)
+        if it is None:
+            index[key] = item
+            return False
+        if it is item:
+            return False
+        if not last:
+            for it2 in self:
+                if it2 is item:
+                    index[key] = item
+                    break
+                if it2 is it:
+                    break
+        return True
+
+    def __removeIndex(self, item, ln, sn):
+        """
+        Remove object from the indexes.  If there is another object with
+        the same name, it's added to the index.
+
+        ln: Logical name of the object in the index.
+        sn: Short name of the object in the index.
+        """
+        for key in self.__getKeys(item, ln):
+            if self.__lnIndex.get(key) is item:
+                del self.__lnIndex[key]
+                if not self.__lnDuplicates:
+                    continue
+                for it in self:
+                    if it is not item and key[0] in (ObjectType.NONE, it.objectType) and \
+                            self.__getName(it.logicalName) == key[1]:
+                        self.__lnIndex[key] = it
+                        break
+        if self.__snIndex.get(sn) is item:
+            del self.__snIndex[sn]
+            if not self.__snDuplicates:
+                return
+            for it in self:
+                if it is not item and it.shortName == sn:
+                    self.__snIndex[sn] = it
+                    break
+
+    def __updateIndex(self):
+        if self.__lnIndex is None:
+            self.__lnIndex = dict()
+            self.__snIndex = dict()
+            for it in self:
+                self.__addIndex(it)
+
+    def __clearIndex(self):
+        self.__lnIndex = None
+        self.__snIndex = None
+        self.__lnDuplicates = False
+        self.__snDuplicates = False
+
+    def onNameChanged(self, item, ln, sn):
+        """
+        Called by the object when its logical or short name changes.
+
+        item: COSEM object.
+        ln: Previous logical name.
+        sn: Previous short name.
+        """
+        if self.__lnIndex is not None:
+            self.__removeIndex(item, ln, sn)
+            self.__addIndex(item, False)
+
+    def insert(self, index, item):
+        super(GXDLMSObjectCollection, self).insert(index, item)
+        self.__own(item)
+        if self.__lnIndex is not None:
+            self.__addIndex(item, False)
+
+    def extend(self, items):
+        items = list(items)
+        super(GXDLMSObjectCollection, self).extend(items)
+        for it in items:
+            self.__own(it)
+            if self.__lnIndex is not None:
+                self.__addIndex(it)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def remove(self, item):
+        super(GXDLMSObjectCollection, self).remove(item)
+        self.__removed([item])
+
+    def pop(self, index=-1):
+        item = super(GXDLMSObjectCollection, self).pop(index)
+        self.__removed([item])
+        return item
+
+    def __removed(self, items):
+        """
+        Update the indexes and the owner of the removed objects.
+        """
+        for it in items:
+            if self.__lnIndex is not None:
+                self.__removeIndex(it, it.logicalName, it.shortName)
+                if any(it2 is it for it2 in self):
+                    self.__addIndex(it, False)
+            self.__release(it)
+
+    def clear(self):
+        items = list(self)
+        super(GXDLMSObjectCollection, self).clear()
+        self.__clearIndex()
+        self.__shared = False
+        for it in items:
+            self.__release(it)
+
+    def __setitem__(self, index, item):
+        if isinstance(index, slice):
+            items = self[index]
+            super(GXDLMSObjectCollection, self).__setitem__(index, item)
+            self.__clearIndex()
+            for it in self[index]:
+                self.__own(it)
+            for it in items:
+                self.__release(it)
+        else:
+            old = self[index]
+            super(GXDLMSObjectCollection, self).__setitem__(index, item)
+            self.__own(item)
+            self.__removed([old])
+            if self.__lnIndex is not None:
+                self.__addIndex(item, False)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            items = self[index]
+        else:
+            items = [self[index]]
+        super(GXDLMSObjectCollection, self).__delitem__(index)
+        if len(items) > 1:
+            self.__clearIndex()
+        self.__removed(items)
+
+    def sort(self, *args, **kwargs):
+        super(GXDLMSObjectCollection, self).sort(*args, **kwargs)
+        self.__clearIndex()
+
+    def reverse(self):
+        super(GXDLMSObjectCollection, self).reverse()
+        self.__clearIndex()
 
     def getObjects(self, type_):
         if isinstance(type_, ObjectType):
@@ -77,16 +281,22 @@ class GXDLMSObjectCollection(list):
         return items
 
     def findByLN(self, type_, ln):
-        for it in self:
-            if type_ in (ObjectType.NONE, it.objectType) and it.logicalName.strip() == ln:
-                return it
-        return None
+        if self.__shared:
+            for it in self:
+                if type_ in (ObjectType.NONE, it.objectType) and it.logicalName.strip() == ln:
+                    return it
+            return None
+        self.__updateIndex()
+        return self.__lnIndex.get((type_, ln))
 
     def findBySN(self, sn):
-        for it in self:
-            if it.shortName == sn:
-                return it
-        return None
+        if self.__shared:
+            for it in self:
+                if it.shortName == sn:
+                    return it
+            return None
+        self.__updateIndex()
+        return self.__snIndex.get(sn)
 
     def __str__(self):
         str_ = '['
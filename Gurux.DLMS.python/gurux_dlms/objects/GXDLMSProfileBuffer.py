@@ -0,0 +1,323 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import datetime
+from collections.abc import MutableSequence
+from ..GXDateTime import GXDateTime
+
+class GXDLMSProfileBuffer(MutableSequence):
+    """
+    Capture rows of the profile generic.
+
+    Rows are kept in a ring buffer, so adding a row and removing the
+    oldest row don't move the other rows.  When the capacity is reached,
+    the oldest row is replaced.  Capture time of the first column is kept
+    for each row, so range of the rows is found with binary search.
+    Buffer is a mutable sequence, so it can be used like a list.
+    """
+
+    #
+    # Constructor.
+    #
+    # capacity: Maximum count of the rows.  Zero if count is not limited.
+    #
+    def __init__(self, capacity=0):
+        self.__rows = list()
+        # Capture times of the rows as POSIX time.
+        self.__times = list()
+        # Position of the first row.
+        self.__start = 0
+        self.__count = 0
+        self.__capacity = capacity
+        # Are capture times in ascending order.
+        self.__sorted = True
+
+    @classmethod
+    def getTime(cls, value):
+        """
+        Returns time as POSIX time.  Time without time zone is local time.
+        None is returned if value is not a time.
+
+        value: Time as GXDateTime or datetime.
+        """
+        if isinstance(value, GXDateTime):
+            value = value.value
+        if isinstance(value, datetime.datetime):
+            try:
+                return value.timestamp()
+            except (OverflowError, OSError, ValueError):
+                return None
+        return None
+
+    def __getRowTime(self, row):
+        if row:
+            return self.getTime(row[0])
+        return None
+
+    def __getCapacity(self):
+        return self.__capacity
+
+    def __setCapacity(self, value):
+        if value != self.__capacity:
+            self.__normalize()
+            if value and self.__count > value:
+                #  Oldest rows are removed.
+                del self.__rows[:self.__count - value]
+                del self.__times[:self.__count - value]
+                self.__count = value
+            self.__capacity = value
+
+    # Maximum count of the rows.  Zero if count is not limited.
+    capacity = property(__getCapacity, __setCapacity)
+
+    def isSorted(self):
+        """
+        Returns True if the rows are in ascending order by capture time.
+        Range of the unsorted rows is searched row by row.
+        """
+        return self.__sorted
+
+    def __getPosition(self, index):
+        pos = self.__start + index
+        if pos >= len(self.__rows):
+            pos -= len(self.__rows)
+        return pos
+
+    def __getIndex(self, index):
+        if index < 0:
+            index += self.__count
+        if index < 0 or index >= self.__count:
+            raise IndexError("Profile buffer index out of range.")
+        return self.__getPosition(index)
+
+    def __normalize(self):
+        times = [self.__times[self.__getPosition(pos)] for pos in range(self.__count)]
+        self.__rows = list(self)
+        self.__times = times
+        self.__start = 0
+
+    def append(self, row):
+        """
+        Add row to the end of the buffer.  If the buffer is full, the
+        oldest row is removed.
+        """
+        time = self.__getRowTime(row)
+        if self.__sorted:
+            if time is None:
+                self.__sorted = False
+            elif self.__count and time < self.__times[self.__getPosition(self.__count - 1)]:
+                self.__sorted = False
+        if self.__count < len(self.__rows):
+            pos = self.__getPosition(self.__count)
+            self.__count += 1
+        elif self.__capacity == 0 or self.__count < self.__capacity:
+            if self.__start:
+                self.__normalize()
+            self.__rows.append(row)
+            self.__times.append(time)
+            self.__count += 1
+            return
+        else:
+            #  Buffer is full.  Oldest row is replaced.
+            pos = self.__start
+            self.__start = self.__getPosition(1)
+        self.__rows[pos] = row
+        self.__times[pos] = time
+
+    def extend(self, rows):
+        """
+        Add rows to the end of the buffer.
+        """
+        if rows is self:
+            rows = list(rows)
+        for it in rows:
+            self.append(it)
+
+    def pop(self, index=-1):
+        """
+        Remove row and return it.  Removing the first or the last row
+        doesn't move the other rows.
+        """
+        pos = self.__getIndex(index)
+        if index < 0:
+            index += self.__count
+        row = self.__rows[pos]
+        if index == 0:
+            self.__rows[pos] = None
+            self.__start = self.__getPosition(1)
+        elif index == self.__count - 1:
+            self.__rows[pos] = None
+        else:
+            self.__normalize()
+            self.__rows.pop(index)
+            self.__times.pop(index)
+        self.__count -= 1
+        if self.__count == 0:
+            self.clear()
+        return row
+
+    def insert(self, index, row):
+        """
+        Insert row before index.  Adding a row to the end of the buffer
+        doesn't move the other rows.
+        """
+        if index >= self.__count:
+            self.append(row)
+        else:
+            rows = list(self)
+            rows.insert(index, row)
+            self.__reset(rows)
+
+    def sort(self, key=None, reverse=False):
+        """
+        Sort rows in place.
+        """
+        self.__reset(sorted(self, key=key, reverse=reverse))
+
+    def copy(self):
+        """
+        Returns rows as a list.
+        """
+        return list(self)
+
+    def __reset(self, rows):
+        """
+        Replace all rows.  If there are more rows than the capacity, the
+        oldest rows are removed.
+        """
+        self.clear()
+        self.extend(rows)
+
+    def clear(self):
+        """
+        Remove all rows.
+        """
+        self.__rows = list()
+        self.__times = list()
+        self.__start = 0
+        self.__count = 0
+        self.__sorted = True
+
+    def getRowsByRange(self, start, end):
+        """
+        Returns rows that are captured between start and end.
+
+        start: Start time as GXDateTime or datetime.
+        end: End time as GXDateTime or datetime.
+        """
+        start = self.getTime(start)
+        end = self.getTime(end)
+        if start is None or end is None:
+            raise ValueError("Invalid range.")
+        if not self.__sorted:
+            return [self.__rows[self.__getPosition(pos)] for pos in range(self.__count) \
+                    if self.__times[self.__getPosition(pos)] is not None and \
+                    start <= self.__times[self.__getPosition(pos)] <= end]
+        return self[self.__search(start, False):self.__search(end, True)]
+
+    def __search(self, time, after):
+        """
+        Returns index of the first row that is captured at the time or
+        after it.  If after is True, rows that are captured at the time
+        are skipped.
+        """
+        low = 0
+        high = self.__count
+        while low < high:
+            middle = (low + high) // 2
+            value = self.__times[self.__getPosition(middle)]
+            if value < time or (after and value == time):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __len__(self):
+        return self.__count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.__rows[self.__getPosition(pos)] for pos in range(*index.indices(self.__count))]
+        return self.__rows[self.__getIndex(index)]
+
+    def __setitem__(self, index, row):
+        if isinstance(index, slice):
+            rows = list(self)
+            rows[index] = row
+            self.__reset(rows)
+            return
+        pos = self.__getIndex(index)
+        self.__rows[pos] = row
+        time = self.__getRowTime(row)
+        self.__times[pos] = time
+        if self.__sorted:
+            if index < 0:
+                index += self.__count
+            if time is None:
+                self.__sorted = False
+            elif index != 0 and time < self.__times[self.__getPosition(index - 1)]:
+                self.__sorted = False
+            elif index != self.__count - 1 and time > self.__times[self.__getPosition(index + 1)]:
+                self.__sorted = False
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            rows = list(self)
+            del rows[index]
+            self.__reset(rows)
+        else:
+            self.pop(index)
+
+    def __iter__(self):
+        for pos in range(self.__count):
+            yield self.__rows[self.__getPosition(pos)]
+
+    def __eq__(self, other):
+        if isinstance(other, (GXDLMSProfileBuffer, list)):
+            return list(self) == list(other)
+        return False
+
+    __hash__ = None
+
+    def __add__(self, other):
+        if isinstance(other, (GXDLMSProfileBuffer, list)):
+            return list(self) + list(other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, list):
+            return other + list(self)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
@@ -41,6 +41,7 @@ from ..GXDateTime import GXDateTime
 from ..enums import ObjectType, DataType
 from .enums import SortMethod
 from .GXDLMSCaptureObject import GXDLMSCaptureObject
+from .GXDLMSProfileBuffer import GXDLMSProfileBuffer
 from .GXDLMSDemandRegister import GXDLMSDemandRegister
 from .GXDLMSRegister import GXDLMSRegister
 from ..ValueEventArgs import ValueEventArgs
@@ -63,7 +64,7 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
     def __init__(self, ln=None, sn=0):
         super(GXDLMSProfileGeneric, self).__init__(ObjectType.PROFILE_GENERIC, ln, sn)
         self.version = 1
-        self.buffer = list()
+        self.__buffer = GXDLMSProfileBuffer()
         self.captureObjects = list()
         self.capturePeriod = 0
         self.sortMethod = SortMethod.LIFO
@@ -73,6 +74,18 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
         self.sortObjectAttributeIndex = 0
         self.sortObjectDataIndex = 0
 
+    def __getBuffer(self):
+        return self.__buffer
+
+    def __setBuffer(self, value):
+        if value is not self.__buffer:
+            self.__buffer.clear()
+            if value:
+                self.__buffer.extend(value)
+
+    # Captured rows.
+    buffer = property(__getBuffer, __setBuffer)
+
     #
     # Clears the buffer.
     #
@@ -200,22 +213,20 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
                 _GXCommon.setObjectCount(e.rowEndIndex - e.rowBeginIndex, data)
             else:
                 _GXCommon.setObjectCount(len(table), data)
-        types = list(len(self.captureObjects))
-        pos = 0
+        types = list()
         for k, v in self.captureObjects:
-            types[pos] = k.getDataType(v.attributeIndex)
-            pos += 1
+            types.append(k.getDataType(v.attributeIndex))
         tp = None
         for row in table:
             items = row
             data.setUInt8(DataType.STRUCTURE.value)
             if not columns:
-                _GXCommon.setObjectCount(0, data)
+                _GXCommon.setObjectCount(len(self.captureObjects), data)
             else:
                 _GXCommon.setObjectCount(len(columns), data)
             pos = 0
             for value in items:
-                if columns is None or self.captureObjects[pos] in columns:
+                if not columns or self.captureObjects[pos] in columns:
                     tp = types[pos]
                     if tp == DataType.NONE:
                         tp = _GXCommon.getDLMSDataType(value)
@@ -223,8 +234,11 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
                     _GXCommon.setData(data, tp, value)
                 pos += 1
             settings.setIndex(settings.index + 1)
-        if e.getRowEndIndex() != 0:
-            e.setRowBeginIndex(len(table))
+        if e.rowEndIndex != 0:
+            e.rowBeginIndex += len(table)
+        else:
+            #  All rows are added at once.
+            settings.setIndex(0)
         return data.array()
 
     def getColumns(self, cols):
@@ -241,16 +255,12 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
                         columns.append((k, v))
                         break
         else:
-            colums = list()
-            colums.append(self.captureObjects)
-            return colums
+            columns = list(self.captureObjects)
         return columns
 
     def getSelectedColumns(self, selector, parameters):
         if selector == 0:
-            colums = list()
-            colums.append(self.captureObjects)
-            ret = colums
+            ret = list(self.captureObjects)
         elif selector == 1:
             ret = self.getColumns((parameters)[3])
         elif selector == 2:
@@ -265,21 +275,48 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
                 colCount = len(self.captureObjects)
             if colStart != 1 or colCount != 0:
                 return self.captureObjects[colStart - 1: colStart + colCount - 1]
-            colums = list()
-            colums.append(self.captureObjects)
-            ret = colums
+            ret = list(self.captureObjects)
         else:
             raise ValueError("Invalid selector.")
         return ret
 
-    #pylint: disable=chained-comparison
     def __getProfileGenericData(self, settings, e):
+        if e.rows is not None:
+            return self.__getRows(settings, e)
         columns = None
-        if e.selector == 0 or e.parameters is None or e.getRowEndIndex() != 0:
+        if e.rowEndIndex != 0:
             return self.getData(settings, e, self.buffer, columns)
+        if e.selector == 0 or e.parameters is None:
+            table = self.buffer
+        else:
+            columns = self.getSelectedColumns(e.selector, e.parameters)
+            table = self.__getSelectedRows(e)
+        if e.rowToPdu != 0 and len(table) > e.rowToPdu:
+            #  Rows are encoded when they are sent.
+            e.rows = table[:]
+            e.rowBeginIndex = 0
+            e.rowEndIndex = len(e.rows)
+            settings.setCount(e.rowEndIndex)
+            return self.__getRows(settings, e)
+        return self.getData(settings, e, table, columns)
+
+    def __getRows(self, settings, e):
+        """
+        Encode selected rows until the next PDU is full.
+        """
+        columns = None
+        if e.selector != 0 and e.parameters is not None:
+            columns = self.getSelectedColumns(e.selector, e.parameters)
+        data = bytearray()
+        while e.rowBeginIndex != e.rowEndIndex and len(data) < settings.maxPduSize:
+            end = min(e.rowBeginIndex + e.rowToPdu, e.rowEndIndex)
+            data += self.getData(settings, e, e.rows[e.rowBeginIndex:end], columns)
+        if e.rowBeginIndex == e.rowEndIndex:
+            e.rows = None
+        return data
+
+    def __getSelectedRows(self, e):
         arr = e.parameters
-        columns = self.getSelectedColumns(e.selector, arr)
-        table = list()
         if e.selector == 1:
             info = _GXDataInfo()
             info.type_ = DataType.DATETIME
@@ -287,33 +324,19 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
             info.clear()
             info.type_ = DataType.DATETIME
             end = _GXCommon.getData(GXByteBuffer(arr[2]), info).value
-            for row in self.buffer:
-                tm = None
-                tmp = (row)[0]
-                if isinstance(tmp, GXDateTime):
-                    tm = tmp.value
-                else:
-                    tm = tmp
-                if tm >= start >= 0 and tm <= end:
-                    table.append(row)
+            table = self.buffer.getRowsByRange(start, end)
         elif e.selector == 2:
+            #  Entries are from the first entry to the last entry.
             start = arr[0]
             if start == 0:
                 start = 1
-            count = arr[1]
-            if count == 0:
-                count = len(self.buffer)
-            if start + count > len(self.buffer):
-                count = len(self.buffer)
-            pos = 0
-            while pos < count:
-                if pos + start - 1 == len(self.buffer):
-                    break
-                table.append(self.buffer[start + pos - 1])
-                pos += 1
+            end = arr[1]
+            if end == 0:
+                end = len(self.buffer)
+            table = self.buffer[start - 1:end]
         else:
             raise ValueError("Invalid selector.")
-        return self.getData(settings, e, table, columns)
+        return table
 
     def getDataType(self, index):
         if index == 1:
@@ -445,21 +468,36 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
 
     #pylint: disable=broad-except,too-many-nested-blocks,consider-using-enumerate
     def setBuffer(self, e):
-        cols = e.parameters
-        colIndex = 0
+        lastRow = None
+        if self.buffer:
+            lastRow = self.buffer[len(self.buffer) - 1]
+        rows = self.convertRows(e.value, e.parameters, lastRow)
+        if rows:
+            self.buffer.extend(rows)
+            self.entriesInUse = len(self.buffer)
+
+    def convertRows(self, rows, columns=None, lastRow=None):
+        """
+        Convert received rows to the data types of the capture objects
+        and scale register values.  Rows are converted in place and they
+        are not added to the buffer.
+
+        rows: Received rows.
+        columns: Read columns.  If None, all capture objects are read.
+        lastRow: Previous converted row.  It's used to solve the time of
+            the rows that don't have it.
+        """
+        cols = columns
         if cols is None:
             cols = self.captureObjects
         if cols is None or not cols:
             raise ValueError("Read capture objects first.")
-        if e.value:
-            colIndex += 1
+        if rows:
             lastDate = None
             types = list()
-            colIndex = 0
             for k, v in cols:
                 types.append(k.getUIDataType(v.attributeIndex))
-            for it in e.value:
-                row = it
+            for row in rows:
                 if len(row) != len(cols):
                     raise ValueError("Number of columns do not match.")
                 for colIndex in range(len(row)):
@@ -471,8 +509,8 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
                             lastDate = data.value
                         row[colIndex] = data
                     elif type_ == DataType.DATETIME and data is None and self.capturePeriod != 0:
-                        if not lastDate and self.buffer:
-                            lastDate = self.buffer[len(self.buffer) - 1][colIndex].value
+                        if not lastDate and lastRow and isinstance(lastRow[colIndex], GXDateTime):
+                            lastDate = lastRow[colIndex].value
                         if lastDate:
                             lastDate -= timedelta(seconds=self.capturePeriod)
                             row[colIndex] = GXDateTime(lastDate)
@@ -493,9 +531,8 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
                                 row[colIndex] = data * scaler_
                             except Exception:
                                 print("Scalar failed for: " + item[0].logicalName)
-                    colIndex += 1
-                self.buffer.append(row)
-            self.entriesInUse = len(self.buffer)
+                lastRow = row
+        return rows
 
     def __reset(self):
         self.buffer.clear()
@@ -503,21 +540,25 @@ class GXDLMSProfileGeneric(GXDLMSObject, IGXDLMSBase):
 
     def __capture(self, server):
         srv = server
-        values = list(len(self.captureObjects))
+        values = [None] * len(self.captureObjects)
         pos = 0
         args = [ValueEventArgs(srv, self, 2)]
         srv.onPreGet(args)
         if not args[0].handled:
             for k, v in self.captureObjects:
-                values[pos] = k.values()[v.attributeIndex - 1]
+                values[pos] = k.getValues()[v.attributeIndex - 1]
                 pos += 1
-            if self.profileEntries:
-                self.entriesInUse -= 1
-                self.buffer.remove(0)
-            self.buffer.append(values)
-            self.entriesInUse += 1
+            self.buffer.capacity = self.profileEntries
+            if self.profileEntries and len(self.buffer) == self.profileEntries and self.sortMethod == SortMethod.LIFO:
+                #  Last row is replaced when LIFO buffer is full.
+                self.buffer[-1] = values
+            else:
+                self.buffer.append(values)
+            self.entriesInUse = len(self.buffer)
         srv.onPostGet(args)
-        srv.onAction(args)
+        #  onAction is not part of GXDLMSServer.  It's called if server implements it.
+        if hasattr(srv, "onAction"):
+            srv.onAction(args)
         srv.onPostAction(args)
 
     def load(self, reader):
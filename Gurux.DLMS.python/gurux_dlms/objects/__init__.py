@@ -54,6 +54,7 @@ from .GXDLMSAssociationShortName import *
 from .GXDLMSAutoAnswer import *
 from .GXDLMSAutoConnect import *
 from .GXDLMSCaptureObject import *
+from .GXDLMSProfileBuffer import *
 from .GXDLMSCertificateInfo import *
 from .GXDLMSCharge import *
 from .GXDLMSClock import *
@@ -13,6 +13,10 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/gurux/gurux.dlms.python",
     packages=setuptools.find_packages(),
+    extras_require={
+        "cryptography": ["cryptography"],
+        "numpy": ["numpy"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: GNU General Public License v2 (GPLv2)",
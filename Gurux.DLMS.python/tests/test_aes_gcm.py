@@ -0,0 +1,160 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import threading
+import unittest
+from gurux_dlms.GXByteBuffer import GXByteBuffer
+from gurux_dlms.GXAesGcm import GXAesGcm, GXAesGcmCryptography, AESGCM
+from gurux_dlms.GXDLMSChippering import GXDLMSChippering
+from gurux_dlms.GXDLMSChipperingStream import GXDLMSChipperingStream
+from gurux_dlms.secure import GXDLMSSecureClient
+from gurux_dlms.AesGcmParameter import AesGcmParameter
+from gurux_dlms.CountType import CountType
+from gurux_dlms.enums import Security
+
+#
+# AES-GCM test vectors from DLMS UA Green Book.
+#
+# Get-request is ciphered with invocation counter 0x01234567.
+#
+SYSTEM_TITLE = "4D4D4D0000BC614E"
+BLOCK_CIPHER_KEY = "000102030405060708090A0B0C0D0E0F"
+AUTHENTICATION_KEY = "D0D1D2D3D4D5D6D7D8D9DADBDCDDDEDF"
+INVOCATION_COUNTER = 0x01234567
+PLAIN_TEXT = "C0010000080000010000FF0200"
+#  Security, cipher text and tag.
+VECTORS = [(Security.AUTHENTICATION, PLAIN_TEXT, "06725D910F9221D263877516"),
+           (Security.ENCRYPTION, "411312FF935A47566827C467BC", None),
+           (Security.AUTHENTICATION_ENCRYPTION, "411312FF935A47566827C467BC", "7D825C3BE4A77C3FCC056B6B")]
+
+class _AesGcmTest:
+    """
+    Green Book tests that are run with each AES-GCM implementation.
+    """
+    #  Tested AES-GCM implementation.
+    backend = None
+
+    def setUp(self):
+        GXDLMSChippering.setBackend(self.backend)
+
+    def tearDown(self):
+        GXDLMSChippering.setBackend(None)
+
+    @classmethod
+    def getParameter(cls, security, type_):
+        p = AesGcmParameter(0)
+        p.systemTitle = GXByteBuffer.hexToBytes(SYSTEM_TITLE)
+        p.blockCipherKey = GXByteBuffer.hexToBytes(BLOCK_CIPHER_KEY)
+        p.authenticationKey = GXByteBuffer.hexToBytes(AUTHENTICATION_KEY)
+        p.invocationCounter = INVOCATION_COUNTER
+        p.security = security
+        p.type_ = type_
+        return p
+
+    def testEncrypt(self):
+        for security, cipherText, tag in VECTORS:
+            with self.subTest(security=security):
+                type_ = CountType.DATA
+                if tag:
+                    type_ |= CountType.TAG
+                p = self.getParameter(security, type_)
+                data = GXDLMSChippering.encryptAesGcm(p, GXByteBuffer.hexToBytes(PLAIN_TEXT))
+                self.assertEqual(cipherText + (tag or ""), GXByteBuffer.hex(data, False))
+                if tag:
+                    self.assertEqual(tag, GXByteBuffer.hex(p.countTag, False))
+
+    def testDecrypt(self):
+        for security, cipherText, tag in VECTORS:
+            if security == Security.AUTHENTICATION:
+                continue
+            with self.subTest(security=security):
+                p = self.getParameter(security, CountType.PACKET)
+                p.tag = 0xC8
+                data = GXDLMSChippering.encryptAesGcm(p, GXByteBuffer.hexToBytes(PLAIN_TEXT))
+                self.assertEqual(cipherText + (tag or ""), GXByteBuffer.hex(data[7:], False))
+                p = self.getParameter(Security.NONE, CountType.PACKET)
+                self.assertEqual(PLAIN_TEXT, GXByteBuffer.hex(GXDLMSChippering.decryptAesGcm(p, GXByteBuffer(data)), False))
+                self.assertEqual(security, p.security)
+
+class TestAesGcm(_AesGcmTest, unittest.TestCase):
+    backend = GXAesGcm()
+
+@unittest.skipIf(AESGCM is None, "cryptography package is not installed.")
+class TestAesGcmCryptography(_AesGcmTest, unittest.TestCase):
+    def setUp(self):
+        self.backend = GXAesGcmCryptography()
+        super().setUp()
+
+class TestKeyCache(unittest.TestCase):
+    #pylint: disable=protected-access
+    def setUp(self):
+        GXDLMSChipperingStream.clearKeyCache()
+
+    def tearDown(self):
+        GXDLMSChipperingStream.clearKeyCache()
+
+    @classmethod
+    def getCachedKeys(cls):
+        return [k for k, _ in GXDLMSChipperingStream._GXDLMSChipperingStream__keyCache]
+
+    def testKeyEncryptingKeyIsNotCached(self):
+        kek = bytes(range(16))
+        GXDLMSSecureClient.encrypt(kek, bytes(range(16, 32)))
+        self.assertEqual([], self.getCachedKeys())
+        key = GXByteBuffer.hexToBytes(BLOCK_CIPHER_KEY)
+        GXAesGcm().encrypt(key, bytes(12), bytes(17), bytes(16))
+        self.assertEqual([bytes(key)], self.getCachedKeys())
+
+    def testThreads(self):
+        key = GXByteBuffer.hexToBytes(BLOCK_CIPHER_KEY)
+        expected = GXAesGcm().encrypt(key, bytes(12), bytes(17), bytes(16))
+        errors = []
+        def run(index):
+            try:
+                for pos in range(20):
+                    #  Other keys evict the tested key from the cache.
+                    GXAesGcm().encrypt(bytes([index, pos]) + bytes(14), bytes(12), bytes(17), bytes(16))
+                    if GXAesGcm().encrypt(key, bytes(12), bytes(17), bytes(16)) != expected:
+                        errors.append(index)
+            except Exception as ex:
+                errors.append(ex)
+        threads = [threading.Thread(target=run, args=(it,)) for it in range(8)]
+        for it in threads:
+            it.start()
+        for it in threads:
+            it.join()
+        self.assertEqual([], errors)
+        self.assertLessEqual(len(self.getCachedKeys()), GXDLMSChipperingStream.KEY_CACHE_SIZE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import unittest
+from gurux_dlms import GXDLMSClient, GXDLMSAssociationViewCache, GXDLMSScalerUnitCache
+from gurux_dlms.enums import InterfaceType, Authentication, ObjectType
+from gurux_dlms.objects import GXDLMSData, GXDLMSRegister, GXDLMSObjectCollection
+
+class TestGXDLMSAssociationViewCache(unittest.TestCase):
+    @classmethod
+    def getClient(cls, useLogicalNameReferencing=True):
+        return GXDLMSClient(useLogicalNameReferencing, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+
+    def testScalerUnit(self):
+        client = self.getClient()
+        r1 = GXDLMSRegister("1.0.1.8.0.255")
+        r2 = GXDLMSRegister("1.0.2.8.0.255")
+        r3 = GXDLMSRegister("1.0.3.8.0.255")
+        client.updateValue(r1, 3, [-2, 30])
+        #  Unit zero is cached as well.
+        client.updateValue(r2, 3, [-1, 0])
+        cache = GXDLMSAssociationViewCache()
+        cache.set(("FW 1.0",), [r1, r2, r3])
+        objects = cache.get(self.getClient(), ("FW 1.0",))
+        r1, r2, r3 = [objects.findByLN(ObjectType.REGISTER, it) for it in ["1.0.1.8.0.255", "1.0.2.8.0.255", "1.0.3.8.0.255"]]
+        self.assertEqual((-2, 30), (r1.scaler, r1.unit))
+        self.assertEqual((-1, 0), (r2.scaler, r2.unit))
+        self.assertTrue(GXDLMSScalerUnitCache.isScalerUnitRead(r1))
+        self.assertTrue(GXDLMSScalerUnitCache.isScalerUnitRead(r2))
+        self.assertFalse(GXDLMSScalerUnitCache.isScalerUnitRead(r3))
+        self.assertIsNone(cache.get(self.getClient(), ("FW 2.0",)))
+
+    def testFingerprintObjects(self):
+        cache = GXDLMSAssociationViewCache()
+        self.assertEqual(cache.fingerprintObjects, cache.getFingerprintObjects(self.getClient()))
+        #  Short name is taken from the association view.
+        client = self.getClient(False)
+        firmware = GXDLMSData("1.0.0.2.0.255")
+        firmware.shortName = 0xA0
+        client.settings.objects = GXDLMSObjectCollection(client)
+        self.assertEqual([], cache.getFingerprintObjects(client))
+        client.objects.append(firmware)
+        self.assertEqual([(firmware, 2)], cache.getFingerprintObjects(client))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,390 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import asyncio
+import datetime
+import unittest
+from gurux_dlms import GXDLMSClient, GXDateTime, GXByteBuffer, GXServerReply, AsyncGXDLMSReader
+from gurux_dlms import GXDLMSAssociationViewCache, GXDLMSPollJob, GXDLMSScalerUnitCache, GXDLMSProfileCheckpointStore
+from gurux_dlms.enums import InterfaceType, Authentication, DataType, AccessMode, MethodAccessMode, ObjectType
+from gurux_dlms.enums import SourceDiagnostic, Unit, Command
+from gurux_dlms.objects import GXDLMSData, GXDLMSClock, GXDLMSRegister, GXDLMSProfileGeneric
+from gurux_dlms.objects.enums import SortMethod
+from gurux_dlms.GXDLMS import GXDLMS
+from gurux_dlms.internal._GXCommon import _GXCommon
+from gurux_dlms.GXDLMSServer import GXDLMSServer
+
+#  How long each request is waited in seconds.
+TIMEOUT = 5
+START = datetime.datetime(2026, 1, 1)
+
+class _GXDLMSTestServer(GXDLMSServer):
+    """
+    Server that accepts all requests.
+    """
+    #pylint: disable=unused-argument
+    def isTarget(self, serverAddress, clientAddress):
+        return True
+
+    def onValidateAuthentication(self, authentication, password):
+        return SourceDiagnostic.NONE
+
+    def onPreRead(self, args):
+        pass
+
+    def onPostRead(self, args):
+        pass
+
+    def onPreGet(self, args):
+        pass
+
+    def onPostGet(self, args):
+        pass
+
+    def onPreWrite(self, args):
+        pass
+
+    def onPostWrite(self, args):
+        pass
+
+    def onPreAction(self, args):
+        pass
+
+    def onPostAction(self, args):
+        pass
+
+    def onConnected(self, connectionInfo):
+        pass
+
+    def onDisconnected(self, connectionInfo):
+        pass
+
+    def onInvalidConnection(self, connectionInfo):
+        pass
+
+    def onFindObject(self, objectType, sn, ln):
+        return None
+
+    def onGetAttributeAccess(self, arg):
+        return AccessMode.READ_WRITE
+
+    def onGetMethodAccess(self, arg):
+        return MethodAccessMode.ACCESS
+
+class _GXDLMSTestListener:
+    """
+    Serve the test server over TCP.  Each connection has own session.
+    """
+    def __init__(self, server):
+        self.server = server
+        self.port = 0
+        # Count of accepted connections.
+        self.connectionCount = 0
+        # Count of open connections.
+        self.openCount = 0
+        # Maximum count of open connections at the same time.
+        self.maxOpenCount = 0
+        # Are replies sent in reverse order.
+        self.reverse = False
+        # Logical name of the object whose read is replied with the
+        # exception response.
+        self.failedObject = None
+        # How long each reply is delayed in seconds.
+        self.delay = 0
+        # Connection is closed without the reply when this many requests
+        # are received.  Zero if connection is not closed.
+        self.dropAfter = 0
+        self.__listener = None
+
+    async def open(self):
+        self.__listener = await asyncio.start_server(self.__handleConnection, "127.0.0.1", 0)
+        self.port = self.__listener.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.__listener.close()
+        await self.__listener.wait_closed()
+
+    async def __handleConnection(self, reader, writer):
+        """
+        Serve one client connection.  Frames are passed to the server one
+        at the time.  If replies are sent in reverse order, they are held
+        until the client stops sending requests.
+        """
+        self.connectionCount += 1
+        self.openCount += 1
+        self.maxOpenCount = max(self.maxOpenCount, self.openCount)
+        session = self.server.createSession()
+        data = GXByteBuffer()
+        replies = list()
+        try:
+            while True:
+                size = GXDLMS.getFrameSize(session.settings, data)
+                if size <= 0 and data.size != 0:
+                    sr = GXServerReply(data.array())
+                    sr.session = session
+                    data.clear()
+                    if self.dropAfter:
+                        self.dropAfter -= 1
+                        if not self.dropAfter:
+                            break
+                    if self.failedObject and _GXCommon.logicalNameToBytes(self.failedObject) in bytes(sr.data):
+                        pdu = GXByteBuffer(bytes([Command.EXCEPTION_RESPONSE, 1, 2]))
+                        replies.append(bytes(GXDLMS.getWrapperFrame(session.settings, pdu)))
+                    else:
+                        while True:
+                            self.server.handleRequest(sr)
+                            if sr.reply:
+                                replies.append(bytes(sr.reply))
+                            if not sr.isStreaming():
+                                break
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    if not self.reverse:
+                        await self.__sendReplies(writer, replies)
+                    continue
+                try:
+                    buff = await asyncio.wait_for(reader.read(1024 if size <= 0 else size), 0.05 if replies else None)
+                except asyncio.TimeoutError:
+                    replies.reverse()
+                    await self.__sendReplies(writer, replies)
+                    continue
+                if not buff:
+                    break
+                data.set(buff)
+        finally:
+            self.openCount -= 1
+            self.server.closeSession(session)
+            writer.close()
+
+    @classmethod
+    async def __sendReplies(cls, writer, replies):
+        for it in replies:
+            writer.write(it)
+        replies.clear()
+        await writer.drain()
+
+class TestAsyncGXDLMSReader(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        server = _GXDLMSTestServer(True, InterfaceType.WRAPPER)
+        data = GXDLMSData("0.0.42.0.0.255")
+        data.value = "Gurux meter"
+        data.setDataType(2, DataType.STRING)
+        server.items.append(data)
+        firmware = GXDLMSData("1.0.0.2.0.255")
+        firmware.value = "FW 1.0"
+        firmware.setDataType(2, DataType.STRING)
+        server.items.append(firmware)
+        energy = GXDLMSRegister("1.0.2.8.0.255")
+        energy.scaler = -2
+        energy.unit = Unit.ACTIVE_ENERGY.value
+        energy.value = 1234
+        energy.setDataType(2, DataType.UINT32)
+        server.items.append(energy)
+        self.clock = GXDLMSClock("0.0.1.0.0.255")
+        self.register = GXDLMSRegister("1.0.1.8.0.255")
+        self.register.unit = Unit.ACTIVE_ENERGY.value
+        pg = GXDLMSProfileGeneric("1.0.99.1.0.255")
+        pg.addCaptureObject(self.clock, 2, 0)
+        pg.addCaptureObject(self.register, 2, 0)
+        pg.capturePeriod = 900
+        for pos in range(500):
+            pg.buffer.append([GXDateTime(START + datetime.timedelta(minutes=15 * pos)), pos])
+        pg.entriesInUse = len(pg.buffer)
+        pg.profileEntries = 1000
+        pg.sortMethod = SortMethod.FIFO
+        server.items.append(pg)
+        self.pg = pg
+        server.items.append(self.clock)
+        server.items.append(self.register)
+        server.initialize()
+        self.server = server
+        self.listener = _GXDLMSTestListener(server)
+        await self.listener.open()
+        self.port = self.listener.port
+
+    async def asyncTearDown(self):
+        await self.listener.close()
+
+    async def testRead(self):
+        client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+        client.settings.maxPduSize = 256
+        reader = await AsyncGXDLMSReader.connect(client, "127.0.0.1", self.port, TIMEOUT)
+        try:
+            await asyncio.wait_for(reader.initializeConnection(), TIMEOUT)
+            value = await asyncio.wait_for(reader.read(GXDLMSData("0.0.42.0.0.255"), 2), TIMEOUT)
+            self.assertEqual("Gurux meter", value)
+            pg = GXDLMSProfileGeneric("1.0.99.1.0.255")
+            pg.addCaptureObject(self.clock, 2, 0)
+            pg.addCaptureObject(self.register, 2, 0)
+            start = START + datetime.timedelta(hours=1)
+            end = START + datetime.timedelta(hours=25)
+            rows = await asyncio.wait_for(reader.readRowsByRange(pg, start, end), TIMEOUT)
+            self.assertEqual(list(range(4, 101)), [it[1] for it in rows])
+            self.assertEqual(97, pg.entriesInUse)
+        finally:
+            await asyncio.wait_for(reader.close(), TIMEOUT)
+        self.assertEqual(1, self.listener.connectionCount)
+
+    async def testReadRowsByEntry(self):
+        client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+        reader = await AsyncGXDLMSReader.connect(client, "127.0.0.1", self.port, TIMEOUT)
+        try:
+            await asyncio.wait_for(reader.initializeConnection(), TIMEOUT)
+            pg = GXDLMSProfileGeneric("1.0.99.1.0.255")
+            pg.addCaptureObject(self.clock, 2, 0)
+            pg.addCaptureObject(self.register, 2, 0)
+            rows = await asyncio.wait_for(reader.readRowsByEntry(pg, 1, 3), TIMEOUT)
+            self.assertEqual([0, 1, 2], [it[1] for it in rows])
+            #  Zero is handled as the first entry.
+            pg.buffer.clear()
+            rows = await asyncio.wait_for(reader.readRowsByEntry(pg, 0, 3), TIMEOUT)
+            self.assertEqual([0, 1, 2], [it[1] for it in rows])
+        finally:
+            await asyncio.wait_for(reader.close(), TIMEOUT)
+
+    async def testReadPipelined(self):
+        self.listener.reverse = True
+        self.listener.failedObject = "1.0.0.2.0.255"
+        client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+        client.settings.maxPduSize = 1024
+        reader = await AsyncGXDLMSReader.connect(client, "127.0.0.1", self.port, TIMEOUT)
+        try:
+            await asyncio.wait_for(reader.initializeConnection(), TIMEOUT)
+            pg = GXDLMSProfileGeneric("1.0.99.1.0.255")
+            pg.addCaptureObject(self.clock, 2, 0)
+            pg.addCaptureObject(self.register, 2, 0)
+            energy = GXDLMSRegister("1.0.2.8.0.255")
+            list_ = [(GXDLMSData("0.0.42.0.0.255"), 2), (GXDLMSData("1.0.0.2.0.255"), 2), (pg, 2),
+                     (energy, 3), (GXDLMSData("0.0.42.0.0.255"), 1)]
+            values = await asyncio.wait_for(reader.readPipelined(list_), TIMEOUT)
+            self.assertEqual("Gurux meter", values[0])
+            #  Exception response doesn't have the invoke ID.
+            self.assertIsInstance(values[1], Exception)
+            self.assertEqual(list(range(500)), [it[1] for it in values[2]])
+            self.assertEqual((-2, Unit.ACTIVE_ENERGY.value), (energy.scaler, energy.unit))
+            self.assertEqual("0.0.42.0.0.255", values[4])
+            #  Data blocks of the last request are read without sending it again.
+            pg.buffer.clear()
+            values = await asyncio.wait_for(reader.readPipelined(list_[:1] + list_[2:3]), TIMEOUT)
+            self.assertEqual(list(range(500)), [it[1] for it in values[1]])
+            #  Connection is usable after the pipelined read.
+            self.listener.reverse = False
+            value = await asyncio.wait_for(reader.read(GXDLMSData("0.0.42.0.0.255"), 2), TIMEOUT)
+            self.assertEqual("Gurux meter", value)
+        finally:
+            await asyncio.wait_for(reader.close(), TIMEOUT)
+
+    async def testAssociationViewCache(self):
+        cache = GXDLMSAssociationViewCache()
+        values = list()
+        for _ in range(2):
+            client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+            energy = GXDLMSRegister("1.0.2.8.0.255")
+            job = GXDLMSPollJob(client, "127.0.0.1", self.port)
+            job.readAssociationView = True
+            job.cache = cache
+            job.attributes.append((energy, 2))
+            reader = await AsyncGXDLMSReader.connect(client, "127.0.0.1", self.port, TIMEOUT)
+            try:
+                await asyncio.wait_for(job.run(reader), TIMEOUT)
+            finally:
+                await asyncio.wait_for(reader.close(), TIMEOUT)
+            values.append((energy.scaler, energy.unit, energy.value, job.getProgress()))
+            #  Second meter gets the scaler and unit from the cache.
+            self.server.items.findByLN(ObjectType.REGISTER, "1.0.2.8.0.255").scaler = 0
+        self.assertEqual((-2, Unit.ACTIVE_ENERGY.value, 1234, (3, 3)), values[0])
+        self.assertEqual((-2, Unit.ACTIVE_ENERGY.value, 1234, (2, 2)), values[1])
+
+    async def testReadScalerAndUnits(self):
+        cache = GXDLMSAssociationViewCache()
+        for pos in range(2):
+            client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+            reader = await AsyncGXDLMSReader.connect(client, "127.0.0.1", self.port, TIMEOUT)
+            try:
+                await asyncio.wait_for(reader.initializeConnection(), TIMEOUT)
+                objects = await asyncio.wait_for(reader.getAssociationView(cache), TIMEOUT)
+                self.assertEqual(("FW 1.0",), reader.fingerprint)
+                energy = objects.findByLN(ObjectType.REGISTER, "1.0.2.8.0.255")
+                #  Scaler and unit are in the cache after the first meter.
+                self.assertEqual(pos == 1, GXDLMSScalerUnitCache.isScalerUnitRead(energy))
+                await asyncio.wait_for(reader.readScalerAndUnits(cache), TIMEOUT)
+                self.assertEqual((-2, Unit.ACTIVE_ENERGY.value), (energy.scaler, energy.unit))
+            finally:
+                await asyncio.wait_for(reader.close(), TIMEOUT)
+
+    async def testReadNewRows(self):
+        store = GXDLMSProfileCheckpointStore()
+        client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+        reader = await AsyncGXDLMSReader.connect(client, "127.0.0.1", self.port, TIMEOUT)
+        try:
+            await asyncio.wait_for(reader.initializeConnection(), TIMEOUT)
+            pg = GXDLMSProfileGeneric("1.0.99.1.0.255")
+            rows = await asyncio.wait_for(reader.readNewRows(pg, store, "meter"), TIMEOUT)
+            self.assertEqual(list(range(500)), [it[1] for it in rows])
+            self.assertEqual((500, START + datetime.timedelta(minutes=15 * 499)), store.get("meter", pg.logicalName))
+            #  Only new rows are read.
+            for pos in range(500, 503):
+                self.pg.buffer.append([GXDateTime(START + datetime.timedelta(minutes=15 * pos)), pos])
+            self.pg.entriesInUse = len(self.pg.buffer)
+            rows = [it[1] async for it in reader.iterNewRows(pg, store, "meter")]
+            self.assertEqual([500, 501, 502], rows)
+            rows = [it[1] async for it in reader.iterNewRows(pg, store, "meter")]
+            self.assertEqual([], rows)
+            #  When the buffer is full, the oldest rows are removed and new
+            #  rows are read by range.
+            self.pg.profileEntries = len(self.pg.buffer)
+            for pos in range(503, 505):
+                self.pg.buffer.pop(0)
+                self.pg.buffer.append([GXDateTime(START + datetime.timedelta(minutes=15 * pos)), pos])
+            pg.buffer.clear()
+            rows = [it[1] async for it in reader.iterNewRows(pg, store, "meter", True)]
+            self.assertEqual([503, 504], rows)
+            self.assertEqual([503, 504], [it[1] for it in pg.buffer])
+            self.assertEqual((503, START + datetime.timedelta(minutes=15 * 504)), store.get("meter", pg.logicalName))
+        finally:
+            await asyncio.wait_for(reader.close(), TIMEOUT)
+
+    async def testTimeout(self):
+        client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+        reader = await AsyncGXDLMSReader.connect(client, "127.0.0.1", self.port, 0.2)
+        try:
+            await asyncio.wait_for(reader.initializeConnection(), TIMEOUT)
+            #  Server doesn't reply to the unknown client address.
+            client.settings.clientAddress = 0x7F
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(reader.read(GXDLMSData("0.0.42.0.0.255"), 2), TIMEOUT)
+        finally:
+            reader.writer.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import sys
+import unittest
+from unittest import mock
+from gurux_dlms import GXByteBuffer, GXCompactArray
+from gurux_dlms.enums import DataType
+from gurux_dlms.internal._GXCommon import _GXCommon
+from gurux_dlms.internal._GXDataInfo import _GXDataInfo
+
+class TestGXCompactArray(unittest.TestCase):
+    #  Compact array of (boolean, uint16) structures.
+    STRUCTURES = bytes([DataType.COMPACT_ARRAY.value, DataType.STRUCTURE.value, 2, DataType.BOOLEAN.value,
+                        DataType.UINT16.value, 9, 1, 0, 1, 0, 0, 2, 1, 0xFF, 0xFF])
+    #  Compact array of booleans.
+    BOOLEANS = bytes([DataType.COMPACT_ARRAY.value, DataType.BOOLEAN.value, 3, 1, 0, 2])
+
+    @classmethod
+    def getData(cls, data, columnar):
+        info = _GXDataInfo()
+        info.columnar = columnar
+        return _GXCommon.getData(GXByteBuffer(data), info)
+
+    def check(self):
+        value = self.getData(self.STRUCTURES, True)
+        self.assertIsInstance(value, GXCompactArray)
+        self.assertEqual(self.getData(self.STRUCTURES, False), value.toList())
+        self.assertEqual([[True, 1], [False, 2], [True, 0xFFFF]], value.toList())
+        self.assertIs(True, value.toList()[0][0])
+        value = self.getData(self.BOOLEANS, True)
+        self.assertEqual(self.getData(self.BOOLEANS, False), value.toList())
+        self.assertEqual([True, False, True], value.toList())
+        self.assertIs(False, value.toList()[1])
+
+    def testColumns(self):
+        self.check()
+
+    def testColumnsWithoutNumpy(self):
+        with mock.patch.object(sys.modules[_GXCommon.__module__], "numpy", None):
+            self.check()
+
+if __name__ == '__main__':
+    unittest.main()
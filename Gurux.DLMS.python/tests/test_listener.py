@@ -0,0 +1,87 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import unittest
+from gurux_dlms import GXDLMSClient, AsyncGXDLMSListener, AsyncGXDLMSReader
+from gurux_dlms.enums import InterfaceType, Authentication, DataType
+from gurux_dlms.objects import GXDLMSData
+from test_async_reader import _GXDLMSTestServer
+
+class _GXDLMSFailingServer(_GXDLMSTestServer):
+    """
+    Server that fails when the request is handled.
+    """
+    def __init__(self, logicalNameReferencing, interfaceType):
+        super(_GXDLMSFailingServer, self).__init__(logicalNameReferencing, interfaceType)
+        self.fail = False
+
+    def handleRequest(self, sr):
+        if self.fail:
+            raise RuntimeError("Server failed.")
+        super(_GXDLMSFailingServer, self).handleRequest(sr)
+
+class TestAsyncGXDLMSListener(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = _GXDLMSFailingServer(True, InterfaceType.WRAPPER)
+        data = GXDLMSData("0.0.42.0.0.255")
+        data.value = "Gurux meter"
+        data.setDataType(2, DataType.STRING)
+        self.server.items.append(data)
+        self.server.initialize()
+        self.closed = list()
+        self.listener = AsyncGXDLMSListener(self.server)
+        self.listener.onConnectionClosed = self.closed.append
+        self.port = await self.listener.startTcp(port=0)
+        client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+        self.reader = await AsyncGXDLMSReader.connect(client, "127.0.0.1", self.port, 5)
+        await self.reader.initializeConnection()
+
+    async def asyncTearDown(self):
+        await self.reader.close()
+        await self.listener.close()
+
+    async def testInactivityIsNotCheckedByServer(self):
+        self.assertFalse(self.server.checkInactivity)
+        self.assertEqual("Gurux meter", await self.reader.read(GXDLMSData("0.0.42.0.0.255"), 2))
+        self.assertEqual(0, self.listener.connections[0].session.dataReceived)
+
+    async def testErrorIsLogged(self):
+        self.server.fail = True
+        with self.assertLogs("gurux_dlms.AsyncGXDLMSListener", "ERROR") as logs:
+            with self.assertRaises(Exception):
+                await self.reader.read(GXDLMSData("0.0.42.0.0.255"), 2)
+        self.assertIsNotNone(logs.records[0].exc_info)
+        self.assertEqual("Server failed.", self.closed[0].closeReason)
+
+if __name__ == '__main__':
+    unittest.main()
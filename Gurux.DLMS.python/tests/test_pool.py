@@ -0,0 +1,173 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import asyncio
+import unittest
+from gurux_dlms import GXDLMSClient, GXDLMSException, GXByteBuffer, GXReplyData, GXServerReply, AsyncGXDLMSPool
+from gurux_dlms.enums import InterfaceType, Authentication, DataType
+from gurux_dlms.objects import GXDLMSData
+from test_async_reader import _GXDLMSTestServer, _GXDLMSTestListener
+
+#  Value that doesn't fit to one HDLC frame.
+LONG_VALUE = "0123456789" * 100
+
+def _createServer(interfaceType):
+    server = _GXDLMSTestServer(True, interfaceType)
+    data = GXDLMSData("0.0.42.0.0.255")
+    data.value = "Gurux meter"
+    data.setDataType(2, DataType.STRING)
+    server.items.append(data)
+    data = GXDLMSData("0.0.96.1.0.255")
+    data.value = LONG_VALUE
+    data.setDataType(2, DataType.STRING)
+    server.items.append(data)
+    server.initialize()
+    return server
+
+class TestHdlcKeepAlive(unittest.TestCase):
+    def setUp(self):
+        self.server = _createServer(InterfaceType.HDLC)
+        self.session = self.server.createSession()
+        self.client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.HDLC)
+
+    def send(self, data, reply=None):
+        sr = GXServerReply(data)
+        sr.session = self.session
+        self.server.handleRequest(sr)
+        if reply is None:
+            reply = GXReplyData()
+        self.client.getData(GXByteBuffer(sr.reply), reply, None)
+        return reply
+
+    def read(self, item, index):
+        reply = self.send(self.client.read(item, index)[0])
+        #  Segmented reply is asked with receiver ready frames.
+        while reply.isMoreData():
+            self.send(self.client.receiverReady(reply.moreData), reply)
+        return self.client.updateValue(item, index, reply.value)
+
+    def testKeepAliveAndSegmentedRead(self):
+        self.client.parseUAResponse(self.send(self.client.snrmRequest()).data)
+        self.client.parseAareResponse(self.send(self.client.aarqRequest()[0]).data)
+        for _ in range(3):
+            self.assertEqual("Gurux meter", self.read(GXDLMSData("0.0.42.0.0.255"), 2))
+            for _ in range(3):
+                self.send(self.client.keepAlive())
+            self.assertEqual(LONG_VALUE, self.read(GXDLMSData("0.0.96.1.0.255"), 2))
+            self.send(self.client.keepAlive())
+
+class TestAsyncGXDLMSPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.listener = None
+        self.pool = AsyncGXDLMSPool(keepAliveInterval=0.1, timeout=5)
+
+    async def asyncTearDown(self):
+        await self.pool.close()
+        await self.listener.close()
+
+    async def open(self, interfaceType=InterfaceType.WRAPPER, maxSessions=1):
+        self.listener = _GXDLMSTestListener(_createServer(interfaceType))
+        await self.listener.open()
+        self.pool.add("meter", lambda: GXDLMSClient(True, 16, 1, Authentication.NONE, None, interfaceType),
+                      "127.0.0.1", self.listener.port, maxSessions)
+
+    async def testLease(self):
+        await self.open()
+        for _ in range(4):
+            async with self.pool.lease("meter") as reader:
+                self.assertEqual("Gurux meter", await reader.read(GXDLMSData("0.0.42.0.0.255"), 2))
+        self.assertEqual(1, self.listener.connectionCount)
+        self.assertEqual(3, self.pool.hits)
+        self.assertEqual(1, self.pool.misses)
+        self.assertEqual(0.75, self.pool.getHitRate())
+        with self.assertRaises(ValueError):
+            await self.pool.acquire("unknown")
+
+    async def testMaxSessions(self):
+        await self.open(maxSessions=2)
+        self.listener.delay = 0.02
+
+        async def read():
+            async with self.pool.lease("meter") as reader:
+                await reader.read(GXDLMSData("0.0.42.0.0.255"), 2)
+        await asyncio.gather(*[read() for _ in range(6)])
+        self.assertEqual(2, self.listener.maxOpenCount)
+        self.assertEqual(2, self.pool.misses)
+        self.assertEqual(4, self.pool.hits)
+
+    async def testMeterError(self):
+        await self.open()
+        with self.assertRaises(GXDLMSException):
+            async with self.pool.lease("meter") as reader:
+                await reader.read(GXDLMSData("1.2.3.4.5.6"), 2)
+        #  Meter error doesn't break the association.
+        async with self.pool.lease("meter") as reader:
+            await reader.read(GXDLMSData("0.0.42.0.0.255"), 2)
+        self.assertEqual(1, self.listener.connectionCount)
+        self.assertEqual(0, self.pool.reconnects)
+
+    async def testDeadSession(self):
+        await self.open()
+        async with self.pool.lease("meter") as reader:
+            await reader.read(GXDLMSData("0.0.42.0.0.255"), 2)
+        #  Meter closes the connection when the next request is received.
+        self.listener.dropAfter = 1
+        await asyncio.sleep(0.2)
+        self.assertEqual(1, self.pool.deadSessions)
+        async with self.pool.lease("meter") as reader:
+            self.assertEqual("Gurux meter", await reader.read(GXDLMSData("0.0.42.0.0.255"), 2))
+        self.assertEqual(2, self.listener.connectionCount)
+        self.assertEqual(1, self.pool.reconnects)
+        self.assertEqual(0, self.pool.hits)
+        #  Connection error discards the association.
+        with self.assertRaises(ConnectionError):
+            async with self.pool.lease("meter") as reader:
+                raise ConnectionError()
+        async with self.pool.lease("meter") as reader:
+            await reader.read(GXDLMSData("0.0.42.0.0.255"), 2)
+        self.assertEqual(3, self.listener.connectionCount)
+        self.assertEqual(2, self.pool.reconnects)
+
+    async def testHdlcKeepAlive(self):
+        await self.open(InterfaceType.HDLC)
+        for _ in range(2):
+            async with self.pool.lease("meter") as reader:
+                self.assertEqual(LONG_VALUE, await reader.read(GXDLMSData("0.0.96.1.0.255"), 2))
+            await asyncio.sleep(0.3)
+        self.assertGreaterEqual(self.pool.keepAlives, 2)
+        self.assertEqual(0, self.pool.deadSessions)
+        self.assertEqual(1, self.listener.connectionCount)
+        self.assertEqual(1, self.pool.hits)
+
+if __name__ == '__main__':
+    unittest.main()
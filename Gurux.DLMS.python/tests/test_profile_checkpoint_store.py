@@ -0,0 +1,132 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+from gurux_dlms import GXDLMSProfileCheckpointStore, GXDLMSSqliteCheckpointStore
+from gurux_dlms.objects import GXDLMSProfileGeneric, GXDLMSClock, GXDLMSRegister
+from gurux_dlms.objects.enums import SortMethod
+
+TIME = datetime.datetime(2026, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+class TestGXDLMSProfileCheckpointStore(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def getStores(self):
+        return [GXDLMSProfileCheckpointStore(), GXDLMSProfileCheckpointStore(self.path),
+                GXDLMSSqliteCheckpointStore(), GXDLMSSqliteCheckpointStore(os.path.join(self.path, "checkpoints.db"))]
+
+    @classmethod
+    def getProfileGeneric(cls, sortMethod, entries, profileEntries, clock=True):
+        pg = GXDLMSProfileGeneric("1.0.99.1.0.255")
+        if clock:
+            pg.addCaptureObject(GXDLMSClock("0.0.1.0.0.255"), 2, 0)
+        pg.addCaptureObject(GXDLMSRegister("1.0.1.8.0.255"), 2, 0)
+        pg.sortMethod = sortMethod
+        pg.entriesInUse = entries
+        pg.profileEntries = profileEntries
+        return pg
+
+    def testCheckpoint(self):
+        for store in self.getStores():
+            with self.subTest(store=type(store).__name__, path=store.path):
+                self.assertIsNone(store.get("meter", "1.0.99.1.0.255"))
+                store.set("meter", "1.0.99.1.0.255", 100, TIME)
+                store.set("meter", "1.0.98.1.0.255", 10, None)
+                self.assertEqual((100, TIME), store.get("meter", "1.0.99.1.0.255"))
+                self.assertEqual((10, None), store.get("meter", "1.0.98.1.0.255"))
+                self.assertIsNone(store.get("meter2", "1.0.99.1.0.255"))
+                store.remove("meter", "1.0.98.1.0.255")
+                self.assertIsNone(store.get("meter", "1.0.98.1.0.255"))
+
+    def testPersistence(self):
+        store = GXDLMSProfileCheckpointStore(self.path)
+        store.set("meter", "1.0.99.1.0.255", 100, TIME)
+        self.assertEqual((100, TIME), GXDLMSProfileCheckpointStore(self.path).get("meter", "1.0.99.1.0.255"))
+        name = os.path.join(self.path, "checkpoints.db")
+        store = GXDLMSSqliteCheckpointStore(name)
+        store.set("meter", "1.0.99.1.0.255", 100, TIME)
+        store.close()
+        store = GXDLMSSqliteCheckpointStore(name)
+        self.assertEqual((100, TIME), store.get("meter", "1.0.99.1.0.255"))
+        store.close()
+
+    def testNewRows(self):
+        store = GXDLMSProfileCheckpointStore()
+        pg = self.getProfileGeneric(SortMethod.FIFO, 120, 1000)
+        #  Profile is not collected yet.
+        self.assertEqual((1, 120, None), store.getNewRows("meter", pg))
+        store.set("meter", pg.logicalName, 100, TIME)
+        self.assertEqual((101, 20, None), store.getNewRows("meter", pg))
+        pg.entriesInUse = 100
+        self.assertEqual((101, 0, None), store.getNewRows("meter", pg))
+        #  Buffer is cleared.
+        pg.entriesInUse = 50
+        self.assertEqual((1, 50, None), store.getNewRows("meter", pg))
+
+    def testWrapAround(self):
+        store = GXDLMSProfileCheckpointStore()
+        store.set("meter", "1.0.99.1.0.255", 100, TIME)
+        #  Rows are moved when the buffer is full, so they are read by range.
+        pg = self.getProfileGeneric(SortMethod.FIFO, 100, 100)
+        self.assertEqual((0, 0, TIME), store.getNewRows("meter", pg))
+        #  Without the capture time all rows are read.
+        pg = self.getProfileGeneric(SortMethod.FIFO, 100, 100, False)
+        self.assertEqual((1, 100, None), store.getNewRows("meter", pg))
+
+    def testSortMethod(self):
+        store = GXDLMSProfileCheckpointStore()
+        store.set("meter", "1.0.99.1.0.255", 100, TIME)
+        #  Full LIFO buffer overwrites the last row.
+        pg = self.getProfileGeneric(SortMethod.LIFO, 100, 100, False)
+        self.assertEqual((100, 1, None), store.getNewRows("meter", pg))
+        pg = self.getProfileGeneric(SortMethod.LIFO, 100, 100)
+        self.assertEqual((0, 0, TIME), store.getNewRows("meter", pg))
+        pg = self.getProfileGeneric(SortMethod.LIFO, 120, 1000)
+        self.assertEqual((101, 20, None), store.getNewRows("meter", pg))
+        #  Sorted rows are not in capture order.
+        for it in (SortMethod.LARGEST, SortMethod.SMALLEST, SortMethod.NEAREST_TO_ZERO, SortMethod.FAREST_FROM_ZERO):
+            pg = self.getProfileGeneric(it, 120, 1000)
+            self.assertEqual((0, 0, TIME), store.getNewRows("meter", pg))
+            pg = self.getProfileGeneric(it, 120, 1000, False)
+            self.assertEqual((1, 120, None), store.getNewRows("meter", pg))
+
+if __name__ == '__main__':
+    unittest.main()
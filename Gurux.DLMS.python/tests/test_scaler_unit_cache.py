@@ -0,0 +1,101 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import unittest
+from gurux_dlms import GXDLMSClient, GXDLMSScalerUnitCache
+from gurux_dlms.enums import InterfaceType, Authentication, Unit
+from gurux_dlms.objects import GXDLMSRegister, GXDLMSDemandRegister
+
+#  Units as they are read from the meter.
+ENERGY = Unit.ACTIVE_ENERGY.value
+POWER = Unit.ACTIVE_POWER.value
+
+class TestGXDLMSScalerUnitCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = GXDLMSScalerUnitCache(4)
+        self.cache.set("model", "1.0.1.8.0.255", -2, ENERGY)
+        self.cache.set("model", "1.0.2.8.0.255", -2, ENERGY)
+        self.cache.set("model", "1.0.1.4.0.255", 0, POWER)
+
+    def getClient(self):
+        client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+        client.scalerUnitCache = self.cache
+        client.model = "model"
+        return client
+
+    def testVerifyInterval(self):
+        values = [self.cache.get("model", "1.0.1.8.0.255") for _ in range(8)]
+        self.assertEqual([(-2, ENERGY)] * 3 + [None] + [(-2, ENERGY)] * 3 + [None], values)
+        self.cache.verifyInterval = 0
+        self.assertEqual((-2, ENERGY), self.cache.get("model", "1.0.1.8.0.255"))
+
+    def testFirstUseInAssociation(self):
+        client = self.getClient()
+        client.aarqRequest()
+        r1 = GXDLMSRegister("1.0.1.8.0.255")
+        r2 = GXDLMSRegister("1.0.2.8.0.255")
+        d = GXDLMSDemandRegister("1.0.1.4.0.255")
+        #  First cached scaler and unit is read from the meter.
+        self.assertEqual([r1], client.updateScalerUnits([r1, r2, d]))
+        self.assertEqual((-2, ENERGY), (r2.scaler, r2.unit))
+        self.assertEqual((0, POWER), (d.scaler, d.unit))
+        self.assertEqual([], client.updateScalerUnits([r2]))
+        client.aarqRequest()
+        self.assertEqual([r2], client.updateScalerUnits([r2]))
+
+    def testMismatch(self):
+        client = self.getClient()
+        r1 = GXDLMSRegister("1.0.1.8.0.255")
+        self.assertEqual([r1], client.updateScalerUnits([r1]))
+        client.updateValue(r1, 3, [-3, ENERGY])
+        self.assertEqual(1, self.cache.mismatchCount)
+        self.assertEqual((-3, ENERGY), self.cache.get("model", "1.0.1.8.0.255"))
+
+    def testValueIsNotNumber(self):
+        client = self.getClient()
+        r1 = GXDLMSRegister("1.0.1.8.0.255")
+        r2 = GXDLMSRegister("1.0.2.8.0.255")
+        self.assertEqual([r1], client.updateScalerUnits([r1, r2]))
+        client.updateValue(r2, 2, "Not a number")
+        #  Scaler and unit are removed from the cache and from the register.
+        self.assertIsNone(self.cache.get("model", "1.0.2.8.0.255"))
+        self.assertEqual((1, Unit.NONE), (r2.scaler, r2.unit))
+        self.assertFalse(GXDLMSScalerUnitCache.isScalerUnitRead(r2))
+        #  Scaler and unit that are read from the meter are kept.
+        client.updateValue(r1, 3, [-2, ENERGY])
+        client.updateValue(r1, 2, "Not a number")
+        self.assertEqual((-2, ENERGY), (r1.scaler, r1.unit))
+        self.assertTrue(GXDLMSScalerUnitCache.isScalerUnitRead(r1))
+
+if __name__ == '__main__':
+    unittest.main()
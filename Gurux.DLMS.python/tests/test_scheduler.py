@@ -0,0 +1,166 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import unittest
+from gurux_dlms import GXDLMSClient, GXDLMSException, GXDLMSPollJob, AsyncGXDLMSScheduler
+from gurux_dlms.enums import InterfaceType, Authentication, DataType
+from gurux_dlms.objects import GXDLMSData
+from test_async_reader import _GXDLMSTestServer, _GXDLMSTestListener
+
+class _GXDLMSRecordingServer(_GXDLMSTestServer):
+    """
+    Server that records associations and read objects.
+    """
+    def __init__(self, logicalNameReferencing, interfaceType):
+        super(_GXDLMSRecordingServer, self).__init__(logicalNameReferencing, interfaceType)
+        # Count of made associations.
+        self.associationCount = 0
+        # Logical names of read objects.
+        self.reads = list()
+
+    def onConnected(self, connectionInfo):
+        self.associationCount += 1
+
+    def onPreRead(self, args):
+        for it in args:
+            self.reads.append(it.target.logicalName)
+
+class TestAsyncGXDLMSScheduler(unittest.IsolatedAsyncioTestCase):
+    LOGICAL_NAMES = ("0.0.42.0.0.255", "0.0.96.1.0.255", "0.0.96.1.1.255")
+
+    async def asyncSetUp(self):
+        # Listener of each gateway.
+        self.listeners = dict()
+        self.order = list()
+        self.scheduler = AsyncGXDLMSScheduler(maxPerGateway=1)
+        self.scheduler.onJobDone = self.order.append
+
+    async def asyncTearDown(self):
+        for it in self.listeners.values():
+            await it.close()
+
+    async def __getListener(self, gateway):
+        listener = self.listeners.get(gateway)
+        if listener is None:
+            server = _GXDLMSRecordingServer(True, InterfaceType.WRAPPER)
+            for ln in self.LOGICAL_NAMES:
+                data = GXDLMSData(ln)
+                data.value = ln
+                data.setDataType(2, DataType.STRING)
+                server.items.append(data)
+            server.initialize()
+            listener = _GXDLMSTestListener(server)
+            await listener.open()
+            self.listeners[gateway] = listener
+        return listener
+
+    async def __addJob(self, gateway, lns=LOGICAL_NAMES[:1]):
+        listener = await self.__getListener(gateway)
+        client = GXDLMSClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+        job = GXDLMSPollJob(client, "127.0.0.1", listener.port, gateway)
+        job.readScalers = False
+        job.attributes = [(GXDLMSData(it), 2) for it in lns]
+        self.scheduler.add(job)
+        return job
+
+    async def testLimits(self):
+        self.scheduler.gatewayLimits["A"] = 2
+        for _ in range(6):
+            await self.__addJob("A")
+            await self.__addJob("B")
+        for it in self.listeners.values():
+            it.delay = 0.02
+        await self.scheduler.run()
+        self.assertEqual(12, self.scheduler.completedCount)
+        self.assertEqual(2, self.listeners["A"].maxOpenCount)
+        self.assertEqual(1, self.listeners["B"].maxOpenCount)
+
+    async def testMaxConcurrency(self):
+        self.scheduler.maxConcurrency = 1
+        self.scheduler.maxPerGateway = 4
+        for _ in range(4):
+            await self.__addJob("A")
+        self.listeners["A"].delay = 0.02
+        await self.scheduler.run()
+        self.assertEqual(4, self.scheduler.completedCount)
+        self.assertEqual(1, self.listeners["A"].maxOpenCount)
+
+    async def testFairness(self):
+        self.scheduler.maxConcurrency = 1
+        for _ in range(3):
+            await self.__addJob("A")
+        for _ in range(3):
+            await self.__addJob("B")
+        await self.scheduler.run()
+        self.assertEqual([it.gateway for it in self.order], ["A", "B"] * 3)
+
+    async def testResume(self):
+        job = await self.__addJob("A", self.LOGICAL_NAMES)
+        listener = self.listeners["A"]
+        #  Connection breaks when the second object is read.
+        listener.dropAfter = 3
+        await self.scheduler.run()
+        self.assertTrue(job.completed)
+        self.assertEqual(2, job.attempts)
+        self.assertEqual(2, listener.connectionCount)
+        self.assertEqual(list(self.LOGICAL_NAMES), listener.server.reads)
+        self.assertEqual(list(self.LOGICAL_NAMES), [it.value for it, _ in job.attributes])
+
+    async def testErrorRetry(self):
+        job = await self.__addJob("A", ["1.2.3.4.5.6"])
+        await self.scheduler.run()
+        self.assertFalse(job.completed)
+        self.assertIsInstance(job.error, GXDLMSException)
+        self.assertEqual(self.scheduler.retries + 1, job.attempts)
+        self.assertEqual(1, self.scheduler.failedCount)
+        self.assertEqual([job], self.order)
+        #  Meter errors are read again with the same association.
+        self.assertEqual(1, self.listeners["A"].connectionCount)
+        self.assertEqual(1, self.listeners["A"].server.associationCount)
+
+    async def testInvalidLimit(self):
+        self.scheduler.gatewayLimits["A"] = 0
+        job = await self.__addJob("A")
+        await self.__addJob("B")
+        with self.assertRaises(ValueError):
+            await self.scheduler.run()
+        self.assertEqual(0, job.attempts)
+        self.assertEqual(0, self.listeners["A"].connectionCount)
+        self.assertEqual(0, self.listeners["B"].connectionCount)
+        self.scheduler.gatewayLimits["A"] = 1
+        self.scheduler.maxConcurrency = 0
+        with self.assertRaises(ValueError):
+            await self.scheduler.run()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#
+#  --------------------------------------------------------------------------
+#   Gurux Ltd
+#
+#
+#
+#  Filename: $HeadURL$
+#
+#  Version: $Revision$,
+#                   $Date$
+#                   $Author$
+#
+#  Copyright (c) Gurux Ltd
+#
+# ---------------------------------------------------------------------------
+#
+#   DESCRIPTION
+#
+#  This file is a part of Gurux Device Framework.
+#
+#  Gurux Device Framework is Open Source software; you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  Gurux Device Framework is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  More information of Gurux products: http://www.gurux.org
+#
+#  This code is licensed under the GNU General Public License v2.
+#  Full text may be retrieved at http://www.gnu.org/licenses/gpl-2.0.txt
+# ---------------------------------------------------------------------------
+import unittest
+from gurux_dlms import GXDLMSClient, GXByteBuffer, GXReplyData, GXServerReply
+from gurux_dlms.enums import InterfaceType, Authentication, DataType, ObjectType, Security
+from gurux_dlms.objects import GXDLMSData, GXDLMSAssociationLogicalName
+from gurux_dlms.objects.enums import AssociationStatus, ApplicationContextName
+from gurux_dlms.secure import GXDLMSSecureClient
+from gurux_dlms.GXCiphering import GXCiphering
+from test_async_reader import _GXDLMSTestServer
+
+class TestGXDLMSServerSession(unittest.TestCase):
+    def setUp(self):
+        self.server = _GXDLMSTestServer(True, InterfaceType.WRAPPER)
+        self.server.settings.cipher = GXCiphering("ABCDEFGH".encode())
+        data = GXDLMSData("0.0.42.0.0.255")
+        data.value = "Gurux meter"
+        data.setDataType(2, DataType.STRING)
+        self.server.items.append(data)
+        self.server.initialize()
+
+    @classmethod
+    def getClient(cls, security):
+        client = GXDLMSSecureClient(True, 16, 1, Authentication.NONE, None, InterfaceType.WRAPPER)
+        client.settings.cipher.security = security
+        return client
+
+    def send(self, client, session, data):
+        sr = GXServerReply(data)
+        sr.session = session
+        self.server.handleRequest(sr)
+        reply = GXReplyData()
+        client.getData(GXByteBuffer(sr.reply), reply, None)
+        return sr.reply, reply
+
+    def connect(self, client, session):
+        reply = self.send(client, session, client.aarqRequest()[0])[1]
+        client.parseAareResponse(reply.data)
+
+    def read(self, client, session, item, index):
+        reply = self.send(client, session, client.read(item, index)[0])[1]
+        return client.updateValue(item, index, reply.value)
+
+    def testAssociationState(self):
+        c1 = self.getClient(Security.AUTHENTICATION_ENCRYPTION)
+        c2 = self.getClient(Security.NONE)
+        s1 = self.server.createSession()
+        s2 = self.server.createSession()
+        self.connect(c1, s1)
+        ln = GXDLMSAssociationLogicalName()
+        self.assertEqual(AssociationStatus.ASSOCIATED, AssociationStatus(self.read(c1, s1, ln, 8)))
+        #  Second session is not associated yet.
+        self.assertEqual(AssociationStatus.NON_ASSOCIATED, s2.associationStatus)
+        self.connect(c2, s2)
+        self.read(c1, s1, ln, 4)
+        self.assertEqual(ApplicationContextName.LOGICAL_NAME_WITH_CIPHERING, ln.applicationContextName.contextId)
+        self.read(c2, s2, ln, 4)
+        self.assertEqual(ApplicationContextName.LOGICAL_NAME, ln.applicationContextName.contextId)
+        #  Release of the first session doesn't change the second session.
+        self.send(c1, s1, c1.releaseRequest()[0])
+        self.server.closeSession(s1)
+        self.assertEqual(AssociationStatus.NON_ASSOCIATED, s1.associationStatus)
+        self.assertEqual(AssociationStatus.ASSOCIATED, AssociationStatus(self.read(c2, s2, ln, 8)))
+        #  Shared association object keeps its own state.
+        item = self.server.items.findByLN(ObjectType.ASSOCIATION_LOGICAL_NAME, "0.0.40.0.0.255")
+        self.assertIsNone(item.session)
+        self.assertEqual(AssociationStatus.NON_ASSOCIATED, item.associationStatus)
+
+    def testInvocationCounter(self):
+        clients = [self.getClient(Security.AUTHENTICATION_ENCRYPTION) for _ in range(3)]
+        sessions = [self.server.createSession() for _ in range(3)]
+        for c, s in zip(clients, sessions):
+            self.connect(c, s)
+        counters = []
+        for _ in range(2):
+            for c, s in zip(clients, sessions):
+                frame, reply = self.send(c, s, c.read(GXDLMSData("0.0.42.0.0.255"), 2)[0])
+                self.assertEqual("Gurux meter", reply.value)
+                #  Wrapper header, ciphered command, length and security byte
+                #  are before the invocation counter.
+                counters.append(GXByteBuffer(frame).getUInt32(8 + 3))
+        #  Sessions share the invocation counter of the global key.
+        self.assertEqual(len(counters), len(set(counters)))
+        self.assertEqual(sorted(counters), counters)
+        #  Closed session doesn't reset the shared counter.
+        self.server.closeSession(sessions[0])
+        self.assertEqual(counters[-1], self.server.settings.cipher.invocationCounter)
+
+if __name__ == '__main__':
+    unittest.main()